@@ -0,0 +1,315 @@
+"""
+Control de admisión: peticiones simultáneas por clase de ruta
+Club Atlético Central
+
+Las rutas se agrupan en tres clases:
+
+- 'ia': llamadas al LLM (una ráfaga de /generar_dibujos_ia son nueve cada una)
+- 'render': generación de PDFs e imágenes (CPU)
+- 'ligera': todo lo demás (login, check_logo, métricas...)
+
+Cada clase tiene un máximo de peticiones simultáneas por proceso. Las que
+sobran esperan en una cola FIFO acotada durante un tiempo máximo; si la cola
+está llena o se agota la espera se rechazan al momento con 429 y
+Retry-After. Así una ráfaga de IA o de PDFs no ocupa todos los hilos y las
+peticiones ligeras siguen respondiendo.
+
+Configuración por clase (CLASE en mayúsculas, límite 0 = sin límite):
+
+    ADMISION_IA_LIMITE=2  ADMISION_IA_COLA=1  ADMISION_IA_ESPERA=15
+    ADMISION_RENDER_LIMITE=2  ADMISION_RENDER_COLA=1  ADMISION_RENDER_ESPERA=10
+
+Con gunicorn la espera ocupa el hilo: límite + cola de 'ia' y 'render' debe
+dejar hilos libres (GUNICORN_THREADS).
+
+asgi.py tiene sus propios límites (configurar(asgi=True)), con las mismas
+variables con el prefijo ADMISION_ASGI_. Allí la espera es asíncrona y las
+rutas de IA asíncronas no ocupan ningún hilo mientras esperan al LLM, así que
+'ia' admite muchas más por defecto:
+
+    ADMISION_ASGI_IA_LIMITE=32  ADMISION_ASGI_IA_COLA=64  ADMISION_ASGI_IA_ESPERA=15
+    ADMISION_ASGI_RENDER_LIMITE=2  ADMISION_ASGI_RENDER_COLA=1  ADMISION_ASGI_RENDER_ESPERA=10
+
+/generar_lote es 'render', salvo que el cuerpo pida los dibujos de IA
+("dibujos": true): entonces es 'ia' (RUTAS_CON_IA).
+
+Las rutas de IA que asgi.py sirve en su pool de hilos (el pack de partido,
+el lote con dibujos) ocupan un hilo como un render y cuentan en 'render'
+(limite_de_ruta).
+
+El turno de una petición se guarda en su environ WSGI (tomar_turno), así que
+una vista que tiene que esperar a otra cosa (idempotencia.py, a la petición
+original con la misma clave) puede soltarlo mientras espera y recuperarlo
+después (soltar_turno, recuperar_turno).
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import metricas
+
+
+RUTAS = {
+    '/analizar_notas': 'ia',
+    '/generar_sugerencias_plan': 'ia',
+    '/generar_dibujos_ia': 'ia',
+    '/generar_pack_partido': 'ia',
+    '/generar': 'render',
+    '/generar_plan': 'render',
+    '/generar_v2': 'render',
+    '/generar_lote': 'render',
+    '/previsualizar_v2': 'render',
+    '/exportar_campo': 'render',
+}
+
+# Rutas que pasan a 'ia' si el campo indicado de su cuerpo JSON es verdadero
+RUTAS_CON_IA = {
+    '/generar_lote': 'dibujos',
+}
+
+# Clase -> (límite, cola, espera máxima en segundos)
+POR_DEFECTO = {
+    'ia': (2, 1, 15.0),
+    'render': (2, 1, 10.0),
+    'ligera': (0, 0, 0.0),
+}
+
+# Lo mismo en asgi.py: las rutas de IA esperan al LLM en el bucle de eventos
+POR_DEFECTO_ASGI = {
+    'ia': (32, 64, 15.0),
+    'render': (2, 1, 10.0),
+    'ligera': (0, 0, 0.0),
+}
+
+
+def _configuracion(clase, asgi=False):
+    limite, cola, espera = (POR_DEFECTO_ASGI if asgi else POR_DEFECTO)[clase]
+    prefijo = 'ADMISION_ASGI_' if asgi else 'ADMISION_'
+    prefijo += f'{clase.upper()}_'
+    return (int(os.environ.get(prefijo + 'LIMITE', limite)),
+            int(os.environ.get(prefijo + 'COLA', cola)),
+            float(os.environ.get(prefijo + 'ESPERA', espera)))
+
+
+class _EsperaHilo:
+    """Petición síncrona esperando turno en un hilo"""
+
+    def __init__(self):
+        self.evento = threading.Event()
+
+    def despertar(self):
+        self.evento.set()
+        return True
+
+
+class _EsperaAsync:
+    """Petición asíncrona esperando turno en un bucle de eventos"""
+
+    def __init__(self, bucle):
+        self.bucle = bucle
+        self.futuro = bucle.create_future()
+
+    def despertar(self):
+        def resolver():
+            if not self.futuro.done():
+                self.futuro.set_result(True)
+        try:
+            self.bucle.call_soon_threadsafe(resolver)
+        except RuntimeError:
+            # Bucle cerrado: el turno pasa al siguiente
+            return False
+        return True
+
+
+class Limite:
+    """
+    Semáforo con cola FIFO acotada, usable desde hilos y desde asyncio
+
+    Al salir, el turno pasa directamente al primero de la cola (no se
+    libera y se vuelve a competir), así que el orden de llegada se respeta.
+    """
+
+    def __init__(self, clase, limite, cola, espera):
+        self.clase = clase
+        self.limite = limite
+        self.cola = cola
+        self.espera = espera
+        self.en_curso = 0
+        self._esperando = deque()
+        self._lock = threading.Lock()
+        # Media móvil de la duración de las peticiones, para Retry-After
+        self._duracion_media = 1.0
+
+    def _intentar(self, crear_espera):
+        """(True, None) si entra ya, (False, None) si se rechaza o (None, espera) si hace cola"""
+        with self._lock:
+            if self.limite <= 0 or (self.en_curso < self.limite and not self._esperando):
+                self.en_curso += 1
+                return True, None
+            if len(self._esperando) >= self.cola or self.espera <= 0:
+                return False, None
+            espera = crear_espera()
+            self._esperando.append(espera)
+            return None, espera
+
+    def _abandonar(self, espera):
+        """Quita de la cola una espera agotada; False si justo le había llegado el turno"""
+        with self._lock:
+            try:
+                self._esperando.remove(espera)
+                return True
+            except ValueError:
+                return False
+
+    def entrar(self):
+        """
+        Espera turno en el hilo actual
+
+        Returns:
+            (admitida, segundos esperando)
+        """
+        inicio = time.perf_counter()
+        admitida, espera = self._intentar(_EsperaHilo)
+        if admitida is None:
+            admitida = espera.evento.wait(self.espera) or not self._abandonar(espera)
+        return self._registrar(admitida, time.perf_counter() - inicio)
+
+    async def entrar_async(self):
+        """Espera turno sin bloquear el bucle de eventos (mismo resultado que entrar)"""
+        inicio = time.perf_counter()
+        admitida, espera = self._intentar(lambda: _EsperaAsync(asyncio.get_running_loop()))
+        if admitida is None:
+            try:
+                await asyncio.wait_for(asyncio.shield(espera.futuro), self.espera)
+                admitida = True
+            except asyncio.TimeoutError:
+                admitida = not self._abandonar(espera)
+            except asyncio.CancelledError:
+                # Cliente desconectado: fuera de la cola o, si ya le había
+                # llegado el turno, se pasa al siguiente
+                if not self._abandonar(espera):
+                    self.salir()
+                raise
+        return self._registrar(admitida, time.perf_counter() - inicio)
+
+    def _registrar(self, admitida, segundos):
+        if admitida:
+            metricas.ADMISION_ESPERA.observar(segundos, clase=self.clase)
+        else:
+            metricas.ADMISION_RECHAZOS.inc(clase=self.clase)
+        return admitida, segundos
+
+    def salir(self, duracion=None):
+        """Libera el turno (o se lo pasa al primero de la cola)"""
+        with self._lock:
+            if duracion is not None:
+                self._duracion_media = 0.8 * self._duracion_media + 0.2 * duracion
+            while self._esperando:
+                if self._esperando.popleft().despertar():
+                    return
+            self.en_curso -= 1
+
+    def estado(self):
+        """(en curso, en cola) leídos a la vez"""
+        with self._lock:
+            return self.en_curso, len(self._esperando)
+
+    def reintentar_en(self):
+        """Segundos sugeridos para Retry-After: lo que tardaría en vaciarse la cola"""
+        with self._lock:
+            pendientes = len(self._esperando) + 1
+        return max(1, math.ceil(self._duracion_media * pendientes / max(1, self.limite)))
+
+
+LIMITES = {clase: Limite(clase, *_configuracion(clase)) for clase in POR_DEFECTO}
+
+
+def configurar(asgi=False):
+    """
+    Vuelve a crear los límites de cada clase
+
+    Args:
+        asgi: Usar los límites de asgi.py (ADMISION_ASGI_*)
+    """
+    LIMITES.update({clase: Limite(clase, *_configuracion(clase, asgi)) for clase in POR_DEFECTO})
+
+
+# Clave del environ con (límite, inicio) del turno de la petición
+TURNO = 'admision.turno'
+
+
+def tomar_turno(environ, limite):
+    """Anota en la petición el turno que acaba de conseguir"""
+    environ[TURNO] = (limite, time.perf_counter())
+
+
+def soltar_turno(environ):
+    """
+    Libera el turno de la petición, si lo tiene
+
+    Returns:
+        Su límite (para recuperar_turno), o None si no tenía turno
+    """
+    turno = environ.pop(TURNO, None)
+    if turno is None:
+        return None
+    limite, inicio = turno
+    limite.salir(time.perf_counter() - inicio)
+    return limite
+
+
+def recuperar_turno(environ, limite):
+    """
+    Vuelve a esperar turno tras soltar_turno
+
+    Returns:
+        True si lo tiene (o no hacía falta), False si se rechaza
+    """
+    if limite is None:
+        return True
+    admitida, _ = limite.entrar()
+    if admitida:
+        tomar_turno(environ, limite)
+    return admitida
+
+
+async def recuperar_turno_async(environ, limite):
+    """Versión asíncrona de recuperar_turno"""
+    if limite is None:
+        return True
+    admitida, _ = await limite.entrar_async()
+    if admitida:
+        tomar_turno(environ, limite)
+    return admitida
+
+
+def limite_de_ruta(ruta, en_hilo=False, cuerpo=None):
+    """
+    Límite de la clase de la ruta, o None si no tiene
+
+    Args:
+        en_hilo: La ruta ocupa un hilo del pool de asgi.py: las de IA cuentan
+            como 'render'
+        cuerpo: JSON de la petición, para las rutas de RUTAS_CON_IA
+    """
+    clase = RUTAS.get(ruta, 'ligera')
+    campo = RUTAS_CON_IA.get(ruta)
+    if campo and isinstance(cuerpo, dict) and cuerpo.get(campo):
+        clase = 'ia'
+    if en_hilo and clase == 'ia':
+        clase = 'render'
+    limite = LIMITES[clase]
+    return limite if limite.limite > 0 else None
+
+
+@metricas.registrar_colector
+def _colector_admision():
+    for clase, limite in LIMITES.items():
+        en_curso, en_cola = limite.estado()
+        metricas.ADMISION_EN_CURSO.fijar(en_curso, clase=clase)
+        metricas.ADMISION_EN_COLA.fijar(en_cola, clase=clase)
+        metricas.ADMISION_LIMITE.fijar(limite.limite, clase=clase)
@@ -1,23 +1,42 @@
-from flask import Flask, render_template, request, send_file, jsonify, session, redirect
+from flask import Flask, render_template, request, send_file, jsonify, session, redirect, g, stream_with_context
 from flask_cors import CORS
 import os
-import json
-import tempfile
-import secrets
+import hmac
 import io
-from datetime import datetime
 import sys
+import time
+import logging
 import base64
 
 # Importar los generadores y analizador IA
 sys.path.append(os.path.dirname(__file__))
-from generar_informe import generar_informe_pdf
-from generar_informe_v2 import generar_informe_v2_pdf
+
+# El .env antes que cualquier módulo que lea su configuración al importarse
+import entorno
+entorno.cargar()
+
+from generar_informe_v2 import (generar_informe_v2_pdf, exportar_campo, FORMATOS_CAMPO, PNGNoDisponible,
+                                obtener_logo_path)
 from generar_plan_partido import generar_plan_partido_pdf
 from ia_analyzer import IAAnalyzer
+from cache_lru import CacheLRU, hash_contenido
+from documento_pdf import fecha_informe, huella_codigo
+import metricas
+import instrumentacion
+import perfilador
+import trazas
+import registro
+import sesiones
+import admision
+import idempotencia
+import lote
+import pack_partido
+
+registro.configurar()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='static')
-app.secret_key = secrets.token_hex(32)
+sesiones.configurar(app)
 CORS(app)
 
 # Crear directorio static si no existe
@@ -28,6 +47,239 @@ if not os.path.exists(static_dir):
 # Contraseña de acceso - CAMBIAR ESTO
 ACCESS_PASSWORD = "CAC2025"
 
+# /metrics exige "Authorization: Bearer <METRICAS_TOKEN>"; sin token está
+# cerrado, salvo con METRICAS_PUBLICAS=1 (p. ej. en una red privada)
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN')
+METRICAS_PUBLICAS = os.environ.get('METRICAS_PUBLICAS') == '1'
+if not METRICAS_TOKEN and not METRICAS_PUBLICAS:
+    logger.info("/metrics cerrado: define METRICAS_TOKEN (o METRICAS_PUBLICAS=1)")
+
+def generar_informe_pdf(datos, nombre_archivo, **kwargs):
+    """
+    Generador v1, importado en el primer uso: su módulo lleva el logo en
+    base64 y casi nadie lo usa ya, así que no se carga al arrancar el worker
+    """
+    from generar_informe import generar_informe_pdf as generar
+    return generar(datos, nombre_archivo, **kwargs)
+
+
+# Nombre de cada generador en las métricas
+NOMBRES_GENERADOR = {
+    generar_informe_pdf: 'informe',
+    generar_informe_v2_pdf: 'informe_v2',
+    generar_plan_partido_pdf: 'plan_partido',
+    pack_partido.generar_pack_pdf: 'pack_partido',
+}
+
+# PDFs generados recientemente: etag (hash de los datos) -> bytes.
+# Los PDFs son deterministas, así que una repetición no vuelve a renderizar.
+CACHE_PDFS = CacheLRU('pdfs', max_entradas=64)
+
+
+def etag_pdf(generador, datos, **kwargs):
+    """
+    ETag de un PDF calculado a partir de lo que lo determina, sin renderizarlo
+
+    En modo determinista los mismos datos dan los mismos bytes, así que basta
+    con el generador, los datos, la fecha efectiva del informe, el logo
+    actual y el código de los generadores (huella_codigo). Sirve también de
+    clave de CACHE_PDFS.
+    """
+    with instrumentacion.etapa('etag'):
+        fecha = fecha_informe(datos, deterministico=True)
+        logo_path = obtener_logo_path()
+        logo = (logo_path, os.path.getmtime(logo_path)) if logo_path else None
+        return hash_contenido(generador.__name__, datos, kwargs, fecha.isoformat(), logo, huella_codigo())
+
+
+def generar_pdf_cacheado(generador, datos, **kwargs):
+    """
+    Genera un PDF en modo determinista (o lo reutiliza) y devuelve (etag, bytes)
+    """
+    etag = etag_pdf(generador, datos, **kwargs)
+
+    with instrumentacion.etapa('cache'):
+        pdf_data = CACHE_PDFS.obtener(etag)
+    if pdf_data is None:
+        buffer = io.BytesIO()
+        nombre = NOMBRES_GENERADOR.get(generador, generador.__name__)
+        with metricas.PDF_RENDER.cronometrar(generador=nombre), trazas.span('render', generador=nombre):
+            generador(datos, buffer, deterministico=True, **kwargs)
+        with instrumentacion.etapa('io'):
+            pdf_data = buffer.getvalue()
+        CACHE_PDFS.guardar(etag, pdf_data)
+    else:
+        instrumentacion.anotar('cache', 0, 'hit')
+    return etag, pdf_data
+
+
+def nombre_pdf(prefijo, datos):
+    """Nombre de descarga del PDF: <prefijo>_<Rival>_<AAAAMMDD>.pdf"""
+    rival = datos.get('nombre_rival', 'Rival').replace(' ', '_')
+    fecha = fecha_informe(datos, deterministico=True).strftime('%Y%m%d')
+    return f"{prefijo}_{rival}_{fecha}.pdf"
+
+
+def respuesta_no_modificada(etag, debil=False):
+    """Devuelve un 304 si el navegador ya tiene esta versión (If-None-Match)"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=debil)
+        return response
+    return None
+
+
+def enviar_pdf(pdf_data, etag, nombre_archivo, debil=False):
+    """Envía el PDF como descarga con ETag (fuerte salvo que se indique)"""
+    with instrumentacion.etapa('io'):
+        response = send_file(
+            io.BytesIO(pdf_data),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=nombre_archivo
+        )
+    response.set_etag(etag, weak=debil)
+    return response
+
+
+@app.before_request
+def iniciar_medicion():
+    g.inicio_peticion = time.perf_counter()
+    g.id_peticion = instrumentacion.nuevo_id_peticion(request.headers.get('X-Request-ID'))
+    instrumentacion.iniciar()
+
+    # Span raíz de la traza (si TRAZAS_FICHERO está definido)
+    ruta = request.url_rule.rule if request.url_rule else 'sin_ruta'
+    g.traza = trazas.iniciar_raiz(f'{request.method} {ruta}', request.headers.get('traceparent'),
+                                  id_peticion=g.id_peticion, **{'http.method': request.method,
+                                                                'http.route': ruta})
+
+    # Perfilado bajo demanda (solo para sesiones autenticadas)
+    modo = perfilador.modo_solicitado(request.headers, request.args)
+    if modo and session.get('authenticated'):
+        g.perfil_solicitado = True
+        g.perfil = perfilador.iniciar(modo, g.id_peticion, request.path)
+
+    # Parsear aquí el JSON para medirlo; Flask lo guarda y request.json ya no lo repite
+    if request.is_json:
+        with instrumentacion.etapa('parse'):
+            request.get_json(silent=True)
+
+
+@app.before_request
+def admitir_peticion():
+    """
+    Control de admisión por clase de ruta (ver admision.py): espera turno o
+    rechaza con 429 si la clase está saturada
+    """
+    # asgi.py ya ha esperado turno en el bucle de eventos (con su límite) y
+    # lo libera él
+    previa = request.environ.get('admision.resultado')
+    if 'admision.limite' in request.environ:
+        limite = request.environ['admision.limite']
+    else:
+        cuerpo = request.get_json(silent=True) if request.path in admision.RUTAS_CON_IA else None
+        limite = admision.limite_de_ruta(request.path, cuerpo=cuerpo)
+    if limite is None:
+        return None
+
+    admitida, espera = previa if previa else limite.entrar()
+    if espera > 0.001:
+        instrumentacion.anotar('cola', espera)
+    if not admitida:
+        respuesta = jsonify({'success': False,
+                             'error': 'Servidor ocupado, inténtalo de nuevo en unos segundos'})
+        respuesta.status_code = 429
+        respuesta.headers['Retry-After'] = str(limite.reintentar_en())
+        return respuesta
+    if not previa:
+        admision.tomar_turno(request.environ, limite)
+    return None
+
+
+@app.after_request
+def finalizar_medicion(response):
+    """
+    Cuenta la petición y su latencia por ruta (la regla, no la URL concreta)
+    y añade el desglose por etapas en la cabecera Server-Timing
+    """
+    inicio = g.pop('inicio_peticion', None)
+    tiempos = instrumentacion.finalizar()
+    if inicio is not None:
+        total = time.perf_counter() - inicio
+        ruta = request.url_rule.rule if request.url_rule else 'sin_ruta'
+        metricas.HTTP_PETICIONES.inc(ruta=ruta, metodo=request.method, estado=response.status_code)
+        metricas.HTTP_DURACION.observar(total, ruta=ruta, metodo=request.method)
+        metricas.volcar()
+        response.headers['Server-Timing'] = instrumentacion.cabecera_server_timing(tiempos, total)
+
+    perfil = g.pop('perfil', None)
+    if perfil:
+        perfil.detener(response.status_code)
+        response.headers['X-Perfil'] = g.id_peticion
+    elif g.pop('perfil_solicitado', False):
+        # Ya había otro perfil en curso en este proceso
+        response.headers['X-Perfil'] = 'ocupado'
+
+    if 'id_peticion' in g:
+        response.headers['X-Request-ID'] = g.id_peticion
+
+    span, token = g.pop('traza', (None, None))
+    trazas.terminar_raiz(span, token, **{'http.status_code': response.status_code})
+    return response
+
+
+@app.teardown_request
+def detener_perfil_pendiente(error=None):
+    """Garantiza que el perfilador y la traza se cierran aunque la petición falle"""
+    perfil = g.pop('perfil', None)
+    if perfil:
+        perfil.detener(500)
+
+    span, token = g.pop('traza', (None, None))
+    if span:
+        span.error = repr(error) if error else 'sin respuesta'
+    trazas.terminar_raiz(span, token, **{'http.status_code': 500})
+
+
+@app.teardown_request
+def liberar_turno(error=None):
+    """Devuelve el turno de admisión al terminar la petición, falle o no"""
+    # Con asgi.py lo devuelve él al terminar de enviar la respuesta
+    if 'admision.limite' not in request.environ:
+        admision.soltar_turno(request.environ)
+
+
+@app.route('/metrics')
+def metrics():
+    """Métricas de todos los workers en formato de texto de Prometheus"""
+    if METRICAS_TOKEN:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICAS_TOKEN}'):
+            return jsonify({'error': 'No autorizado'}), 401
+    elif not METRICAS_PUBLICAS:
+        return jsonify({'error': 'Métricas desactivadas: falta METRICAS_TOKEN'}), 404
+    return app.response_class(metricas.exportar(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/perfiles')
+def perfiles():
+    """Lista de perfiles guardados en este servidor"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+    return jsonify({'success': True, 'perfiles': perfilador.listar_perfiles()})
+
+
+@app.route('/perfiles/<id_peticion>')
+def descargar_perfil(id_peticion):
+    """Descargar el perfil de una petición (.prof o .collapsed)"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+    ruta = perfilador.ruta_perfil(id_peticion)
+    if not ruta:
+        return jsonify({'success': False, 'error': 'Perfil no encontrado'}), 404
+    return send_file(ruta, as_attachment=True, download_name=os.path.basename(ruta))
+
+
 @app.route('/')
 def index():
     """Página de login"""
@@ -53,6 +305,7 @@ def app_page():
     return render_template('index_v2.html')
 
 @app.route('/generar', methods=['POST'])
+@idempotencia.idempotente
 def generar():
     """Generar el PDF con los datos recibidos"""
     if not session.get('authenticated'):
@@ -61,75 +314,99 @@ def generar():
     try:
         datos = request.json
         
-        # Crear archivo temporal para el JSON
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as json_file:
-            json.dump(datos, json_file, ensure_ascii=False, indent=2)
-            json_path = json_file.name
-        
-        # Crear archivo temporal para el PDF
-        pdf_path = tempfile.mktemp(suffix='.pdf')
-        
-        # Generar el PDF
-        generar_informe_pdf(datos, pdf_path)
-        
-        # Leer el PDF
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
-        
-        # Limpiar archivos temporales
-        try:
-            os.unlink(json_path)
-            os.unlink(pdf_path)
-        except:
-            pass
-        
-        # Nombre del archivo
-        nombre_archivo = f"Informe_{datos.get('nombre_rival', 'Rival').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
+        # Si el navegador ya lo tiene, ni se genera
+        no_modificado = respuesta_no_modificada(etag_pdf(generar_informe_pdf, datos))
+        if no_modificado:
+            return no_modificado
+
+        # Generar el PDF (o reutilizar el ya generado con los mismos datos)
+        etag, pdf_data = generar_pdf_cacheado(generar_informe_pdf, datos)
         
         # Enviar el PDF
-        return send_file(
-            io.BytesIO(pdf_data),
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=nombre_archivo
-        )
+        return enviar_pdf(pdf_data, etag, nombre_pdf('Informe', datos))
     
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Error generando PDF")
         return jsonify({'error': str(e)}), 500
 
+
+# =============================================================================
+# RUTAS DE IA: validación y respuestas (las comparte asgi.py)
+# =============================================================================
+MINIMO_NOTAS = 50
+
+
+def validar_peticion_ia(datos, con_notas=False):
+    """
+    Comprueba el cuerpo de una petición a una ruta de IA
+
+    Args:
+        datos: request.json
+        con_notas: Exigir el campo 'notas' (/analizar_notas)
+
+    Returns:
+        None si es válido, o la respuesta 400
+    """
+    if not isinstance(datos, dict):
+        return jsonify({'success': False, 'error': 'El cuerpo debe ser un objeto JSON'}), 400
+    notas = datos.get('notas', '')
+    if con_notas and (not isinstance(notas, str) or len(notas.strip()) < MINIMO_NOTAS):
+        return jsonify({
+            'success': False,
+            'error': f'Las notas deben tener al menos {MINIMO_NOTAS} caracteres para un análisis adecuado'
+        }), 400
+    return None
+
+
+def respuesta_ia(resultado):
+    """Resultado de IAAnalyzer: 200 si ha ido bien, 500 si no"""
+    if resultado['success']:
+        return jsonify(resultado)
+    return jsonify(resultado), 500
+
+
+def respuesta_dibujos(dibujos):
+    """Respuesta de /generar_dibujos_ia"""
+    with instrumentacion.etapa('encode', 'json'):
+        return jsonify({
+            'success': True,
+            'dibujos': dibujos
+        })
+
+
+def error_ia(mensaje, prefijo=None):
+    """
+    500 por un error inesperado en una ruta de IA (llamar desde el except)
+
+    Args:
+        mensaje: Mensaje del registro
+        prefijo: Texto antes del error en la respuesta (None: solo el error)
+    """
+    logger.exception(mensaje)
+    error = sys.exc_info()[1]
+    return jsonify({
+        'success': False,
+        'error': f'{prefijo}: {error}' if prefijo else str(error)
+    }), 500
+
+
 @app.route('/analizar_notas', methods=['POST'])
 def analizar_notas():
     """Analizar notas del partido con IA y devolver datos estructurados"""
     if not session.get('authenticated'):
         return jsonify({'error': 'No autorizado'}), 401
 
-    try:
-        datos = request.json
-        notas_texto = datos.get('notas', '')
-        provider = datos.get('provider', 'groq')
-
-        if not notas_texto or len(notas_texto.strip()) < 50:
-            return jsonify({
-                'success': False,
-                'error': 'Las notas deben tener al menos 50 caracteres para un análisis adecuado'
-            }), 400
+    datos = request.json
+    invalida = validar_peticion_ia(datos, con_notas=True)
+    if invalida:
+        return invalida
 
+    try:
         # Analizar con IA
-        analyzer = IAAnalyzer(provider=provider)
-        resultado = analyzer.analizar_notas_rival(notas_texto)
-
-        if resultado['success']:
-            return jsonify(resultado)
-        else:
-            return jsonify(resultado), 500
-
-    except Exception as e:
-        print(f"Error en análisis IA: {e}")
-        return jsonify({
-            'success': False,
-            'error': f'Error al analizar: {str(e)}'
-        }), 500
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_ia(analyzer.analizar_notas_rival(datos['notas']))
+    except Exception:
+        return error_ia("Error en análisis IA", 'Error al analizar')
 
 
 @app.route('/generar_sugerencias_plan', methods=['POST'])
@@ -138,30 +415,22 @@ def generar_sugerencias_plan():
     if not session.get('authenticated'):
         return jsonify({'error': 'No autorizado'}), 401
 
-    try:
-        datos = request.json
-        datos_rival = datos.get('datos_rival', {})
-        notas_adicionales = datos.get('notas_adicionales', '')
-        provider = datos.get('provider', 'groq')
+    datos = request.json
+    invalida = validar_peticion_ia(datos)
+    if invalida:
+        return invalida
 
+    try:
         # Analizar con IA
-        analyzer = IAAnalyzer(provider=provider)
-        resultado = analyzer.generar_plan_tactico(datos_rival, notas_adicionales)
-
-        if resultado['success']:
-            return jsonify(resultado)
-        else:
-            return jsonify(resultado), 500
-
-    except Exception as e:
-        print(f"Error en generación de plan: {e}")
-        return jsonify({
-            'success': False,
-            'error': f'Error al generar sugerencias: {str(e)}'
-        }), 500
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_ia(analyzer.generar_plan_tactico(datos.get('datos_rival', {}),
+                                                          datos.get('notas_adicionales', '')))
+    except Exception:
+        return error_ia("Error en generación de plan", 'Error al generar sugerencias')
 
 
 @app.route('/generar_plan', methods=['POST'])
+@idempotencia.idempotente
 def generar_plan():
     """Generar el PDF del Plan de Partido"""
     if not session.get('authenticated'):
@@ -170,65 +439,76 @@ def generar_plan():
     try:
         datos = request.json
 
-        # Crear archivo temporal para el PDF
-        pdf_path = tempfile.mktemp(suffix='.pdf')
-
-        # Generar el PDF
-        generar_plan_partido_pdf(datos, pdf_path)
+        # Si el navegador ya lo tiene, ni se genera
+        no_modificado = respuesta_no_modificada(etag_pdf(generar_plan_partido_pdf, datos))
+        if no_modificado:
+            return no_modificado
 
-        # Leer el PDF
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
-
-        # Limpiar archivo temporal
-        try:
-            os.unlink(pdf_path)
-        except:
-            pass
-
-        # Nombre del archivo
-        nombre_archivo = f"Plan_Partido_vs_{datos.get('nombre_rival', 'Rival').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
+        # Generar el PDF (o reutilizar el ya generado con los mismos datos)
+        etag, pdf_data = generar_pdf_cacheado(generar_plan_partido_pdf, datos)
 
         # Enviar el PDF
-        return send_file(
-            io.BytesIO(pdf_data),
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=nombre_archivo
-        )
+        return enviar_pdf(pdf_data, etag, nombre_pdf('Plan_Partido_vs', datos))
 
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Error generando PDF")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/generar_dibujos_ia', methods=['POST'])
+@idempotencia.idempotente
 def generar_dibujos_ia():
     """Generar instrucciones de dibujo táctico con IA"""
     if not session.get('authenticated'):
         return jsonify({'error': 'No autorizado'}), 401
 
-    try:
-        datos = request.json
-        provider = datos.get('provider', 'groq')
+    datos = request.json
+    invalida = validar_peticion_ia(datos)
+    if invalida:
+        return invalida
 
+    try:
         # Analizar con IA para generar dibujos
-        analyzer = IAAnalyzer(provider=provider)
-        dibujos = analyzer.generar_todos_los_dibujos(datos)
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_dibujos(analyzer.generar_todos_los_dibujos(datos))
+    except Exception:
+        return error_ia("Error generando dibujos IA")
 
-        return jsonify({
-            'success': True,
-            'dibujos': dibujos
-        })
 
+@app.route('/exportar_campo', methods=['POST'])
+def exportar_campo_tactico():
+    """Exportar un único campo táctico como SVG/PNG para verlo sin generar el PDF"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, dict):
+        return jsonify({'success': False, 'error': 'Se esperaba un objeto JSON'}), 400
+
+    try:
+        formato = datos.get('formato', 'svg')
+
+        imagen = exportar_campo(
+            instrucciones=datos.get('instrucciones'),
+            formato=formato,
+            fase_tipo=datos.get('fase_tipo', 'ataque'),
+            tipo=datos.get('tipo', 'dinamico'),
+            width=datos.get('ancho'),
+            height=datos.get('alto'),
+            jugadores=datos.get('jugadores')
+        )
+
+        response = send_file(io.BytesIO(imagen), mimetype=FORMATOS_CAMPO[formato])
+        response.headers['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except PNGNoDisponible as e:
+        return jsonify({'success': False, 'error': str(e)}), 501
     except Exception as e:
-        print(f"Error generando dibujos IA: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.exception("Error exportando campo")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/previsualizar_v2', methods=['POST'])
@@ -241,33 +521,28 @@ def previsualizar_v2():
         datos = request.json
         dibujos_ia = datos.get('dibujos_ia', None)
 
-        # Crear archivo temporal para el PDF
-        pdf_path = tempfile.mktemp(suffix='.pdf')
+        # La respuesta JSON es otra representación: ETag propio
+        etag = f"{etag_pdf(generar_informe_v2_pdf, datos, dibujos_ia=dibujos_ia)}-b64"
+        no_modificado = respuesta_no_modificada(etag)
+        if no_modificado:
+            return no_modificado
 
         # Generar PDF v2.0 con dibujos de IA
-        generar_informe_v2_pdf(datos, pdf_path, dibujos_ia=dibujos_ia)
+        _, pdf_data = generar_pdf_cacheado(generar_informe_v2_pdf, datos, dibujos_ia=dibujos_ia)
 
-        # Leer el PDF y convertir a base64
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
+        with instrumentacion.etapa('encode', 'base64+json'):
             pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
 
-        # Limpiar archivo temporal
-        try:
-            os.unlink(pdf_path)
-        except:
-            pass
-
-        return jsonify({
-            'success': True,
-            'pdf_base64': pdf_base64,
-            'nombre_archivo': f"Informe_v2_{datos.get('nombre_rival', 'Rival').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        })
+            response = jsonify({
+                'success': True,
+                'pdf_base64': pdf_base64,
+                'nombre_archivo': nombre_pdf('Informe_v2', datos)
+            })
+        response.set_etag(etag)
+        return response
 
     except Exception as e:
-        print(f"Error en previsualización: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error en previsualización")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -275,6 +550,7 @@ def previsualizar_v2():
 
 
 @app.route('/generar_v2', methods=['POST'])
+@idempotencia.idempotente
 def generar_v2():
     """Generar el PDF v2.0 con análisis por fases y dibujos de IA"""
     if not session.get('authenticated'):
@@ -284,37 +560,111 @@ def generar_v2():
         datos = request.json
         dibujos_ia = datos.get('dibujos_ia', None)
 
-        # Crear archivo temporal para el PDF
-        pdf_path = tempfile.mktemp(suffix='.pdf')
+        # Si el navegador ya lo tiene, ni se genera
+        no_modificado = respuesta_no_modificada(etag_pdf(generar_informe_v2_pdf, datos, dibujos_ia=dibujos_ia))
+        if no_modificado:
+            return no_modificado
 
         # Generar PDF v2.0 con dibujos de IA
-        generar_informe_v2_pdf(datos, pdf_path, dibujos_ia=dibujos_ia)
+        etag, pdf_data = generar_pdf_cacheado(generar_informe_v2_pdf, datos, dibujos_ia=dibujos_ia)
 
-        # Leer el PDF
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
+        # Enviar el PDF
+        return enviar_pdf(pdf_data, etag, nombre_pdf('Informe_v2', datos))
 
-        # Limpiar archivo temporal
-        try:
-            os.unlink(pdf_path)
-        except:
-            pass
+    except Exception as e:
+        logger.exception("Error generando PDF")
+        return jsonify({'error': str(e)}), 500
 
-        # Nombre del archivo
-        nombre_archivo = f"Informe_v2_{datos.get('nombre_rival', 'Rival').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
 
-        # Enviar el PDF
-        return send_file(
-            io.BytesIO(pdf_data),
-            mimetype='application/pdf',
+@app.route('/generar_lote', methods=['POST'])
+def generar_lote():
+    """Generar los informes v2 de varios rivales en un ZIP que se envía según terminan"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.json or {}
+    informes = datos.get('informes')
+    if not isinstance(informes, list) or not informes:
+        return jsonify({'success': False, 'error': 'Indica la lista de informes'}), 400
+    if len(informes) > lote.MAXIMO:
+        return jsonify({
+            'success': False,
+            'error': f'Como máximo {lote.MAXIMO} informes por lote'
+        }), 400
+    if not all(isinstance(informe, dict) for informe in informes):
+        return jsonify({'success': False, 'error': 'Cada informe debe ser un objeto'}), 400
+
+    resultados = lote.generar_lote(informes, dibujos=bool(datos.get('dibujos')),
+                                   provider=datos.get('provider', 'groq'))
+    nombre = f"Informes_lote_{time.strftime('%Y%m%d')}.zip"
+    return app.response_class(
+        stream_with_context(lote.zip_en_streaming(resultados)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename={nombre}'},
+    )
+
+
+@app.route('/generar_pack_partido', methods=['POST'])
+@idempotencia.idempotente
+def generar_pack_partido():
+    """Generar el informe v2 y el plan de partido en una petición (un PDF o un ZIP)"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.json or {}
+    informe = datos.get('informe')
+    plan = datos.get('plan', {})
+    formato = datos.get('formato', 'pdf')
+    if not isinstance(informe, dict) or not isinstance(plan, dict):
+        return jsonify({'success': False, 'error': 'Indica los datos del informe y del plan'}), 400
+    if formato not in pack_partido.FORMATOS:
+        return jsonify({'success': False, 'error': f'Formato no soportado: {formato}'}), 400
+
+    opciones = {
+        'dibujos': bool(datos.get('dibujos', True)),
+        'sugerencias': bool(datos.get('sugerencias', True)),
+        'datos_rival': datos.get('datos_rival'),
+        'notas_adicionales': datos.get('notas_adicionales', ''),
+        'provider': datos.get('provider', 'groq'),
+    }
+
+    try:
+        # ETag de lo que pide el cliente, antes de los pasos de IA: si ya
+        # tiene el pack de esta petición no se llama al LLM ni se renderiza.
+        # Es débil porque los dibujos y sugerencias de la IA pueden variar.
+        etag = etag_pdf(pack_partido.generar_pack_pdf, informe, plan=plan, formato=formato, **opciones)
+        no_modificado = respuesta_no_modificada(etag, debil=True)
+        if no_modificado:
+            return no_modificado
+
+        # Dibujos y sugerencias de la IA a la vez
+        pack = pack_partido.preparar(informe, plan, **opciones)
+
+        if formato == 'pdf':
+            _, pdf_data = generar_pdf_cacheado(pack_partido.generar_pack_pdf, pack)
+            return enviar_pdf(pdf_data, etag, nombre_pdf('Pack_Partido', informe), debil=True)
+
+        # ZIP con los mismos PDFs de /generar_v2 y /generar_plan
+        _, pdf_informe = generar_pdf_cacheado(generar_informe_v2_pdf, pack['informe'],
+                                              dibujos_ia=pack['dibujos_ia'])
+        _, pdf_plan = generar_pdf_cacheado(generar_plan_partido_pdf, pack['plan'])
+
+        with instrumentacion.etapa('encode', 'zip'):
+            zip_data = pack_partido.empaquetar_zip([
+                (nombre_pdf('Informe_v2', pack['informe']), pdf_informe),
+                (nombre_pdf('Plan_Partido_vs', pack['plan']), pdf_plan),
+            ])
+        response = send_file(
+            io.BytesIO(zip_data),
+            mimetype='application/zip',
             as_attachment=True,
-            download_name=nombre_archivo
+            download_name=nombre_pdf('Pack_Partido', informe)[:-len('.pdf')] + '.zip'
         )
+        response.set_etag(etag, weak=True)
+        return response
 
     except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generando el pack de partido")
         return jsonify({'error': str(e)}), 500
 
 
@@ -348,7 +698,7 @@ def upload_logo():
         })
 
     except Exception as e:
-        print(f"Error subiendo logo: {e}")
+        logger.exception("Error subiendo logo")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -369,6 +719,97 @@ def logout():
     session.clear()
     return jsonify({'success': True})
 
+
+# =============================================================================
+# ARRANQUE (gunicorn con preload_app, ver gunicorn.conf.py)
+# =============================================================================
+# Datos del render de prueba de precargar(): pocos, pero pasan por todos los
+# elementos (fases con texto y patrones, jugadores, flechas de cada tipo,
+# zona, línea táctica y los esquemas de tactical_options del plan)
+DIBUJO_PRECARGA = {
+    'jugadores': [{'x': 30, 'y': 50, 'numero': '9', 'color': 'rojo', 'destacado': True},
+                  {'x': 60, 'y': 30, 'numero': '4', 'color': 'azul', 'destacado': False}],
+    'flechas': [{'x1': 20, 'y1': 50, 'x2': 45, 'y2': 40, 'color': 'amarillo', 'tipo': 'pase'},
+                {'x1': 45, 'y1': 40, 'x2': 70, 'y2': 60, 'color': 'blanco', 'tipo': 'movimiento'},
+                {'x1': 50, 'y1': 70, 'x2': 80, 'y2': 70, 'color': 'verde', 'tipo': 'conduccion'}],
+    'zonas': [{'x': 60, 'y': 20, 'ancho': 20, 'alto': 30, 'color': 'naranja', 'nombre': 'Zona'}],
+    'linea_tactica': {'activa': True, 'x': 40, 'color': 'rojo'},
+}
+
+FASE_PRECARGA = {
+    'estructura': 'Salida por bandas con el lateral muy abierto',
+    'patrones': ['El pivote se incrusta entre centrales'],
+    'debilidad': 'Repliegue lento',
+    'fortaleza': 'Presión tras pérdida',
+}
+
+DATOS_PRECARGA_V2 = {
+    'nombre_rival': 'Precarga', 'jornada': '1', 'sistema': '4-4-2', 'fecha': '2025-01-01',
+    'ataque': {'vs_bloque_alto': FASE_PRECARGA},
+    'defensa': {'pressing_alto': FASE_PRECARGA},
+    'transiciones': {'def_atq': FASE_PRECARGA},
+    'abp': {'corners_favor': 'Al segundo palo'},
+    'jugadores_clave': [{'numero': '9', 'nombre': 'Delantero', 'posicion': 'DC',
+                         'nivel': 'peligroso', 'caracteristicas': 'Rápido'}],
+}
+
+DIBUJOS_PRECARGA_V2 = {
+    'ataque': {'vs_bloque_alto': DIBUJO_PRECARGA},
+    'defensa': {'pressing_alto': DIBUJO_PRECARGA},
+    'transiciones': {'def_atq': DIBUJO_PRECARGA},
+    'abp': {'corners': DIBUJO_PRECARGA},
+}
+
+DATOS_PRECARGA_PLAN = {
+    'nombre_rival': 'Precarga', 'jornada': '1', 'sistema_rival': '4-4-2', 'fecha': '2025-01-01',
+    'plan_sistema_propio': '4-3-3', 'plan_defensiva': 'bloque_alto', 'plan_ofensiva': 'vs_bloque_alto',
+    'plan_transicion_def_atq': 'directo', 'plan_transicion_atq_def': 'pressing_inmediato',
+    'plan_instrucciones': 'Presionar la salida',
+}
+
+
+def precargar():
+    """
+    Deja listo en el proceso maestro lo que comparten todos los workers
+
+    Con preload_app, gunicorn importa la app una vez y hace fork de cada
+    worker: las páginas de memoria se comparten (copy-on-write) mientras
+    nadie las modifique. Aquí se fuerzan las cargas perezosas de ReportLab
+    (métricas de fuentes, módulos de gráficos), los estilos, el logo
+    reducido y la plantilla del informe v2, y un render de prueba de cada
+    generador recorre el resto (geometría del campo, tactical_options).
+
+    Pone a cero las métricas y las estadísticas de tamaño del proceso para
+    que los renders de prueba no cuenten. Solo se llama desde crear_app,
+    antes de atender ninguna petición, así que no se pierde nada más.
+    """
+    from documento_pdf import TAMANOS_PDF
+
+    inicio = time.perf_counter()
+    generar_informe_v2_pdf(DATOS_PRECARGA_V2, io.BytesIO(), dibujos_ia=DIBUJOS_PRECARGA_V2,
+                           usar_cache=False, deterministico=True)
+    generar_plan_partido_pdf(DATOS_PRECARGA_PLAN, io.BytesIO(), deterministico=True)
+
+    metricas.reiniciar()
+    TAMANOS_PDF.clear()
+    logger.info("Precarga completada en %.0f ms", (time.perf_counter() - inicio) * 1000)
+
+
+def crear_app(precarga=True):
+    """
+    Factoría de la app para gunicorn ('app:crear_app()') y asgi.py
+
+    Falla si no hay clave de firma de la sesión (sesiones.exigir_clave).
+
+    Args:
+        precarga: Ejecutar precargar() antes de devolverla
+    """
+    sesiones.exigir_clave(app)
+    if precarga:
+        precargar()
+    return app
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
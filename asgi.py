@@ -0,0 +1,289 @@
+"""
+Punto de entrada ASGI de la webapp
+Club Atlético Central
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+
+Las rutas de IA (/analizar_notas, /generar_sugerencias_plan y
+/generar_dibujos_ia) se atienden en el bucle de eventos con la API asíncrona
+de IAAnalyzer: mientras esperan al LLM no ocupan ningún hilo, así que un solo
+proceso puede tener muchas en vuelo. El resto de rutas (PDFs, login,
+métricas...) son las de la app Flask de siempre y se ejecutan en un pool de
+hilos, para que el render no bloquee el bucle.
+
+Las rutas asíncronas pasan por los mismos before/after_request de Flask:
+sesión, X-Request-ID, Server-Timing, métricas, trazas, perfilador y control
+de admisión no cambian, y las respuestas son las mismas que en app.py.
+
+El control de admisión usa sus propios límites, mucho más altos para las
+rutas de IA que los de gunicorn (ADMISION_ASGI_*, ver admision.py).
+
+Variables de entorno:
+    ASGI_HILOS      Hilos para las rutas síncronas (por defecto 4)
+    ASGI_PRECARGA   0 para no precargar al arrancar (por defecto 1)
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import jsonify, request, session
+
+from app import (app as flask_app, crear_app, validar_peticion_ia, respuesta_ia, respuesta_dibujos,
+                 error_ia)
+from ia_analyzer import IAAnalyzer, cerrar_cliente_async
+import admision
+import idempotencia
+
+logger = logging.getLogger(__name__)
+
+HILOS = int(os.environ.get('ASGI_HILOS', 4))
+PRECARGA = os.environ.get('ASGI_PRECARGA', '1') != '0'
+
+admision.configurar(asgi=True)
+
+_ejecutor = ThreadPoolExecutor(max_workers=HILOS, thread_name_prefix='wsgi')
+
+
+# =============================================================================
+# RUTAS ASÍNCRONAS (mismo contrato que las de app.py)
+# =============================================================================
+async def analizar_notas():
+    """Analizar notas del partido con IA y devolver datos estructurados"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.json
+    invalida = validar_peticion_ia(datos, con_notas=True)
+    if invalida:
+        return invalida
+
+    try:
+        # Crearlo no importa ningún SDK (la API asíncrona usa httpx)
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_ia(await analyzer.analizar_notas_rival_async(datos['notas']))
+    except Exception:
+        return error_ia("Error en análisis IA", 'Error al analizar')
+
+
+async def generar_sugerencias_plan():
+    """Generar sugerencias tácticas para el plan de partido"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.json
+    invalida = validar_peticion_ia(datos)
+    if invalida:
+        return invalida
+
+    try:
+        # Crearlo no importa ningún SDK (la API asíncrona usa httpx)
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_ia(await analyzer.generar_plan_tactico_async(datos.get('datos_rival', {}),
+                                                                     datos.get('notas_adicionales', '')))
+    except Exception:
+        return error_ia("Error en generación de plan", 'Error al generar sugerencias')
+
+
+@idempotencia.idempotente
+async def generar_dibujos_ia():
+    """Generar instrucciones de dibujo táctico con IA (los nueve a la vez)"""
+    if not session.get('authenticated'):
+        return jsonify({'error': 'No autorizado'}), 401
+
+    datos = request.json
+    invalida = validar_peticion_ia(datos)
+    if invalida:
+        return invalida
+
+    try:
+        # Crearlo no importa ningún SDK (la API asíncrona usa httpx)
+        analyzer = IAAnalyzer(provider=datos.get('provider', 'groq'))
+        return respuesta_dibujos(await analyzer.generar_todos_los_dibujos_async(datos))
+    except Exception:
+        return error_ia("Error generando dibujos IA")
+
+
+RUTAS_ASYNC = {
+    ('POST', '/analizar_notas'): analizar_notas,
+    ('POST', '/generar_sugerencias_plan'): generar_sugerencias_plan,
+    ('POST', '/generar_dibujos_ia'): generar_dibujos_ia,
+}
+
+
+# =============================================================================
+# ADAPTADOR ASGI
+# =============================================================================
+def _environ(scope, cuerpo):
+    """Entorno WSGI equivalente a la petición ASGI"""
+    servidor = scope.get('server') or ('localhost', 80)
+    cliente = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': servidor[0],
+        'SERVER_PORT': str(servidor[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': cliente[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(cuerpo),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for nombre, valor in scope.get('headers', []):
+        nombre = nombre.decode('latin-1').upper().replace('-', '_')
+        valor = valor.decode('latin-1')
+        if nombre in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[nombre] = valor
+        else:
+            clave = f'HTTP_{nombre}'
+            environ[clave] = f'{environ[clave]},{valor}' if clave in environ else valor
+    environ.setdefault('CONTENT_LENGTH', str(len(cuerpo)))
+    return environ
+
+
+def _cabeceras_asgi(cabeceras):
+    return [(nombre.lower().encode('latin-1'), valor.encode('latin-1')) for nombre, valor in cabeceras]
+
+
+async def _leer_cuerpo(receive):
+    partes = []
+    while True:
+        mensaje = await receive()
+        if mensaje['type'] == 'http.disconnect':
+            break
+        partes.append(mensaje.get('body', b''))
+        if not mensaje.get('more_body'):
+            break
+    return b''.join(partes)
+
+
+def _cuerpo_json(environ):
+    """JSON del cuerpo para las rutas cuya clase de admisión depende de él"""
+    if environ['PATH_INFO'] not in admision.RUTAS_CON_IA:
+        return None
+    try:
+        return json.loads(environ['wsgi.input'].getvalue())
+    except ValueError:
+        return None
+
+
+async def _atender_async(vista, environ, send):
+    """
+    Ejecuta una vista asíncrona con el ciclo de Flask (full_dispatch_request)
+
+    El contexto de petición de Flask vive en variables de contexto, así que
+    es propio de la tarea y se mantiene entre los await.
+    """
+    with flask_app.request_context(environ):
+        try:
+            try:
+                rv = flask_app.preprocess_request()
+                if rv is None:
+                    rv = await vista()
+            except Exception as e:
+                rv = flask_app.handle_user_exception(e)
+            respuesta = flask_app.finalize_request(rv)
+        except Exception as e:
+            respuesta = flask_app.handle_exception(e)
+        cuerpo = respuesta.get_data()
+
+    await send({'type': 'http.response.start', 'status': respuesta.status_code,
+                'headers': _cabeceras_asgi(respuesta.headers.to_wsgi_list())})
+    await send({'type': 'http.response.body', 'body': cuerpo})
+
+
+def _atender_wsgi(environ, send, bucle):
+    """
+    Ejecuta la app Flask en un hilo del pool y envía la respuesta por partes
+    (las respuestas en streaming se van enviando según se generan)
+    """
+    inicio = {}
+
+    def enviar(mensaje):
+        asyncio.run_coroutine_threadsafe(send(mensaje), bucle).result()
+
+    def enviar_inicio():
+        if 'mensaje' in inicio and not inicio.get('enviado'):
+            enviar(inicio['mensaje'])
+            inicio['enviado'] = True
+
+    def escribir(datos):
+        enviar_inicio()
+        enviar({'type': 'http.response.body', 'body': datos, 'more_body': True})
+
+    def start_response(estado, cabeceras, exc_info=None):
+        if exc_info and inicio.get('enviado'):
+            raise exc_info[1].with_traceback(exc_info[2])
+        inicio['mensaje'] = {'type': 'http.response.start', 'status': int(estado.split(' ', 1)[0]),
+                             'headers': _cabeceras_asgi(cabeceras)}
+        return escribir
+
+    iterable = flask_app(environ, start_response)
+    try:
+        for parte in iterable:
+            if parte:
+                escribir(parte)
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+    enviar_inicio()
+    enviar({'type': 'http.response.body', 'body': b''})
+
+
+async def _lifespan(receive, send):
+    while True:
+        mensaje = await receive()
+        if mensaje['type'] == 'lifespan.startup':
+            # httpx se importa ya para que no lo pague la primera petición a la IA
+            import httpx  # noqa: F401
+            try:
+                await asyncio.get_running_loop().run_in_executor(_ejecutor, crear_app, PRECARGA)
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif mensaje['type'] == 'lifespan.shutdown':
+            await cerrar_cliente_async()
+            _ejecutor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI"""
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    environ = _environ(scope, await _leer_cuerpo(receive))
+
+    # La espera de turno (admision.py) se hace aquí, sin ocupar un hilo; la
+    # app Flask solo responde 429 si no se ha admitido
+    vista = RUTAS_ASYNC.get((scope['method'], scope['path']))
+    limite = environ['admision.limite'] = admision.limite_de_ruta(scope['path'], en_hilo=vista is None,
+                                                                  cuerpo=_cuerpo_json(environ))
+    if limite is not None:
+        environ['admision.resultado'] = await limite.entrar_async()
+        if environ['admision.resultado'][0]:
+            admision.tomar_turno(environ, limite)
+
+    try:
+        if vista is not None:
+            await _atender_async(vista, environ, send)
+        else:
+            bucle = asyncio.get_running_loop()
+            await bucle.run_in_executor(_ejecutor, _atender_wsgi, environ, send, bucle)
+    finally:
+        # La vista puede haberlo soltado (idempotencia.py)
+        admision.soltar_turno(environ)
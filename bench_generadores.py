@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los generadores de PDF
+Club Atlético Central
+
+Mide generar_informe_pdf, generar_informe_v2_pdf y generar_plan_partido_pdf
+con los datos sintéticos de cargas_sinteticas.py (perfiles vacio, tipico y
+peor_caso): tiempo real, tiempo de CPU, pico de memoria y tamaño del PDF.
+
+Los resultados se guardan en JSON para comparar ejecuciones entre commits:
+
+    python bench_generadores.py --salida bench/antes.json
+    python bench_generadores.py --salida bench/despues.json --comparar bench/antes.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import reportlab
+
+import cargas_sinteticas
+from generar_informe import generar_informe_pdf
+from generar_informe_v2 import generar_informe_v2_pdf
+from generar_plan_partido import generar_plan_partido_pdf
+
+
+def _informe(perfil, semilla):
+    datos = cargas_sinteticas.datos_informe(perfil, semilla)
+    return lambda destino: generar_informe_pdf(datos, destino, deterministico=True)
+
+
+def _informe_v2(perfil, semilla, usar_cache=False):
+    datos = cargas_sinteticas.datos_informe_v2(perfil, semilla)
+    dibujos = cargas_sinteticas.dibujos_ia(perfil, semilla)
+    return lambda destino: generar_informe_v2_pdf(datos, destino, dibujos_ia=dibujos,
+                                                  usar_cache=usar_cache, deterministico=True)
+
+
+def _informe_v2_cache(perfil, semilla):
+    return _informe_v2(perfil, semilla, usar_cache=True)
+
+
+def _plan(perfil, semilla):
+    datos = cargas_sinteticas.datos_plan(perfil, semilla)
+    return lambda destino: generar_plan_partido_pdf(datos, destino, deterministico=True)
+
+
+# Nombre -> función que prepara el render para un perfil y una semilla.
+# 'informe_v2' se mide sin la caché de campos tácticos (render completo);
+# 'informe_v2_cache' mide el caso de volver a generar el mismo informe.
+GENERADORES = {
+    'informe': _informe,
+    'informe_v2': _informe_v2,
+    'informe_v2_cache': _informe_v2_cache,
+    'plan_partido': _plan,
+}
+
+
+def _renderizar(render):
+    """Genera un PDF en memoria (sin los print de los generadores) y devuelve su tamaño"""
+    destino = io.BytesIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        render(destino)
+    return destino.getbuffer().nbytes
+
+
+def medir(render, repeticiones=5, calentamiento=1):
+    """
+    Mide un render
+
+    Args:
+        render: Función que escribe el PDF en el destino recibido
+        repeticiones: Ejecuciones cronometradas
+        calentamiento: Ejecuciones previas que no se cuentan (imports, cachés)
+
+    Returns:
+        dict con tiempos (s), pico de memoria (bytes) y tamaño del PDF (bytes)
+    """
+    for _ in range(calentamiento):
+        _renderizar(render)
+
+    tiempos, cpu = [], []
+    for _ in range(repeticiones):
+        t0, c0 = time.perf_counter(), time.process_time()
+        tamano = _renderizar(render)
+        tiempos.append(time.perf_counter() - t0)
+        cpu.append(time.process_time() - c0)
+
+    # La memoria se mide aparte: tracemalloc ralentiza mucho la ejecución
+    tracemalloc.start()
+    try:
+        _renderizar(render)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'repeticiones': repeticiones,
+        'wall_s': _resumen(tiempos),
+        'cpu_s': _resumen(cpu),
+        'memoria_pico_bytes': pico,
+        'tamano_bytes': tamano,
+    }
+
+
+def _resumen(valores):
+    return {
+        'min': min(valores),
+        'mediana': statistics.median(valores),
+        'media': statistics.fmean(valores),
+        'max': max(valores),
+    }
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(generadores=None, perfiles=None, repeticiones=5, semilla=0):
+    """Ejecuta el benchmark y devuelve el documento de resultados"""
+    generadores = generadores or list(GENERADORES)
+    perfiles = perfiles or list(cargas_sinteticas.PERFILES)
+
+    resultados = {}
+    for nombre in generadores:
+        for perfil in perfiles:
+            render = GENERADORES[nombre](perfil, semilla)
+            medida = medir(render, repeticiones)
+            resultados[f'{nombre}/{perfil}'] = medida
+            print(f"  {nombre:<17} {perfil:<10} "
+                  f"wall {medida['wall_s']['mediana'] * 1000:8.1f} ms  "
+                  f"cpu {medida['cpu_s']['mediana'] * 1000:8.1f} ms  "
+                  f"mem {medida['memoria_pico_bytes'] / 1024:8.0f} KB  "
+                  f"pdf {medida['tamano_bytes'] / 1024:7.1f} KB")
+
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_actual(),
+        'python': platform.python_version(),
+        'reportlab': reportlab.Version,
+        'plataforma': platform.platform(),
+        'semilla': semilla,
+        'resultados': resultados,
+    }
+
+
+def comparar(actual, anterior):
+    """Imprime la variación de cada medida respecto a una ejecución anterior"""
+    print(f"\nComparación con {anterior.get('commit') or 'ejecución anterior'} ({anterior.get('fecha')}):")
+    for clave, medida in actual['resultados'].items():
+        previa = anterior.get('resultados', {}).get(clave)
+        if not previa:
+            print(f"  {clave:<28} (nuevo)")
+            continue
+        cambios = []
+        for etiqueta, valor, valor_previo in (
+            ('wall', medida['wall_s']['mediana'], previa['wall_s']['mediana']),
+            ('cpu', medida['cpu_s']['mediana'], previa['cpu_s']['mediana']),
+            ('mem', medida['memoria_pico_bytes'], previa['memoria_pico_bytes']),
+            ('pdf', medida['tamano_bytes'], previa['tamano_bytes']),
+        ):
+            cambio = (valor - valor_previo) / valor_previo * 100 if valor_previo else 0.0
+            cambios.append(f"{etiqueta} {cambio:+6.1f}%")
+        print(f"  {clave:<28} " + '  '.join(cambios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de los generadores de PDF')
+    parser.add_argument('--generadores', nargs='+', choices=list(GENERADORES),
+                        help='Generadores a medir (por defecto, todos)')
+    parser.add_argument('--perfiles', nargs='+', choices=cargas_sinteticas.PERFILES,
+                        help='Perfiles de datos (por defecto, todos)')
+    parser.add_argument('-n', '--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', help='Fichero JSON donde guardar los resultados')
+    parser.add_argument('--comparar', help='JSON de una ejecución anterior con el que comparar')
+    args = parser.parse_args(argv)
+
+    print(f"⏱ Benchmark de generadores ({args.repeticiones} repeticiones)")
+    resultado = ejecutar(args.generadores, args.perfiles, args.repeticiones, args.semilla)
+
+    if args.salida:
+        os.makedirs(os.path.dirname(os.path.abspath(args.salida)), exist_ok=True)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(resultado, json.load(f))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Bloqueos de fichero entre los workers de una máquina
+Club Atlético Central
+
+Los usan idempotencia.py y coalescencia.py: un fichero <clave>.lock por
+clave en una carpeta compartida, bloqueado con fcntl.flock mientras un
+proceso trabaja con esa clave. Si el proceso muere, el sistema suelta el
+bloqueo.
+
+La espera puede ser acotada: se prueba sin bloquear (LOCK_NB) cada
+INTERVALO segundos hasta el plazo, así que una petición no se queda
+esperando indefinidamente a otra colgada. La versión asíncrona espera con
+asyncio.sleep, sin ocupar un hilo.
+
+Los .lock antiguos se borran con limpiar(), pero solo teniendo el bloqueo:
+uno en uso no se toca. Quien abrió el fichero justo antes de que se borrara
+lo nota al conseguir el bloqueo (la ruta ya no es ese fichero) y vuelve a
+abrirlo, así que nunca hay dos procesos con la misma clave.
+"""
+
+import asyncio
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: quien los usa comprueba fcntl antes
+    fcntl = None
+
+
+# Segundos entre intentos mientras otro proceso tiene el bloqueo
+INTERVALO = 0.05
+
+
+def _intentar(fichero):
+    try:
+        fcntl.flock(fichero, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _vigente(fichero, ruta):
+    """True si la ruta sigue siendo el fichero abierto (no lo ha borrado limpiar)"""
+    try:
+        actual = os.stat(ruta)
+    except FileNotFoundError:
+        return False
+    abierto = os.fstat(fichero.fileno())
+    return (actual.st_dev, actual.st_ino) == (abierto.st_dev, abierto.st_ino)
+
+
+def _conseguido(fichero, ruta):
+    """Con el bloqueo tomado: True si vale, o lo suelta si el fichero ya no es el de la ruta"""
+    if _vigente(fichero, ruta):
+        return True
+    liberar(fichero)
+    return False
+
+
+def adquirir(ruta, espera=None):
+    """
+    Bloquea el fichero `ruta` (lo crea si no existe)
+
+    Args:
+        ruta: Fichero de bloqueo
+        espera: Segundos como máximo esperando a otro proceso (None: sin límite)
+
+    Returns:
+        (fichero bloqueado o None si se agotó la espera, True si hubo que esperar)
+    """
+    limite = None if espera is None else time.monotonic() + espera
+    esperada = False
+    while True:
+        fichero = open(ruta, 'a')
+        if _intentar(fichero):
+            if _conseguido(fichero, ruta):
+                return fichero, esperada
+            continue
+        esperada = True
+        if limite is None:
+            fcntl.flock(fichero, fcntl.LOCK_EX)
+            if _conseguido(fichero, ruta):
+                return fichero, True
+            continue
+
+        while time.monotonic() < limite:
+            time.sleep(INTERVALO)
+            if _intentar(fichero):
+                break
+        else:
+            fichero.close()
+            return None, True
+        if _conseguido(fichero, ruta):
+            return fichero, True
+
+
+async def adquirir_async(ruta, espera=None):
+    """Versión asíncrona de adquirir: espera sin bloquear el bucle de eventos"""
+    limite = None if espera is None else time.monotonic() + espera
+    esperada = False
+    while True:
+        fichero = open(ruta, 'a')
+        try:
+            conseguido = _intentar(fichero)
+            while not conseguido and (limite is None or time.monotonic() < limite):
+                esperada = True
+                await asyncio.sleep(INTERVALO)
+                conseguido = _intentar(fichero)
+        except BaseException:
+            # Cancelada mientras esperaba: no tiene el bloqueo
+            fichero.close()
+            raise
+        if not conseguido:
+            fichero.close()
+            return None, True
+        if _conseguido(fichero, ruta):
+            return fichero, esperada
+
+
+def liberar(fichero):
+    fcntl.flock(fichero, fcntl.LOCK_UN)
+    fichero.close()
+
+
+def limpiar(directorio, antiguedad):
+    """
+    Borra los .lock creados hace más de `antiguedad` segundos que nadie usa
+
+    Cada uno se borra con su bloqueo tomado; los que están en uso se saltan.
+    """
+    limite = time.time() - antiguedad
+    try:
+        nombres = [n for n in os.listdir(directorio) if n.endswith('.lock')]
+    except OSError:
+        return
+    for nombre in nombres:
+        ruta = os.path.join(directorio, nombre)
+        try:
+            if os.path.getmtime(ruta) >= limite:
+                continue
+            with open(ruta, 'a') as fichero:
+                if not _intentar(fichero):
+                    continue
+                if _vigente(fichero, ruta):
+                    os.remove(ruta)
+        except OSError:
+            continue
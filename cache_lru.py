@@ -0,0 +1,86 @@
+"""
+Cachés en memoria para la generación de informes
+Club Atlético Central
+
+Caché LRU acotada y segura entre hilos, con contadores de aciertos para
+poder medir su efectividad, y un hash estable de contenido para construir
+las claves a partir de los datos del formulario.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+# Todas las cachés creadas en el proceso, por nombre
+CACHES = {}
+
+
+def hash_contenido(*partes):
+    """
+    Calcula un hash estable (sha256) de estructuras serializables a JSON
+
+    El orden de las claves de los diccionarios no influye en el resultado.
+    """
+    texto = json.dumps(partes, sort_keys=True, ensure_ascii=False,
+                       separators=(',', ':'), default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheLRU:
+    """Caché LRU con número máximo de entradas"""
+
+    def __init__(self, nombre, max_entradas=128):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        CACHES[nombre] = self
+
+    def obtener(self, clave, defecto=None):
+        """Devuelve el valor cacheado (y lo marca como reciente) o `defecto`"""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+            return defecto
+
+    def guardar(self, clave, valor):
+        """Guarda un valor descartando el menos usado si se supera el máximo"""
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def obtener_o_crear(self, clave, crear):
+        """Devuelve el valor cacheado o lo crea con `crear()` y lo guarda"""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+
+        valor = crear()
+        self.guardar(clave, valor)
+        return valor
+
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, clave):
+        return clave in self._datos
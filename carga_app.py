@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de la webapp (sin conexión a los proveedores de IA)
+Club Atlético Central
+
+Arranca la app con gunicorn en local, apuntando Groq a un servidor LLM falso
+que corre en este mismo proceso, y reproduce sesiones de entrenador por las
+rutas reales:
+
+    login -> /analizar_notas -> /generar_dibujos_ia -> /previsualizar_v2 (varias
+    veces, editando el informe) -> /generar_v2
+
+Informa del throughput, las latencias p50/p95/p99 y la tasa de errores de
+cada ruta. Sirve para dimensionar los workers antes de los picos de los
+viernes de jornada:
+
+    python carga_app.py --workers 4 --concurrencia 16 --sesiones 200
+    python carga_app.py --url http://127.0.0.1:8000 --duracion 60   # servidor ya arrancado
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import secrets
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cargas_sinteticas
+
+
+PASSWORD_DEFECTO = 'CAC2025'
+RUTAS = ('/login', '/analizar_notas', '/generar_dibujos_ia', '/previsualizar_v2', '/generar_v2')
+
+
+# =============================================================================
+# SERVIDOR LLM FALSO
+# =============================================================================
+class _ManejadorLLM(BaseHTTPRequestHandler):
+    """Responde como la API de chat de Groq (compatible con OpenAI)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        longitud = int(self.headers.get('Content-Length') or 0)
+        peticion = json.loads(self.rfile.read(longitud) or b'{}')
+        mensajes = peticion.get('messages', [])
+        texto = ' '.join(str(m.get('content', '')) for m in mensajes)
+
+        servidor = self.server
+        with servidor.lock:
+            servidor.peticiones += 1
+            rnd = random.Random(servidor.peticiones)
+        time.sleep(max(0.0, rnd.gauss(servidor.latencia, servidor.latencia * 0.25)))
+
+        if 'dibujo' in texto.lower():
+            contenido = cargas_sinteticas.dibujo_aleatorio(rnd, 6, 4, 2)
+        else:
+            contenido = cargas_sinteticas.datos_informe_v2('tipico', rnd.randint(0, 9))
+
+        cuerpo = json.dumps({
+            'id': f'chatcmpl-falso-{servidor.peticiones}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': peticion.get('model', 'falso'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': json.dumps(contenido, ensure_ascii=False)},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': len(texto) // 4, 'completion_tokens': 400,
+                      'total_tokens': len(texto) // 4 + 400},
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def arrancar_llm_falso(puerto=0, latencia=0.8):
+    """
+    Arranca el LLM falso en un hilo
+
+    Args:
+        puerto: Puerto local (0 = uno libre)
+        latencia: Tiempo medio de respuesta simulado (segundos)
+
+    Returns:
+        El servidor (server_address tiene el puerto real)
+    """
+    servidor = ThreadingHTTPServer(('127.0.0.1', puerto), _ManejadorLLM)
+    servidor.daemon_threads = True
+    servidor.latencia = latencia
+    servidor.peticiones = 0
+    servidor.lock = threading.Lock()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+# =============================================================================
+# SERVIDOR DE LA APP
+# =============================================================================
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def arrancar_gunicorn(url_llm, workers=2, threads=1, puerto=None):
+    """Arranca gunicorn con la configuración de producción y Groq apuntando al LLM falso"""
+    puerto = puerto or _puerto_libre()
+    entorno = dict(os.environ)
+    entorno.update({
+        'GROQ_API_KEY': 'clave-falsa',
+        'GROQ_BASE_URL': url_llm,
+        # Sin clave de Gemini los dibujos van por Groq (el LLM falso)
+        'GOOGLE_API_KEY': '',
+        # El LLM falso no tiene cuota: sin límite de ritmo (limitador.py)
+        'LIMITE_GROQ_RPM': '0',
+        'LIMITE_GROQ_TPM': '0',
+        # Misma clave de sesión en todos los workers
+        'SECRET_KEY': entorno.get('SECRET_KEY') or secrets.token_hex(32),
+    })
+    proceso = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py',
+         '--bind', f'127.0.0.1:{puerto}', '--workers', str(workers), '--threads', str(threads),
+         '--log-level', 'warning'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{puerto}'
+    _esperar_servidor(url, proceso)
+    return proceso, url
+
+
+def _esperar_servidor(url, proceso, timeout=30):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'gunicorn terminó al arrancar (código {proceso.returncode})')
+        try:
+            urllib.request.urlopen(url + '/', timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El servidor no respondió en {timeout} s')
+
+
+# =============================================================================
+# SESIONES DE ENTRENADOR
+# =============================================================================
+class Resultados:
+    """Latencias y errores por ruta, compartidos entre hilos"""
+
+    def __init__(self):
+        self.latencias = {ruta: [] for ruta in RUTAS}
+        self.errores = {ruta: 0 for ruta in RUTAS}
+        self.no_modificados = {ruta: 0 for ruta in RUTAS}
+        self.sesiones = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, ruta, segundos, ok, no_modificado=False):
+        with self._lock:
+            self.latencias[ruta].append(segundos)
+            if not ok:
+                self.errores[ruta] += 1
+            if no_modificado:
+                self.no_modificados[ruta] += 1
+
+    def sesion_completada(self):
+        with self._lock:
+            self.sesiones += 1
+
+
+class SesionEntrenador:
+    """Cliente HTTP con su propia cookie de sesión"""
+
+    def __init__(self, url, resultados, timeout=120):
+        self.url = url
+        self.resultados = resultados
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def post(self, ruta, cuerpo, cabeceras=None):
+        """POST JSON cronometrado. Devuelve (status, cabeceras, bytes)"""
+        peticion = urllib.request.Request(
+            self.url + ruta, data=json.dumps(cuerpo).encode('utf-8'), method='POST',
+            headers={'Content-Type': 'application/json', **(cabeceras or {})},
+        )
+        inicio = time.perf_counter()
+        try:
+            with self.opener.open(peticion, timeout=self.timeout) as respuesta:
+                estado, cabeceras_resp, datos = respuesta.status, respuesta.headers, respuesta.read()
+        except urllib.error.HTTPError as e:
+            estado, cabeceras_resp, datos = e.code, e.headers, e.read()
+        except OSError:
+            estado, cabeceras_resp, datos = 0, {}, b''
+        segundos = time.perf_counter() - inicio
+
+        self.resultados.registrar(ruta, segundos, ok=estado in (200, 304), no_modificado=estado == 304)
+        return estado, cabeceras_resp, datos
+
+
+def sesion_tipica(url, resultados, password, semilla, ediciones=3):
+    """
+    Reproduce la sesión de un entrenador preparando un informe
+
+    Pega sus notas, pide los dibujos a la IA, previsualiza varias veces
+    mientras retoca el informe (alguna vez sin cambios, que debe dar 304) y
+    descarga el PDF final.
+    """
+    rnd = random.Random(semilla)
+    sesion = SesionEntrenador(url, resultados)
+
+    estado, _, _ = sesion.post('/login', {'password': password})
+    if estado != 200:
+        return
+
+    notas = '. '.join(rnd.choice(cargas_sinteticas.FRASES) for _ in range(rnd.randint(5, 25)))
+    estado, _, cuerpo = sesion.post('/analizar_notas', {'notas': notas, 'provider': 'groq'})
+    datos = cargas_sinteticas.datos_informe_v2('tipico', semilla)
+    if estado == 200:
+        datos.update(json.loads(cuerpo).get('data') or {})
+
+    estado, _, cuerpo = sesion.post('/generar_dibujos_ia', dict(datos, provider='groq'))
+    dibujos = json.loads(cuerpo).get('dibujos') if estado == 200 else None
+
+    etag = None
+    for _ in range(ediciones):
+        if rnd.random() < 0.7:
+            datos['abp'] = dict(datos.get('abp') or {}, debilidad=rnd.choice(cargas_sinteticas.FRASES))
+        cabeceras = {'If-None-Match': etag} if etag else None
+        estado, cabeceras_resp, _ = sesion.post('/previsualizar_v2', dict(datos, dibujos_ia=dibujos),
+                                                cabeceras)
+        etag = cabeceras_resp.get('ETag') if cabeceras_resp else etag
+        time.sleep(rnd.uniform(0, 0.2))
+
+    sesion.post('/generar_v2', dict(datos, dibujos_ia=dibujos))
+    resultados.sesion_completada()
+
+
+def ejecutar_carga(url, concurrencia=8, sesiones=50, duracion=None, password=PASSWORD_DEFECTO):
+    """
+    Lanza sesiones en paralelo hasta completar `sesiones` o agotar `duracion`
+
+    Returns:
+        (Resultados, segundos transcurridos)
+    """
+    resultados = Resultados()
+    limite = time.monotonic() + duracion if duracion else None
+    contador = iter(range(sys.maxsize))
+    lock = threading.Lock()
+
+    def trabajador():
+        while True:
+            with lock:
+                semilla = next(contador)
+            if limite is None and semilla >= sesiones:
+                return
+            if limite is not None and time.monotonic() >= limite:
+                return
+            sesion_tipica(url, resultados, password, semilla)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        for _ in range(concurrencia):
+            pool.submit(trabajador)
+    return resultados, time.perf_counter() - inicio
+
+
+# =============================================================================
+# INFORME
+# =============================================================================
+def _percentil(valores, p):
+    if not valores:
+        return None
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[p - 1]
+
+
+def resumen(resultados, segundos):
+    """Resumen serializable a JSON"""
+    total = sum(len(v) for v in resultados.latencias.values())
+    rutas = {}
+    for ruta in RUTAS:
+        valores = resultados.latencias[ruta]
+        rutas[ruta] = {
+            'peticiones': len(valores),
+            'errores': resultados.errores[ruta],
+            'tasa_error': resultados.errores[ruta] / len(valores) if valores else 0.0,
+            'no_modificados': resultados.no_modificados[ruta],
+            'p50_ms': _ms(_percentil(valores, 50)),
+            'p95_ms': _ms(_percentil(valores, 95)),
+            'p99_ms': _ms(_percentil(valores, 99)),
+        }
+    return {
+        'duracion_s': segundos,
+        'sesiones': resultados.sesiones,
+        'peticiones': total,
+        'peticiones_por_s': total / segundos if segundos else 0.0,
+        'sesiones_por_min': resultados.sesiones / segundos * 60 if segundos else 0.0,
+        'rutas': rutas,
+    }
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 1) if segundos is not None else None
+
+
+def imprimir_resumen(datos):
+    print(f"\n📊 {datos['sesiones']} sesiones, {datos['peticiones']} peticiones en "
+          f"{datos['duracion_s']:.1f} s -> {datos['peticiones_por_s']:.1f} req/s, "
+          f"{datos['sesiones_por_min']:.1f} sesiones/min")
+    print(f"  {'ruta':<20} {'n':>6} {'err %':>6} {'304':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for ruta, r in datos['rutas'].items():
+        if not r['peticiones']:
+            continue
+        print(f"  {ruta:<20} {r['peticiones']:>6} {r['tasa_error'] * 100:>6.1f} {r['no_modificados']:>5} "
+              f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga de la webapp con un LLM falso')
+    parser.add_argument('--url', help='Usar un servidor ya arrancado en lugar de lanzar gunicorn')
+    parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn')
+    parser.add_argument('--threads', type=int, default=1, help='Hilos por worker de gunicorn')
+    parser.add_argument('-c', '--concurrencia', type=int, default=8, help='Entrenadores simultáneos')
+    parser.add_argument('-n', '--sesiones', type=int, default=50, help='Sesiones a reproducir')
+    parser.add_argument('-d', '--duracion', type=float, help='Segundos de prueba (ignora --sesiones)')
+    parser.add_argument('--latencia-llm', type=float, default=0.8,
+                        help='Latencia media del LLM falso en segundos')
+    parser.add_argument('--puerto-llm', type=int, default=0)
+    parser.add_argument('--password', default=PASSWORD_DEFECTO)
+    parser.add_argument('--salida', help='Fichero JSON donde guardar el resumen')
+    args = parser.parse_args(argv)
+
+    llm = arrancar_llm_falso(args.puerto_llm, args.latencia_llm)
+    url_llm = f'http://127.0.0.1:{llm.server_address[1]}'
+    print(f"🤖 LLM falso en {url_llm} (latencia media {args.latencia_llm} s)")
+
+    proceso = None
+    url = args.url
+    if not url:
+        proceso, url = arrancar_gunicorn(url_llm, args.workers, args.threads)
+        print(f"🚀 gunicorn en {url} ({args.workers} workers x {args.threads} hilos)")
+    else:
+        print(f"🎯 Servidor externo {url} (debe tener GROQ_BASE_URL={url_llm})")
+
+    try:
+        resultados, segundos = ejecutar_carga(url, args.concurrencia, args.sesiones,
+                                              args.duracion, args.password)
+    finally:
+        if proceso:
+            proceso.send_signal(signal.SIGTERM)
+            proceso.wait(timeout=30)
+        llm.shutdown()
+
+    datos = resumen(resultados, segundos)
+    datos['configuracion'] = {
+        'workers': args.workers if proceso else None,
+        'threads': args.threads if proceso else None,
+        'concurrencia': args.concurrencia,
+        'latencia_llm_s': args.latencia_llm,
+        'llamadas_llm': llm.peticiones,
+    }
+    imprimir_resumen(datos)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Resumen guardado en {args.salida}")
+
+    errores = sum(r['errores'] for r in datos['rutas'].values())
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
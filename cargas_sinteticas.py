@@ -0,0 +1,221 @@
+"""
+Datos sintéticos para benchmarks y pruebas de carga
+Club Atlético Central
+
+Genera los 'datos' de los tres generadores de PDF (informe v1, informe v2 y
+plan de partido) y los 'dibujos_ia' del v2 en tres perfiles:
+
+- vacio: formulario sin rellenar
+- tipico: lo que rellena un entrenador en un informe normal
+- peor_caso: todas las fases rellenas, textos largos y dibujos con muchas
+  flechas y zonas
+
+Los datos son deterministas (semilla fija) para poder comparar ejecuciones.
+"""
+
+import random
+
+
+PERFILES = ('vacio', 'tipico', 'peor_caso')
+
+FASES_ATAQUE = ('vs_bloque_alto', 'vs_bloque_medio', 'vs_bloque_bajo')
+FASES_DEFENSA = ('pressing_alto', 'bloque_medio', 'bloque_bajo')
+FASES_TRANSICION = ('def_atq', 'atq_def')
+
+COLORES_DIBUJO = ('rojo', 'azul', 'amarillo', 'verde', 'naranja', 'blanco', 'morado')
+NIVELES_JUGADOR = ('peligroso', 'importante', 'normal')
+
+FRASES = (
+    'Salida por bandas con el lateral muy abierto',
+    'El pivote se incrusta entre centrales',
+    'Buscan el pase largo a la espalda de la defensa',
+    'Presión tras pérdida muy agresiva en campo rival',
+    'Repliegue lento cuando pierden en tres cuartos',
+    'El 10 recibe entre líneas y gira hacia portería',
+    'Atacan el segundo palo en centros laterales',
+    'Defienden en zona con un hombre libre en el punto de penalti',
+    'Los extremos fijan por fuera y los interiores rompen',
+    'Cambios de orientación constantes hacia el lado débil',
+)
+
+# Número de elementos por perfil: (frases por texto, patrones, jugadores,
+# flechas por dibujo, zonas por dibujo)
+TAMANOS = {
+    'vacio': (0, 0, 0, 0, 0),
+    'tipico': (1, 2, 3, 3, 1),
+    'peor_caso': (8, 6, 11, 14, 6),
+}
+
+
+def _texto(rnd, n_frases):
+    """Texto de n frases (vacío si n es 0)"""
+    return '. '.join(rnd.choice(FRASES) for _ in range(n_frases))
+
+
+def _lista(rnd, n):
+    return [rnd.choice(FRASES) for _ in range(n)]
+
+
+def _rng(perfil, semilla):
+    if perfil not in TAMANOS:
+        raise ValueError(f"Perfil desconocido: {perfil} (válidos: {', '.join(PERFILES)})")
+    return random.Random(f'{perfil}-{semilla}')
+
+
+def _cabecera(rnd, perfil):
+    """Campos comunes de la cabecera del informe"""
+    if perfil == 'vacio':
+        return {'nombre_rival': '', 'jornada': '', 'sistema': '4-4-2'}
+    return {
+        'nombre_rival': 'CD Rival Sintético',
+        'jornada': str(rnd.randint(1, 38)),
+        'sistema': rnd.choice(('4-4-2', '4-3-3', '3-5-2', '4-2-3-1')),
+        'posicion': str(rnd.randint(1, 20)),
+        'racha': ''.join(rnd.choice('VED') for _ in range(5)),
+        'goles_favor': str(rnd.randint(5, 60)),
+        'goles_contra': str(rnd.randint(5, 60)),
+        'fecha': '2025-03-14T18:30',
+    }
+
+
+# =============================================================================
+# INFORME V1
+# =============================================================================
+def datos_informe(perfil='tipico', semilla=0):
+    """Datos del formulario del informe v1 (generar_informe_pdf)"""
+    rnd = _rng(perfil, semilla)
+    n_frases, n_patrones, n_jugadores, _, _ = TAMANOS[perfil]
+
+    datos = _cabecera(rnd, perfil)
+    for campo in ('ataque_organizado', 'defensa_organizada', 'transicion_atq_def',
+                  'transicion_def_atq', 'abp', 'analisis_jugadores', 'bajas'):
+        texto = _texto(rnd, n_frases)
+        if texto:
+            datos[campo] = texto
+
+    datos['jugadores'] = [
+        {
+            'x': round(rnd.uniform(0.05, 0.95), 3),
+            'y': round(rnd.uniform(0.05, 0.95), 3),
+            'numero': str(i + 1),
+            'nivel': rnd.choice(NIVELES_JUGADOR),
+        }
+        for i in range(n_jugadores)
+    ]
+    datos['debilidades_rival'] = _lista(rnd, n_patrones)
+    datos['fortalezas_rival'] = _lista(rnd, n_patrones)
+    return datos
+
+
+# =============================================================================
+# INFORME V2
+# =============================================================================
+def _fase(rnd, campos, n_frases, n_patrones):
+    if not n_frases:
+        return {}
+    fase = {campo: _texto(rnd, n_frases) for campo in campos}
+    fase['patrones'] = _lista(rnd, n_patrones)
+    fase['debilidad'] = _texto(rnd, n_frases)
+    fase['fortaleza'] = _texto(rnd, n_frases)
+    return fase
+
+
+def datos_informe_v2(perfil='tipico', semilla=0):
+    """Datos del formulario del informe v2 (generar_informe_v2_pdf)"""
+    rnd = _rng(perfil, semilla)
+    n_frases, n_patrones, n_jugadores, _, _ = TAMANOS[perfil]
+
+    datos = _cabecera(rnd, perfil)
+    datos['ataque'] = {
+        'vs_bloque_alto': _fase(rnd, ('estructura', 'triangulos'), n_frases, n_patrones),
+        'vs_bloque_medio': _fase(rnd, ('jugadores_clave', 'zonas_activas'), n_frases, n_patrones),
+        'vs_bloque_bajo': _fase(rnd, ('como_finalizan', 'jugadores_area'), n_frases, n_patrones),
+    }
+    datos['defensa'] = {
+        'pressing_alto': _fase(rnd, ('estructura', 'gatillos'), n_frases, n_patrones),
+        'bloque_medio': _fase(rnd, ('compactacion', 'coberturas'), n_frases, n_patrones),
+        'bloque_bajo': _fase(rnd, ('organizacion', 'marcajes'), n_frases, n_patrones),
+    }
+    datos['transiciones'] = {
+        'def_atq': _fase(rnd, ('velocidad', 'jugadores_clave', 'como_cortar'), n_frases, n_patrones),
+        'atq_def': _fase(rnd, ('equilibrios', 'repliegue', 'desbalance'), n_frases, n_patrones),
+    }
+    datos['abp'] = {}
+    if n_frases:
+        datos['abp'] = {
+            campo: _texto(rnd, n_frases)
+            for campo in ('corners_favor', 'faltas_favor', 'corners_contra', 'debilidad', 'fortaleza')
+        }
+    datos['jugadores_clave'] = [
+        {
+            'numero': str(rnd.randint(1, 25)),
+            'nombre': f'Jugador {i + 1}',
+            'posicion': rnd.choice(('POR', 'DFC', 'LD', 'LI', 'MC', 'MCO', 'ED', 'EI', 'DC')),
+            'nivel': rnd.choice(NIVELES_JUGADOR),
+            'caracteristicas': _texto(rnd, n_frases),
+        }
+        for i in range(n_jugadores)
+    ]
+    return datos
+
+
+def dibujo_aleatorio(rnd, n_jugadores, n_flechas, n_zonas):
+    """Instrucciones de dibujo con el formato que devuelve la IA"""
+    def coord():
+        return rnd.randint(3, 97)
+
+    return {
+        'jugadores': [
+            {'x': coord(), 'y': coord(), 'numero': str(i + 1),
+             'color': rnd.choice(('rojo', 'amarillo', 'azul')), 'destacado': rnd.random() < 0.3}
+            for i in range(n_jugadores)
+        ],
+        'flechas': [
+            {'x1': coord(), 'y1': coord(), 'x2': coord(), 'y2': coord(),
+             'color': rnd.choice(COLORES_DIBUJO), 'tipo': rnd.choice(('pase', 'movimiento', 'conduccion'))}
+            for _ in range(n_flechas)
+        ],
+        'zonas': [
+            {'x': coord(), 'y': coord(), 'ancho': rnd.randint(10, 40), 'alto': rnd.randint(10, 40),
+             'color': rnd.choice(COLORES_DIBUJO), 'nombre': 'Zona'}
+            for _ in range(n_zonas)
+        ],
+        'linea_tactica': {'activa': n_flechas > 5, 'x': coord(), 'color': 'rojo'},
+    }
+
+
+def dibujos_ia(perfil='tipico', semilla=0):
+    """Dibujos de la IA para el informe v2 ({} en el perfil vacío)"""
+    rnd = _rng(perfil, semilla)
+    _, _, n_jugadores, n_flechas, n_zonas = TAMANOS[perfil]
+    if perfil == 'vacio':
+        return {}
+
+    def dibujo():
+        return dibujo_aleatorio(rnd, n_jugadores, n_flechas, n_zonas)
+
+    return {
+        'ataque': {tipo: dibujo() for tipo in FASES_ATAQUE},
+        'defensa': {tipo: dibujo() for tipo in FASES_DEFENSA},
+        'transiciones': {tipo: dibujo() for tipo in FASES_TRANSICION},
+        'abp': {'corners': dibujo()},
+    }
+
+
+# =============================================================================
+# PLAN DE PARTIDO
+# =============================================================================
+def datos_plan(perfil='tipico', semilla=0):
+    """Datos del formulario del plan de partido (generar_plan_partido_pdf)"""
+    rnd = _rng(perfil, semilla)
+    n_frases = TAMANOS[perfil][0]
+
+    datos = _cabecera(rnd, perfil)
+    datos['sistema_rival'] = datos.pop('sistema')
+    datos['plan_sistema_propio'] = '4-3-3' if n_frases else ''
+    for campo in ('plan_ofensiva', 'plan_defensiva', 'plan_transicion_atq_def',
+                  'plan_transicion_def_atq', 'plan_corners_favor', 'plan_corners_contra',
+                  'plan_jugadores_clave', 'plan_bajas', 'plan_cambios',
+                  'plan_instrucciones', 'plan_notas'):
+        datos[campo] = _texto(rnd, n_frases)
+    return datos
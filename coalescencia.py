@@ -0,0 +1,294 @@
+"""
+Llamadas al LLM idénticas en vuelo: se hace una y la comparten todas
+Club Atlético Central
+
+Dos ayudantes analizan las mismas notas o el entrenador pulsa dos veces
+"Analizar": sin esto cada petición repite la llamada completa al LLM. Las
+llamadas se identifican por un hash del proveedor, la fase y el prompt
+normalizado (espacios colapsados); mientras una está en vuelo, las que
+llegan con la misma clave esperan a que termine y reciben su resultado (o
+su error). En cuanto termina, la siguiente con esa clave vuelve a llamar: no
+es una caché. Si se cancela la petición que hace la llamada (el cliente se ha
+ido), la llamada no ha fallado: una de las que esperaban toma el relevo y la
+hace ella.
+
+Dentro de un proceso funciona siempre, tanto para hilos como para asyncio.
+Para compartir también entre los workers de una misma máquina hay un
+backend de ficheros con bloqueo (fcntl): el primer proceso llama y deja el
+resultado en COALESCENCIA_DIR; los que esperaban al bloqueo lo leen (solo si
+se escribió mientras esperaban, así que tampoco hace de caché). Los
+resultados y los bloqueos sin uso se borran pasado RETENCION_SEGUNDOS
+(bloqueos.limpiar no toca los que están en uso).
+
+    COALESCENCIA_BACKEND=ficheros   Compartir entre procesos (por defecto, solo en el proceso)
+    COALESCENCIA_DIR=/tmp/...       Carpeta de los bloqueos y resultados
+
+Cualquier objeto con adquirir/leer/guardar/liberar (como BackendFicheros)
+sirve de backend: configurar(backend).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from cache_lru import hash_contenido
+import metricas
+
+import bloqueos
+
+
+logger = logging.getLogger(__name__)
+
+COALESCENCIA_DIR = os.environ.get('COALESCENCIA_DIR') or os.path.join(tempfile.gettempdir(),
+                                                                       'informes_cac_coalescencia')
+
+# Los resultados ya leídos y los bloqueos sin uso se borran pasado este tiempo
+RETENCION_SEGUNDOS = 60
+
+
+def clave_llamada(proveedor, fase, prompt):
+    """Clave de una llamada: mismo proveedor, fase y prompt salvo espacios"""
+    return hash_contenido(proveedor, fase, re.sub(r'\s+', ' ', prompt).strip())
+
+
+# =============================================================================
+# BACKEND ENTRE PROCESOS
+# =============================================================================
+class BackendFicheros:
+    """
+    Un bloqueo y un resultado por clave en una carpeta compartida
+
+    El proceso que consigue el bloqueo hace la llamada y guarda el
+    resultado; los que esperaban al bloqueo lo encuentran al entrar.
+    """
+
+    def __init__(self, directorio=COALESCENCIA_DIR):
+        self.directorio = directorio
+
+    def _ruta(self, clave, extension):
+        return os.path.join(self.directorio, f'{clave}.{extension}')
+
+    def adquirir(self, clave):
+        """Bloquea hasta ser el único proceso con esta clave (puede tardar: no llamar desde el bucle)"""
+        os.makedirs(self.directorio, exist_ok=True)
+        return bloqueos.adquirir(self._ruta(clave, 'lock'))[0]
+
+    def leer(self, clave, desde):
+        """Resultado guardado por otro proceso después de `desde` (time.time()), o None"""
+        ruta = self._ruta(clave, 'json')
+        try:
+            if os.path.getmtime(ruta) < desde:
+                return None
+            with open(ruta, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def guardar(self, clave, valor):
+        ruta = self._ruta(clave, 'json')
+        temporal = f'{ruta}.{os.getpid()}.tmp'
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(valor, f, ensure_ascii=False)
+            os.replace(temporal, ruta)
+        except (OSError, TypeError, ValueError):
+            logger.debug("No se pudo guardar el resultado compartido %s", clave, exc_info=True)
+
+    def liberar(self, fichero):
+        bloqueos.liberar(fichero)
+        self._limpiar()
+
+    def _limpiar(self):
+        """Borra resultados antiguos y los bloqueos antiguos que no estén en uso"""
+        limite = time.time() - RETENCION_SEGUNDOS
+        try:
+            for nombre in os.listdir(self.directorio):
+                ruta = os.path.join(self.directorio, nombre)
+                if nombre.endswith('.json') and os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+        except OSError:
+            pass
+        bloqueos.limpiar(self.directorio, RETENCION_SEGUNDOS)
+
+
+# =============================================================================
+# COALESCENCIA EN EL PROCESO
+# =============================================================================
+class _Vuelo:
+    """Una llamada en curso y quienes esperan su resultado"""
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.futuros = []
+        self.resultado = None
+        self.error = None
+        self.esperando = 0
+        # La que hacía la llamada se ha cancelado: las que esperan repiten
+        self.abandonado = False
+
+    def completar(self, resultado=None, error=None, abandonado=False):
+        self.resultado = resultado
+        self.error = error
+        self.abandonado = abandonado
+        self.evento.set()
+        for bucle, futuro in self.futuros:
+            try:
+                bucle.call_soon_threadsafe(self._resolver, futuro)
+            except RuntimeError:
+                pass
+
+    def _resolver(self, futuro):
+        if not futuro.done():
+            futuro.set_result(None)
+
+    def valor(self):
+        if self.error is not None:
+            raise self.error
+        return self.resultado
+
+
+class Coalescedor:
+    """Agrupa las llamadas con la misma clave mientras una está en vuelo"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._en_vuelo = {}
+        self._lock = threading.Lock()
+
+    def _unirse(self, clave, asincrono=False):
+        """
+        Returns:
+            (vuelo, None) si esta llamada es la que hace el trabajo, o
+            (vuelo, futuro que se resuelve al terminar) si espera a otra
+        """
+        with self._lock:
+            vuelo = self._en_vuelo.get(clave)
+            if vuelo is None:
+                vuelo = self._en_vuelo[clave] = _Vuelo()
+                return vuelo, None
+            vuelo.esperando += 1
+            futuro = None
+            if asincrono:
+                bucle = asyncio.get_running_loop()
+                futuro = bucle.create_future()
+                vuelo.futuros.append((bucle, futuro))
+            return vuelo, futuro or vuelo.evento
+
+    def _terminar(self, clave, vuelo, resultado=None, error=None, abandonado=False):
+        with self._lock:
+            del self._en_vuelo[clave]
+        if vuelo.esperando and not abandonado:
+            metricas.COALESCENCIA_COMPARTIDAS.inc(vuelo.esperando, origen='proceso')
+        vuelo.completar(resultado, error, abandonado)
+
+    def ejecutar(self, clave, funcion):
+        """
+        Devuelve funcion(), o el resultado de la llamada idéntica en vuelo
+
+        Args:
+            clave: clave_llamada(...) de la llamada
+            funcion: callable sin argumentos que hace la llamada
+        """
+        vuelo, evento = self._unirse(clave)
+        if evento is not None:
+            evento.wait()
+            if vuelo.abandonado:
+                # La primera de la cola en volver a unirse hace la llamada
+                return self.ejecutar(clave, funcion)
+            return vuelo.valor()
+
+        try:
+            resultado = self._entre_procesos(clave, funcion)
+        except Exception as e:
+            self._terminar(clave, vuelo, error=e)
+            raise
+        self._terminar(clave, vuelo, resultado)
+        return resultado
+
+    async def ejecutar_async(self, clave, corrutina):
+        """Versión asíncrona de ejecutar: corrutina es una función async sin argumentos"""
+        vuelo, futuro = self._unirse(clave, asincrono=True)
+        if futuro is not None:
+            await futuro
+            if vuelo.abandonado:
+                return await self.ejecutar_async(clave, corrutina)
+            return vuelo.valor()
+
+        try:
+            resultado = await self._entre_procesos_async(clave, corrutina)
+        except asyncio.CancelledError:
+            # Se ha ido el cliente de la primera: las demás no se cancelan con
+            # ella, una toma el relevo
+            self._terminar(clave, vuelo, abandonado=True)
+            raise
+        except Exception as e:
+            self._terminar(clave, vuelo, error=e)
+            raise
+        self._terminar(clave, vuelo, resultado)
+        return resultado
+
+    def _entre_procesos(self, clave, funcion):
+        if self.backend is None:
+            return funcion()
+        desde = time.time()
+        bloqueo = self.backend.adquirir(clave)
+        try:
+            resultado = self.backend.leer(clave, desde)
+            if resultado is not None:
+                metricas.COALESCENCIA_COMPARTIDAS.inc(origen='host')
+                return resultado
+            resultado = funcion()
+            self.backend.guardar(clave, resultado)
+            return resultado
+        finally:
+            self.backend.liberar(bloqueo)
+
+    async def _entre_procesos_async(self, clave, corrutina):
+        if self.backend is None:
+            return await corrutina()
+        # El bloqueo de fichero espera en un hilo para no parar el bucle
+        desde = time.time()
+        adquisicion = asyncio.ensure_future(asyncio.to_thread(self.backend.adquirir, clave))
+        try:
+            bloqueo = await asyncio.shield(adquisicion)
+        except asyncio.CancelledError:
+            # El hilo sigue esperando al bloqueo: se suelta en cuanto lo tenga
+            adquisicion.add_done_callback(self._liberar_al_adquirir)
+            raise
+        try:
+            resultado = self.backend.leer(clave, desde)
+            if resultado is not None:
+                metricas.COALESCENCIA_COMPARTIDAS.inc(origen='host')
+                return resultado
+            resultado = await corrutina()
+            self.backend.guardar(clave, resultado)
+            return resultado
+        finally:
+            self.backend.liberar(bloqueo)
+
+
+    def _liberar_al_adquirir(self, adquisicion):
+        if not adquisicion.cancelled() and adquisicion.exception() is None:
+            self.backend.liberar(adquisicion.result())
+
+
+def _backend_configurado():
+    if os.environ.get('COALESCENCIA_BACKEND', 'proceso') != 'ficheros':
+        return None
+    if bloqueos.fcntl is None:
+        logger.warning("COALESCENCIA_BACKEND=ficheros necesita fcntl: solo se agrupa dentro del proceso")
+        return None
+    return BackendFicheros()
+
+
+COALESCEDOR = Coalescedor(_backend_configurado())
+
+
+def configurar(backend):
+    """Cambia el backend entre procesos (None: solo dentro del proceso)"""
+    COALESCEDOR.backend = backend
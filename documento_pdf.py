@@ -0,0 +1,280 @@
+"""
+Opciones comunes de los documentos PDF
+Club Atlético Central
+
+Lo comparten los tres generadores (informe v1, informe v2 y plan de partido):
+- Creación del SimpleDocTemplate
+- Documentos compuestos: varios informes en un PDF, cada uno con sus márgenes
+- Modo determinista: mismos datos -> mismos bytes (fecha del formulario,
+  modo invariante de ReportLab e ID de documento estable), y la huella del
+  código de los generadores para saber cuándo deja de ser así
+- Optimización de tamaño: streams comprimidos en binario (lo hace el canvas
+  de cada documento, sin tocar la configuración global de ReportLab),
+  imágenes reducidas a la resolución de impresión y medición del tamaño
+  final contra un presupuesto por generador
+
+Una imagen idéntica se incrusta una sola vez por documento (ReportLab las
+registra por su hash). Los dibujos vectoriales repetidos (campos, escudos)
+no se comparten como form XObject: zlib ya comprime la repetición dentro de
+cada página y el form salía más grande.
+
+Las fuentes son las estándar de PDF (Helvetica), que no se incrustan; si se
+registra una TTF, ReportLab ya incrusta solo el subconjunto de glifos usado.
+"""
+
+import hashlib
+import io
+import logging
+import math
+import os
+import threading
+from functools import lru_cache
+from time import perf_counter
+from datetime import datetime, date, time
+
+from PIL import Image as PILImage
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import asciiBase85Decode
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, BaseDocTemplate, PageTemplate, Frame, NextPageTemplate, PageBreak
+
+from metricas import PDF_TAMANO
+from instrumentacion import anotar, etapa
+import trazas
+
+logger = logging.getLogger(__name__)
+
+
+# Resolución con la que se incrustan las imágenes (los logos se dibujan a
+# pocos centímetros; el original puede tener miles de píxeles)
+DPI_IMAGENES = 200
+
+# Tamaño máximo esperado de cada documento (bytes). Superarlo no es un
+# error, pero se avisa para detectar regresiones.
+PRESUPUESTO_BYTES = {
+    'informe': 40_000,
+    'informe_v2': 60_000,
+    'plan_partido': 10_000,
+    'pack_partido': 70_000,
+}
+
+# Estadísticas de tamaño por generador: n, total, max, ultimo
+TAMANOS_PDF = {}
+_lock_tamanos = threading.Lock()
+
+
+# Código del que dependen los PDFs: si cambia, los mismos datos dan otros bytes
+MODULOS_RENDER = ('generar_informe.py', 'generar_informe_v2.py', 'generar_plan_partido.py',
+                  'pack_partido.py', 'documento_pdf.py', 'tactical_options.py')
+
+# Formatos aceptados en el campo 'fecha' del formulario
+FORMATOS_FECHA = (
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M',
+)
+
+
+def fecha_informe(datos, deterministico=False):
+    """
+    Fecha que aparece en el informe
+
+    Se toma del campo 'fecha' del formulario si viene. Si no, en modo
+    determinista se usa el día actual sin hora (mismo PDF durante todo el
+    día) y en modo normal la hora actual, como hasta ahora.
+    """
+    texto = str(datos.get('fecha') or '').strip()
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+
+    if deterministico:
+        return datetime.combine(date.today(), time())
+    return datetime.now()
+
+
+@lru_cache(maxsize=1)
+def huella_codigo():
+    """Hash del código de los generadores (se calcula una vez por proceso)"""
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    huella = hashlib.sha256()
+    for modulo in MODULOS_RENDER:
+        try:
+            with open(os.path.join(directorio, modulo), 'rb') as f:
+                huella.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            huella.update(b'-')
+    return huella.hexdigest()
+
+
+def texto_fecha_hora(fecha, formato='%d/%m/%Y %H:%M'):
+    """Formatea la fecha de generación omitiendo la hora si no se conoce"""
+    if fecha.time() == time():
+        return fecha.strftime('%d/%m/%Y')
+    return fecha.strftime(formato)
+
+
+class CanvasBinario(canvas.Canvas):
+    """
+    Canvas que escribe los streams comprimidos en binario
+
+    La codificación ASCII85 que ReportLab aplica por defecto solo sirve para
+    canales de 7 bits y añade un 25%. ReportLab solo deja quitarla para todo
+    el proceso (rl_config.useA85); este canvas la quita en su documento:
+    cada página sale ya con su stream solo en Flate y las imágenes se
+    guardan sin codificar.
+    """
+
+    def showPage(self):
+        paginas = self._doc.Pages.pages
+        nuevas = len(paginas)
+        super().showPage()
+        for pagina in paginas[nuevas:]:
+            if pagina.compression and pagina.stream and not pagina.Contents:
+                stream = pdfdoc.PDFStream(content=pagina.stream, filters=[pdfdoc.PDFZCompress])
+                stream.__Comment__ = "page stream"
+                pagina.Contents = stream
+        # Las imágenes (y sus máscaras) se cargan al dibujarlas
+        for objeto in self._doc.idToObject.values():
+            filtros = getattr(objeto, '_filters', None)
+            if isinstance(objeto, pdfdoc.PDFImageXObject) and filtros and filtros[0] == 'ASCII85Decode':
+                objeto.streamContent = asciiBase85Decode(objeto.streamContent)
+                objeto._filters = tuple(filtros[1:])
+
+
+def crear_documento(destino, deterministico=False, clase=SimpleDocTemplate, **kwargs):
+    """
+    Crea el SimpleDocTemplate A4 de un informe
+
+    Args:
+        destino: Ruta o buffer (BytesIO) donde escribir el PDF
+        deterministico: Activa el modo invariante de ReportLab (sin fecha de
+            creación y con ID de documento derivado del contenido)
+        clase: Plantilla de documento (BaseDocTemplate para los compuestos)
+        **kwargs: Márgenes y demás opciones de SimpleDocTemplate
+    """
+    kwargs.setdefault('pagesize', A4)
+    kwargs.setdefault('pageCompression', 1)
+    if deterministico:
+        kwargs['invariant'] = 1
+    doc = clase(destino, **kwargs)
+    # Lo que pasa entre crear el documento y construirlo es montar el story
+    doc.inicio_story = perf_counter()
+    return doc
+
+
+def construir_documento(doc, story, generador):
+    """
+    Construye el PDF y registra su tamaño final
+
+    Args:
+        doc: Documento creado con crear_documento
+        story: Lista de flowables
+        generador: Nombre del generador ('informe', 'informe_v2', 'plan_partido')
+
+    Returns:
+        Tamaño del PDF en bytes
+    """
+    inicio_story = getattr(doc, 'inicio_story', None)
+    if inicio_story is not None:
+        duracion = perf_counter() - inicio_story
+        anotar('story', duracion)
+        trazas.span_terminado('story', duracion, generador=generador)
+    with etapa('doc_build'):
+        doc.build(story, canvasmaker=CanvasBinario)
+
+    destino = doc.filename
+    if hasattr(destino, 'getbuffer'):
+        tamano = destino.getbuffer().nbytes
+    else:
+        tamano = os.path.getsize(destino)
+
+    registrar_tamano(generador, tamano)
+    return tamano
+
+
+def construir_documento_compuesto(destino, partes, generador, deterministico=False):
+    """
+    Une varios informes en un PDF
+
+    Cada parte empieza en página nueva con una plantilla de página con sus
+    márgenes, así que se maqueta igual que en su PDF suelto.
+
+    Args:
+        destino: Ruta o buffer (BytesIO) donde escribir el PDF
+        partes: Lista de (nombre, story, márgenes), con los márgenes como en
+            crear_documento (topMargin, bottomMargin, leftMargin, rightMargin)
+        generador: Nombre del documento en las métricas de tamaño
+        deterministico: Como en crear_documento
+
+    Returns:
+        Tamaño del PDF en bytes
+    """
+    doc = crear_documento(destino, deterministico, clase=BaseDocTemplate, **partes[0][2])
+    ancho, alto = doc.pagesize
+
+    story = []
+    for i, (nombre, story_parte, margenes) in enumerate(partes):
+        # Mismo marco que el de SimpleDocTemplate con esos márgenes
+        doc.addPageTemplates(PageTemplate(id=nombre, frames=[Frame(
+            margenes['leftMargin'], margenes['bottomMargin'],
+            ancho - margenes['leftMargin'] - margenes['rightMargin'],
+            alto - margenes['topMargin'] - margenes['bottomMargin'],
+            id=nombre,
+        )]))
+        if i:
+            story.extend([NextPageTemplate(nombre), PageBreak()])
+        story.extend(story_parte)
+
+    return construir_documento(doc, story, generador)
+
+
+def registrar_tamano(generador, tamano):
+    """Acumula el tamaño de un PDF generado y avisa si supera el presupuesto"""
+    with _lock_tamanos:
+        stats = TAMANOS_PDF.setdefault(generador, {'n': 0, 'total': 0, 'max': 0, 'ultimo': 0})
+        stats['n'] += 1
+        stats['total'] += tamano
+        stats['max'] = max(stats['max'], tamano)
+        stats['ultimo'] = tamano
+    PDF_TAMANO.observar(tamano, generador=generador)
+
+    presupuesto = PRESUPUESTO_BYTES.get(generador)
+    if presupuesto and tamano > presupuesto:
+        logger.warning("PDF '%s' de %d bytes supera el presupuesto de %d", generador, tamano, presupuesto,
+                       extra={'generador': generador, 'tamano': tamano, 'presupuesto': presupuesto})
+
+
+# =============================================================================
+# IMÁGENES
+# =============================================================================
+def reducir_imagen(origen, ancho_pt, alto_pt, dpi=DPI_IMAGENES):
+    """
+    Reduce una imagen a la resolución con la que se va a imprimir
+
+    Args:
+        origen: Ruta o buffer de la imagen original
+        ancho_pt, alto_pt: Tamaño al que se dibuja en el PDF (puntos)
+        dpi: Resolución objetivo
+
+    Returns:
+        bytes PNG (sin ampliar si la original ya era más pequeña)
+    """
+    with PILImage.open(origen) as img:
+        max_px = (math.ceil(ancho_pt / 72 * dpi), math.ceil(alto_pt / 72 * dpi))
+        img = img.copy()
+
+    if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        img = img.convert('RGBA')
+    img.thumbnail(max_px, PILImage.LANCZOS)
+
+    salida = io.BytesIO()
+    img.save(salida, format='PNG', optimize=True)
+    return salida.getvalue()
+
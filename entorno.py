@@ -0,0 +1,37 @@
+"""
+Carga del fichero .env
+Club Atlético Central
+
+Muchos módulos leen su configuración de os.environ al importarse (registro,
+admision, limitador, pool_claves, metricas...) y sesiones.configurar la lee
+al crear la app, así que el .env tiene que estar cargado antes que todos
+ellos: app.py y gunicorn.conf.py llaman a cargar() antes de importar nada
+más.
+
+Solo se lee el .env del directorio de la app. Las variables que ya estén en
+el entorno (las de la plataforma de despliegue) tienen prioridad. Si no hay
+.env, no se importa python-dotenv.
+"""
+
+import os
+from functools import lru_cache
+
+
+FICHERO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
+
+@lru_cache(maxsize=None)
+def cargar():
+    """
+    Carga las variables del .env (una sola vez)
+
+    Returns:
+        True si se ha cargado un .env
+    """
+    if not os.path.isfile(FICHERO):
+        return False
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    return load_dotenv(FICHERO)
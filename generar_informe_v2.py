@@ -14,16 +14,24 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
 from reportlab.platypus import Image as RLImage
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
-from reportlab.graphics.shapes import Drawing, Rect, Circle, Line, String, Polygon
+from reportlab.graphics.shapes import Drawing, Group, Rect, Circle, Line, String, Polygon
 from reportlab.graphics import renderPDF
-from datetime import datetime
+from functools import lru_cache
+import logging
+import io
 import os
 import math
 
+from cache_lru import CacheLRU, hash_contenido
+from documento_pdf import (crear_documento, construir_documento, fecha_informe, texto_fecha_hora,
+                           reducir_imagen)
+
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # COLORES CORPORATIVOS
@@ -444,6 +452,128 @@ class CampoFormacion:
         return d
 
 
+# =============================================================================
+# EXPORTACIÓN DE CAMPOS SUELTOS (SVG / PNG)
+# =============================================================================
+# Campos ya exportados, por hash de instrucciones, tamaño y formato
+CACHE_CAMPOS = CacheLRU('campos_exportados', max_entradas=256)
+
+FORMATOS_CAMPO = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+
+# Mismo tamaño que los campos de ataque/defensa del informe v2
+TAMANO_CAMPO_DEFECTO = ((A4[0] - 3*cm) / 3 - 12, 4.5*cm)
+TAMANO_CAMPO_MAXIMO = 2000
+
+# Listas de un dibujo y sus campos numéricos (en % del campo)
+ELEMENTOS_DIBUJO = {
+    'jugadores': ('x', 'y'),
+    'flechas': ('x1', 'y1', 'x2', 'y2'),
+    'zonas': ('x', 'y', 'ancho', 'alto'),
+}
+
+
+class PNGNoDisponible(RuntimeError):
+    """ReportLab no tiene backend de renderPM (falta rlPyCairo)"""
+
+
+def _numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def validar_instrucciones(instrucciones):
+    """
+    Comprueba que un dibujo tiene el esquema de dibujos_ia
+
+    Raises:
+        ValueError: Con el primer campo que no es válido
+    """
+    if not isinstance(instrucciones, dict):
+        raise ValueError("Las instrucciones deben ser un objeto")
+    for lista, campos in ELEMENTOS_DIBUJO.items():
+        elementos = instrucciones.get(lista, [])
+        if not isinstance(elementos, list):
+            raise ValueError(f"'{lista}' debe ser una lista")
+        for i, elemento in enumerate(elementos):
+            if not isinstance(elemento, dict):
+                raise ValueError(f"'{lista}[{i}]' debe ser un objeto")
+            for campo in campos:
+                if campo in elemento and not _numero(elemento[campo]):
+                    raise ValueError(f"'{lista}[{i}].{campo}' debe ser un número")
+    linea = instrucciones.get('linea_tactica', {})
+    if not isinstance(linea, dict) or ('x' in linea and not _numero(linea['x'])):
+        raise ValueError("'linea_tactica' debe ser un objeto con 'x' numérico")
+
+
+def _renderizar_campo(d, formato, dpi):
+    """Convierte un Drawing en bytes SVG o PNG"""
+    if formato == 'svg':
+        from reportlab.graphics import renderSVG
+        return renderSVG.drawToString(d).encode('utf-8')
+
+    from reportlab.graphics import renderPM
+    from reportlab.graphics.utils import RenderPMError
+    try:
+        return renderPM.drawToString(d, fmt='PNG', dpi=dpi)
+    except RenderPMError as e:
+        raise PNGNoDisponible(f"Exportación PNG no disponible (instala rlPyCairo): {e}")
+
+
+def exportar_campo(instrucciones=None, formato='svg', fase_tipo='ataque', tipo='dinamico',
+                   width=None, height=None, jugadores=None, dpi=144):
+    """
+    Exporta un único campo táctico como imagen para previsualizarlo en la web
+
+    Args:
+        instrucciones: Dict con el mismo esquema que cada dibujo de dibujos_ia
+        formato: 'svg' o 'png'
+        fase_tipo: 'ataque' o 'defensa' para etiquetas de tercios
+        tipo: 'dinamico' (CampoDinamico) o 'formacion' (CampoFormacion)
+        width, height: Dimensiones en puntos (por defecto, las del informe)
+        jugadores: Jugadores destacados para el campo de formación
+        dpi: Resolución del PNG
+
+    Returns:
+        bytes de la imagen
+
+    Raises:
+        ValueError: Datos no válidos (faltan las instrucciones del campo dinámico)
+        PNGNoDisponible: PNG pedido sin backend de renderPM
+    """
+    if not isinstance(formato, str) or formato not in FORMATOS_CAMPO:
+        raise ValueError(f"Formato '{formato}' no soportado. Usa: {', '.join(FORMATOS_CAMPO)}")
+    if not isinstance(tipo, str) or tipo not in ('dinamico', 'formacion'):
+        raise ValueError(f"Tipo de campo '{tipo}' no soportado")
+    if tipo == 'dinamico':
+        if instrucciones is None:
+            raise ValueError("Faltan las instrucciones del campo")
+        validar_instrucciones(instrucciones)
+    elif jugadores is not None and not (isinstance(jugadores, list)
+                                        and all(isinstance(j, dict) for j in jugadores)):
+        raise ValueError("'jugadores' debe ser una lista de objetos")
+
+    try:
+        width = float(width or TAMANO_CAMPO_DEFECTO[0])
+        height = float(height or TAMANO_CAMPO_DEFECTO[1])
+    except (TypeError, ValueError):
+        raise ValueError("Las dimensiones deben ser números")
+    if not (0 < width <= TAMANO_CAMPO_MAXIMO and 0 < height <= TAMANO_CAMPO_MAXIMO):
+        raise ValueError(f"Dimensiones fuera de rango (máximo {TAMANO_CAMPO_MAXIMO})")
+
+    clave = hash_contenido(tipo, instrucciones, jugadores, fase_tipo, width, height, formato, dpi)
+
+    def crear():
+        if tipo == 'formacion':
+            d = CampoFormacion.crear_campo_formacion(width, height, (jugadores or [])[:3])
+        else:
+            d = CampoDinamico.crear_campo_con_instrucciones(width, height, instrucciones, fase_tipo)
+        return _renderizar_campo(d, formato, dpi)
+
+    return CACHE_CAMPOS.obtener_o_crear(clave, crear)
+
+
 # =============================================================================
 # UTILIDADES
 # =============================================================================
@@ -493,35 +623,61 @@ def crear_logo_placeholder(width=50, height=60):
 
 
 # =============================================================================
-# GENERADOR PDF PRINCIPAL
+# PLANTILLA ESTÁTICA DE PÁGINA (cabecera, barras de sección, leyenda, footer)
 # =============================================================================
-def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
-    """
-    Genera un PDF profesional ultra-visual con análisis táctico
+# Nombre de la barra -> (texto, color de fondo, padding izquierdo)
+BARRAS_SECCION = {
+    'ataque': ('⚔️  ATAQUE ORGANIZADO', 'rojo', 10),
+    'defensa': ('🛡️  DEFENSA ORGANIZADA', 'azul', None),
+    'transiciones': ('⚡  TRANSICIONES', 'naranja', None),
+    'abp': ('🎯  BALÓN PARADO', 'morado', None),
+    'jugadores': ('⭐  JUGADORES CLAVE', 'verde_oscuro', None),
+}
 
-    Args:
-        datos: Diccionario con todos los datos del formulario v2
-        output_path: Ruta donde guardar el PDF
-        dibujos_ia: Diccionario con instrucciones de dibujo generadas por IA (opcional)
+
+def _huella_logo(logo_path):
+    """Identifica el logo por ruta y fecha de modificación (cambia al subir uno nuevo)"""
+    if not logo_path:
+        return None
+    try:
+        return (logo_path, os.path.getmtime(logo_path))
+    except OSError:
+        return None
+
+
+def _huella_tema():
+    """Identifica el tema por los colores corporativos activos"""
+    return tuple(sorted((nombre, color.hexval()) for nombre, color in COLORES.items()))
+
+
+def _crear_logo(logo_png, width, height):
+    """Crea el logo real o el placeholder si no hay imagen o no se puede leer"""
+    if logo_png:
+        return RLImage(io.BytesIO(logo_png), width=width, height=height)
+    return crear_logo_placeholder(width, height)
+
+
+def _leer_logo(logo_path):
     """
+    Lee el logo reducido a la resolución de impresión de la cabecera
 
-    # Configuración del documento
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        topMargin=1*cm,
-        bottomMargin=1*cm,
-        leftMargin=1.5*cm,
-        rightMargin=1.5*cm
-    )
+    Los logos del footer reutilizan la misma imagen, así que el PDF solo la
+    incrusta una vez.
+    """
+    if not logo_path:
+        return None
+    try:
+        return reducir_imagen(logo_path, 50, 60)
+    except Exception:
+        return None
 
-    story = []
-    ancho_pagina = A4[0] - 3*cm
 
-    # Estilos
+def _crear_estilos():
+    """Crea los estilos de párrafo del informe v2"""
     styles = getSampleStyleSheet()
 
-    style_titulo = ParagraphStyle(
+    estilos = {}
+    estilos['titulo'] = ParagraphStyle(
         'TituloPrincipal',
         parent=styles['Heading1'],
         fontSize=22,
@@ -531,7 +687,7 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         fontName='Helvetica-Bold'
     )
 
-    style_subtitulo = ParagraphStyle(
+    estilos['subtitulo'] = ParagraphStyle(
         'Subtitulo',
         parent=styles['Heading2'],
         fontSize=12,
@@ -542,7 +698,7 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         fontName='Helvetica-Bold'
     )
 
-    style_seccion = ParagraphStyle(
+    estilos['seccion'] = ParagraphStyle(
         'SeccionTitulo',
         parent=styles['Heading3'],
         fontSize=9,
@@ -552,7 +708,7 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         alignment=TA_CENTER
     )
 
-    style_texto = ParagraphStyle(
+    estilos['texto'] = ParagraphStyle(
         'TextoNormal',
         parent=styles['BodyText'],
         fontSize=7.5,
@@ -562,7 +718,7 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         alignment=TA_LEFT
     )
 
-    style_dato = ParagraphStyle(
+    estilos['dato'] = ParagraphStyle(
         'Dato',
         parent=styles['BodyText'],
         fontSize=8,
@@ -571,53 +727,164 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         leading=10
     )
 
-    style_fortaleza = ParagraphStyle(
+    estilos['fortaleza'] = ParagraphStyle(
         'Fortaleza',
-        parent=style_texto,
+        parent=estilos['texto'],
         fontSize=7,
         textColor=colors.HexColor('#059669'),
         leftIndent=0
     )
 
-    style_debilidad = ParagraphStyle(
+    estilos['debilidad'] = ParagraphStyle(
         'Debilidad',
-        parent=style_texto,
+        parent=estilos['texto'],
         fontSize=7,
         textColor=colors.HexColor('#DC2626'),
         leftIndent=0
     )
 
+    estilos['rival'] = ParagraphStyle('rival', fontSize=14,
+                                      textColor=COLORES['verde_principal'], alignment=TA_CENTER,
+                                      fontName='Helvetica-Bold')
+    estilos['fecha'] = ParagraphStyle('fecha', fontSize=9, textColor=COLORES['gris'],
+                                      alignment=TA_CENTER)
+    estilos['leyenda'] = ParagraphStyle('leyenda', fontSize=8, textColor=COLORES['gris_oscuro'])
+    estilos['leyenda_gris'] = ParagraphStyle('leyenda', fontSize=8, textColor=COLORES['gris'])
+    estilos['footer'] = ParagraphStyle('footer', fontSize=8, textColor=COLORES['gris'],
+                                       alignment=TA_CENTER)
+    return estilos
+
+
+class RecursosPlantilla:
+    """
+    Lo que la plantilla del informe v2 puede compartir entre renders: los
+    estilos de párrafo (ReportLab solo los lee) y el logo ya leído y reducido.
+    Se preparan una sola vez por logo y tema.
+    """
+
+    def __init__(self, logo_path, huella):
+        self.estilos = _crear_estilos()
+        self.logo_png = _leer_logo(logo_path)
+        self.huella = huella
+
+
+class PlantillaPagina:
+    """
+    Partes del informe v2 que no dependen de los datos del rival: logos,
+    barras de título de sección, título de cabecera y leyenda fija.
+
+    Cada informe crea la suya a partir de los recursos cacheados: ReportLab
+    guarda estado en los flowables al maquetarlos (el canvas, medidas de
+    wrap), así que dos renders a la vez en hilos distintos no pueden
+    compartirlos. Montarlos desde los estilos y el PNG ya reducido cuesta
+    poco; lo caro (leer y reducir el logo, crear los estilos) no se repite.
+    """
+
+    def __init__(self, recursos, ancho_pagina, usar_cache=True):
+        self.ancho_pagina = ancho_pagina
+        self.usar_cache = usar_cache
+        self.estilos = recursos.estilos
+        self.huella = recursos.huella + (ancho_pagina,)
+
+        logo_png = recursos.logo_png
+        self.logo_cabecera = _crear_logo(logo_png, 50, 60)
+        self.logo_cabecera_dcha = _crear_logo(logo_png, 50, 60)
+        self.logo_footer = _crear_logo(logo_png, 30, 35)
+        self.logo_footer_dcha = _crear_logo(logo_png, 30, 35)
+
+        self.titulo = Paragraph('<b>INFORME TÁCTICO</b>', self.estilos['titulo'])
+        self.leyenda_gris = Paragraph('<font color="#6B7280">●</font> Resto del 11',
+                                      self.estilos['leyenda_gris'])
+
+        self.barras = {}
+        for nombre, (texto, color, padding_izq) in BARRAS_SECCION.items():
+            barra = Table([[Paragraph(texto, self.estilos['subtitulo'])]],
+                          colWidths=[ancho_pagina])
+            estilo_barra = [
+                ('BACKGROUND', (0, 0), (-1, -1), COLORES[color]),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ]
+            if padding_izq is not None:
+                estilo_barra.append(('LEFTPADDING', (0, 0), (-1, -1), padding_izq))
+            barra.setStyle(TableStyle(estilo_barra))
+            self.barras[nombre] = barra
+
+    def campo(self, crear, *entradas):
+        """
+        Campo táctico crear(*entradas) para este render, reutilizando el ya
+        dibujado con las mismas entradas (y el mismo logo/tema)
+        """
+        if not self.usar_cache:
+            return crear(*entradas)
+        clave = hash_contenido(crear.__qualname__, self.huella, entradas)
+        return _clonar_forma(CACHE_CAMPOS_V2.obtener_o_crear(clave, lambda: crear(*entradas)))
+
+
+@lru_cache(maxsize=4)
+def _recursos_plantilla(huella_logo, huella_tema):
+    logo_path = huella_logo[0] if huella_logo else None
+    return RecursosPlantilla(logo_path, (huella_logo, huella_tema))
+
+
+def obtener_plantilla_pagina(ancho_pagina, usar_cache=True):
+    """Devuelve una plantilla nueva para este render, con los recursos cacheados del logo y tema actuales"""
+    recursos = _recursos_plantilla(_huella_logo(obtener_logo_path()), _huella_tema())
+    return PlantillaPagina(recursos, ancho_pagina, usar_cache)
+
+
+# =============================================================================
+# CAMPOS TÁCTICOS CACHEADOS
+# =============================================================================
+# Campos ya dibujados de informes recientes, por hash de sus entradas: son lo
+# más caro de cada sección (cientos de formas cuyos atributos ReportLab valida
+# uno a uno al crearlas). Al previsualizar varias veces solo se redibujan los
+# campos editados. El dibujo cacheado es un modelo que no se maqueta nunca:
+# ReportLab asigna canvas y padre a cada forma al dibujarla, así que cada
+# render recibe un clon propio.
+CACHE_CAMPOS_V2 = CacheLRU('campos_v2', max_entradas=256)
+
+
+def _clonar_forma(forma):
+    """
+    Copia un dibujo y todas sus formas sin volver a validar sus atributos
+
+    Los valores (colores, números, listas de guiones) se comparten: ReportLab
+    solo los lee al dibujar.
+    """
+    clon = forma.__class__.__new__(forma.__class__)
+    clon.__dict__.update(forma.__dict__)
+    if isinstance(forma, Group):
+        clon.__dict__['contents'] = [_clonar_forma(hija) for hija in forma.contents]
+    return clon
+
+
+# =============================================================================
+# SECCIONES DEL INFORME
+# =============================================================================
+# Márgenes del documento v2
+MARGENES_V2 = {'topMargin': 1*cm, 'bottomMargin': 1*cm, 'leftMargin': 1.5*cm, 'rightMargin': 1.5*cm}
+
+
+def _seccion_cabecera(plantilla, datos, fecha):
+    """Cabecera con logos y ficha técnica compacta"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_dato = estilos['dato']
+
     # ==================================================================
     # HEADER CON LOGO
     # ==================================================================
-    logo_path = obtener_logo_path()
-
-    # Crear elemento de logo (imagen real o placeholder)
-    if logo_path:
-        try:
-            logo_img = RLImage(logo_path, width=50, height=60)
-            logo_img_right = RLImage(logo_path, width=50, height=60)
-        except:
-            logo_img = crear_logo_placeholder(50, 60)
-            logo_img_right = crear_logo_placeholder(50, 60)
-    else:
-        logo_img = crear_logo_placeholder(50, 60)
-        logo_img_right = crear_logo_placeholder(50, 60)
-
     rival = datos.get('nombre_rival', 'RIVAL').upper()
     jornada = datos.get('jornada', '-')
-    fecha = datetime.now().strftime('%d/%m/%Y')
 
     header_data = [[
-        logo_img,
-        [Paragraph(f'<b>INFORME TÁCTICO</b>', style_titulo),
-         Paragraph(f'vs {rival}', ParagraphStyle('rival', fontSize=14,
-                   textColor=COLORES['verde_principal'], alignment=TA_CENTER,
-                   fontName='Helvetica-Bold')),
-         Paragraph(f'Jornada {jornada} · {fecha}',
-                  ParagraphStyle('fecha', fontSize=9, textColor=COLORES['gris'],
-                                alignment=TA_CENTER))],
-        logo_img_right
+        plantilla.logo_cabecera,
+        [plantilla.titulo,
+         Paragraph(f'vs {rival}', estilos['rival']),
+         Paragraph(f'Jornada {jornada} · {fecha}', estilos['fecha'])],
+        plantilla.logo_cabecera_dcha
     ]]
 
     header_table = Table(header_data, colWidths=[60, ancho_pagina - 120, 60])
@@ -658,28 +925,28 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
     story.append(ficha_table)
     story.append(Spacer(1, 0.4*cm))
 
+    return story
+
+
+def _seccion_ataque(plantilla, ataque, dibujos_ataque):
+    """Sección de ataque organizado con un campo por bloque rival"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_seccion = estilos['seccion']
+    style_texto = estilos['texto']
+    style_fortaleza = estilos['fortaleza']
+    style_debilidad = estilos['debilidad']
+
     # ==================================================================
     # SECCIÓN ATAQUE ORGANIZADO
     # ==================================================================
-    story.append(Table([[Paragraph('⚔️  ATAQUE ORGANIZADO', style_subtitulo)]],
-                       colWidths=[ancho_pagina]))
-    story[-1].setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), COLORES['rojo']),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    story.append(plantilla.barras['ataque'])
     story.append(Spacer(1, 0.2*cm))
 
-    ataque = datos.get('ataque', {})
     col_width = ancho_pagina / 3 - 2
     campo_size = (col_width - 10, 4.5*cm)
 
-    # Obtener instrucciones de dibujo de la IA
-    dibujos_ataque = {}
-    if dibujos_ia:
-        dibujos_ataque = dibujos_ia.get('ataque', {})
-
     def crear_celda_ataque(fase_data, titulo, tipo_fase):
         """Crea celda visual para fase de ataque con campo dinámico"""
         contenido = []
@@ -688,8 +955,9 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
 
         # Campo con instrucciones de IA (fase de ataque = creación->progresión->finalización)
         instrucciones = dibujos_ataque.get(tipo_fase, {})
-        campo = CampoDinamico.crear_campo_con_instrucciones(
-            campo_size[0], campo_size[1], instrucciones, fase_tipo='ataque'
+        campo = plantilla.campo(
+            CampoDinamico.crear_campo_con_instrucciones,
+            campo_size[0], campo_size[1], instrucciones, 'ataque'
         )
         contenido.append(campo)
         contenido.append(Spacer(1, 3))
@@ -743,22 +1011,28 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
     story.append(ataque_table)
     story.append(Spacer(1, 0.3*cm))
 
+    return story
+
+
+def _seccion_defensa(plantilla, defensa, dibujos_defensa):
+    """Sección de defensa organizada con un campo por altura de bloque"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_seccion = estilos['seccion']
+    style_texto = estilos['texto']
+    style_fortaleza = estilos['fortaleza']
+    style_debilidad = estilos['debilidad']
+
+    col_width = ancho_pagina / 3 - 2
+    campo_size = (col_width - 10, 4.5*cm)
+
     # ==================================================================
     # SECCIÓN DEFENSA ORGANIZADA
     # ==================================================================
-    story.append(Table([[Paragraph('🛡️  DEFENSA ORGANIZADA', style_subtitulo)]],
-                       colWidths=[ancho_pagina]))
-    story[-1].setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), COLORES['azul']),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    story.append(plantilla.barras['defensa'])
     story.append(Spacer(1, 0.2*cm))
 
-    defensa = datos.get('defensa', {})
-    dibujos_defensa = {}
-    if dibujos_ia:
-        dibujos_defensa = dibujos_ia.get('defensa', {})
 
     def crear_celda_defensa(fase_data, titulo, tipo_fase):
         """Crea celda visual para fase defensiva con campo dinámico"""
@@ -768,8 +1042,9 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
 
         # Campo con instrucciones de IA (fase defensiva = finalización->progresión->creación)
         instrucciones = dibujos_defensa.get(tipo_fase, {})
-        campo = CampoDinamico.crear_campo_con_instrucciones(
-            campo_size[0], campo_size[1], instrucciones, fase_tipo='defensa'
+        campo = plantilla.campo(
+            CampoDinamico.crear_campo_con_instrucciones,
+            campo_size[0], campo_size[1], instrucciones, 'defensa'
         )
         contenido.append(campo)
         contenido.append(Spacer(1, 3))
@@ -824,25 +1099,23 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
     ]))
     story.append(defensa_table)
 
-    # ==================================================================
-    # PÁGINA 2: TRANSICIONES + ABP + JUGADORES
-    # ==================================================================
-    story.append(PageBreak())
+    return story
+
+
+def _seccion_transiciones(plantilla, transiciones, dibujos_trans):
+    """Sección de transiciones (defensa→ataque y ataque→defensa)"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_seccion = estilos['seccion']
+    style_texto = estilos['texto']
+    style_fortaleza = estilos['fortaleza']
+    style_debilidad = estilos['debilidad']
 
     # --- TRANSICIONES ---
-    story.append(Table([[Paragraph('⚡  TRANSICIONES', style_subtitulo)]],
-                       colWidths=[ancho_pagina]))
-    story[-1].setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), COLORES['naranja']),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    story.append(plantilla.barras['transiciones'])
     story.append(Spacer(1, 0.2*cm))
 
-    transiciones = datos.get('transiciones', {})
-    dibujos_trans = {}
-    if dibujos_ia:
-        dibujos_trans = dibujos_ia.get('transiciones', {})
 
     campo_trans_w = ancho_pagina / 2 - 10
     campo_trans_h = 5*cm
@@ -855,8 +1128,9 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
 
         # Transiciones: el rival está atacando, usamos orientación 'defensa'
         instrucciones = dibujos_trans.get(tipo, {})
-        campo = CampoDinamico.crear_campo_con_instrucciones(
-            campo_trans_w - 10, campo_trans_h, instrucciones, fase_tipo='defensa'
+        campo = plantilla.campo(
+            CampoDinamico.crear_campo_con_instrucciones,
+            campo_trans_w - 10, campo_trans_h, instrucciones, 'defensa'
         )
         contenido.append(campo)
         contenido.append(Spacer(1, 4))
@@ -910,25 +1184,29 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
     story.append(trans_table)
     story.append(Spacer(1, 0.4*cm))
 
+    return story
+
+
+def _seccion_abp(plantilla, abp, dibujos_abp):
+    """Sección de acciones a balón parado"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_texto = estilos['texto']
+    style_dato = estilos['dato']
+    style_fortaleza = estilos['fortaleza']
+    style_debilidad = estilos['debilidad']
+
     # --- ABP (ACCIONES BALÓN PARADO) ---
-    story.append(Table([[Paragraph('🎯  BALÓN PARADO', style_subtitulo)]],
-                       colWidths=[ancho_pagina]))
-    story[-1].setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), COLORES['morado']),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    story.append(plantilla.barras['abp'])
     story.append(Spacer(1, 0.2*cm))
 
-    abp = datos.get('abp', {})
-    dibujos_abp = {}
-    if dibujos_ia:
-        dibujos_abp = dibujos_ia.get('abp', {})
 
     # Campo ABP con instrucciones de IA (rival ataca, fase tipo 'defensa')
     instrucciones_abp = dibujos_abp.get('corners', {})
-    campo_abp = CampoDinamico.crear_campo_con_instrucciones(
-        ancho_pagina * 0.4, 4*cm, instrucciones_abp, fase_tipo='defensa'
+    campo_abp = plantilla.campo(
+        CampoDinamico.crear_campo_con_instrucciones,
+        ancho_pagina * 0.4, 4*cm, instrucciones_abp, 'defensa'
     )
 
     abp_info = []
@@ -959,17 +1237,20 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
 
     story.append(Spacer(1, 0.4*cm))
 
+    return story
+
+
+def _seccion_jugadores(plantilla, jugadores):
+    """Sección de jugadores clave: campo con el 11, leyenda y tarjetas"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+    style_texto = estilos['texto']
+
     # --- JUGADORES CLAVE ---
-    story.append(Table([[Paragraph('⭐  JUGADORES CLAVE', style_subtitulo)]],
-                       colWidths=[ancho_pagina]))
-    story[-1].setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), COLORES['verde_oscuro']),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    story.append(plantilla.barras['jugadores'])
     story.append(Spacer(1, 0.2*cm))
 
-    jugadores = datos.get('jugadores_clave', [])
 
     if jugadores:
         # Campo con el 11 completo - jugadores destacados resaltados
@@ -978,7 +1259,8 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         campo_ancho = ancho_pagina * 0.85  # Un poco más pequeño que el ancho total
         campo_alto = campo_ancho / 1.54     # Proporciones reales de campo
 
-        campo_formacion = CampoFormacion.crear_campo_formacion(
+        campo_formacion = plantilla.campo(
+            CampoFormacion.crear_campo_formacion,
             campo_ancho,
             campo_alto,
             jugadores[:3]
@@ -999,11 +1281,10 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
 
             leyenda_items.append(
                 Paragraph(f'<font color="{color_dot.hexval()}">●</font> #{jug.get("numero", "-")} {jug.get("nombre", "-")} ({jug.get("posicion", "-")})',
-                         ParagraphStyle('leyenda', fontSize=8, textColor=COLORES['gris_oscuro']))
+                         estilos['leyenda'])
             )
 
-        leyenda_gris = Paragraph('<font color="#6B7280">●</font> Resto del 11',
-                                ParagraphStyle('leyenda', fontSize=8, textColor=COLORES['gris']))
+        leyenda_gris = plantilla.leyenda_gris
 
         leyenda_table = Table([[leyenda_items[0] if len(leyenda_items) > 0 else '',
                                leyenda_items[1] if len(leyenda_items) > 1 else '',
@@ -1092,30 +1373,26 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
         ]))
         story.append(jug_table)
 
+    return story
+
+
+def _seccion_footer(plantilla, fecha_hora):
+    """Pie con logos y fecha de generación"""
+    story = []
+    ancho_pagina = plantilla.ancho_pagina
+    estilos = plantilla.estilos
+
     # ==================================================================
     # FOOTER
     # ==================================================================
     story.append(Spacer(1, 0.5*cm))
 
-    # Logo en footer
-    if logo_path:
-        try:
-            footer_logo = RLImage(logo_path, width=30, height=35)
-            footer_logo_right = RLImage(logo_path, width=30, height=35)
-        except:
-            footer_logo = crear_logo_placeholder(30, 35)
-            footer_logo_right = crear_logo_placeholder(30, 35)
-    else:
-        footer_logo = crear_logo_placeholder(30, 35)
-        footer_logo_right = crear_logo_placeholder(30, 35)
-
     footer_text = Paragraph(
-        f'<i>Club Atlético Central · Informe generado el {datetime.now().strftime("%d/%m/%Y %H:%M")}</i>',
-        ParagraphStyle('footer', fontSize=8, textColor=COLORES['gris'],
-                      alignment=TA_CENTER)
+        f'<i>Club Atlético Central · Informe generado el {fecha_hora}</i>',
+        estilos['footer']
     )
 
-    footer_row = [[footer_logo, footer_text, footer_logo_right]]
+    footer_row = [[plantilla.logo_footer, footer_text, plantilla.logo_footer_dcha]]
     footer_table = Table(footer_row, colWidths=[40, ancho_pagina - 80, 40])
     footer_table.setStyle(TableStyle([
         ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
@@ -1127,9 +1404,70 @@ def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None):
     ]))
     story.append(footer_table)
 
+    return story
+
+
+# =============================================================================
+# GENERADOR PDF PRINCIPAL
+# =============================================================================
+def construir_story_v2(datos, dibujos_ia=None, usar_cache=True, deterministico=False):
+    """
+    Flowables del informe v2, sin construir el documento
+
+    Los usa generar_informe_v2_pdf y el pack de partido (informe y plan en un
+    mismo PDF).
+
+    Returns:
+        Lista de flowables para un documento con MARGENES_V2
+    """
+    ancho_pagina = A4[0] - MARGENES_V2['leftMargin'] - MARGENES_V2['rightMargin']
+
+    # Logos y barras de sección de este render (estilos y logo cacheados)
+    plantilla = obtener_plantilla_pagina(ancho_pagina, usar_cache)
+
+    ahora = fecha_informe(datos, deterministico)
+    fecha = ahora.strftime('%d/%m/%Y')
+
+    dibujos_ia = dibujos_ia or {}
+
+    # PÁGINA 1: CABECERA + ATAQUE + DEFENSA
+    story = _seccion_cabecera(plantilla, datos, fecha)
+    story.extend(_seccion_ataque(plantilla, datos.get('ataque', {}), dibujos_ia.get('ataque', {})))
+    story.extend(_seccion_defensa(plantilla, datos.get('defensa', {}), dibujos_ia.get('defensa', {})))
+    story.append(PageBreak())
+
+    # PÁGINA 2: TRANSICIONES + ABP + JUGADORES
+    story.extend(_seccion_transiciones(plantilla, datos.get('transiciones', {}),
+                                       dibujos_ia.get('transiciones', {})))
+    story.extend(_seccion_abp(plantilla, datos.get('abp', {}), dibujos_ia.get('abp', {})))
+    story.extend(_seccion_jugadores(plantilla, datos.get('jugadores_clave', [])))
+
+    story.extend(_seccion_footer(plantilla, texto_fecha_hora(ahora)))
+    return story
+
+
+def generar_informe_v2_pdf(datos, output_path, dibujos_ia=None, usar_cache=True, deterministico=False):
+    """
+    Genera un PDF profesional ultra-visual con análisis táctico
+
+    Args:
+        datos: Diccionario con todos los datos del formulario v2
+        output_path: Ruta donde guardar el PDF
+        dibujos_ia: Diccionario con instrucciones de dibujo generadas por IA (opcional)
+        usar_cache: Reutilizar los campos tácticos ya dibujados (el PDF
+            resultante es idéntico al de un render completo)
+        deterministico: Mismos datos -> mismos bytes (fecha del formulario y
+            modo invariante de ReportLab)
+    """
+
+    # Configuración del documento
+    doc = crear_documento(output_path, deterministico, **MARGENES_V2)
+
+    story = construir_story_v2(datos, dibujos_ia, usar_cache, deterministico)
+
     # Generar PDF
-    doc.build(story)
-    print(f"✅ PDF v2.0 PROFESIONAL generado: {output_path}")
+    construir_documento(doc, story, 'informe_v2')
+    logger.debug("PDF v2.0 generado: %s", output_path)
 
 
 if __name__ == "__main__":
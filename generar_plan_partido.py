@@ -4,15 +4,18 @@ Generador de PDF para Plan de Partido
 Club Atlético Central
 """
 
-from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 import json
-from datetime import datetime
+import logging
+from functools import lru_cache
 from tactical_options import DEFENSIVA_OPCIONES, OFENSIVA_SALIDA
+from documento_pdf import crear_documento, construir_documento, fecha_informe, texto_fecha_hora
+
+logger = logging.getLogger(__name__)
 
 # Colores corporativos
 COLOR_NEGRO = colors.HexColor('#000000')
@@ -22,20 +25,13 @@ COLOR_GRIS_FONDO = colors.HexColor('#F3F4F6')
 COLOR_AZUL = colors.HexColor('#3B82F6')
 
 
-def generar_plan_partido_pdf(datos, nombre_archivo):
-    """
-    Genera el PDF del Plan de Partido
-    """
-    doc = SimpleDocTemplate(
-        nombre_archivo,
-        pagesize=A4,
-        rightMargin=2*cm,
-        leftMargin=2*cm,
-        topMargin=2*cm,
-        bottomMargin=2*cm
-    )
+# Márgenes del documento
+MARGENES_PLAN = {'rightMargin': 2*cm, 'leftMargin': 2*cm, 'topMargin': 2*cm, 'bottomMargin': 2*cm}
+
 
-    # Estilos
+@lru_cache(maxsize=1)
+def _crear_estilos():
+    """Estilos del plan (no dependen de los datos: se crean una vez)"""
     styles = getSampleStyleSheet()
 
     style_title = ParagraphStyle(
@@ -88,6 +84,35 @@ def generar_plan_partido_pdf(datos, nombre_archivo):
         fontName='Helvetica'
     )
 
+    footer = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=COLOR_GRIS,
+                            alignment=TA_CENTER)
+
+    return {
+        'title': style_title,
+        'heading': style_heading,
+        'subheading': style_subheading,
+        'normal': style_normal,
+        'bullet': style_bullet,
+        'footer': footer,
+    }
+
+
+def construir_story_plan(datos, deterministico=False):
+    """
+    Flowables del Plan de Partido, sin construir el documento
+
+    Returns:
+        Lista de flowables para un documento con MARGENES_PLAN
+    """
+    estilos = _crear_estilos()
+    style_title = estilos['title']
+    style_heading = estilos['heading']
+    style_subheading = estilos['subheading']
+    style_normal = estilos['normal']
+    style_bullet = estilos['bullet']
+
+    fecha = fecha_informe(datos, deterministico)
+
     # Contenido del PDF
     story = []
 
@@ -101,7 +126,7 @@ def generar_plan_partido_pdf(datos, nombre_archivo):
         ['Jornada:', datos.get('jornada', '-')],
         ['Sistema Rival:', datos.get('sistema_rival', '-')],
         ['Nuestro Sistema:', datos.get('plan_sistema_propio', '-')],
-        ['Fecha:', datetime.now().strftime('%d/%m/%Y')]
+        ['Fecha:', fecha.strftime('%d/%m/%Y')]
     ]
 
     table = Table(datos_basicos, colWidths=[5*cm, 10*cm])
@@ -250,13 +275,25 @@ def generar_plan_partido_pdf(datos, nombre_archivo):
     story.append(Spacer(1, 1*cm))
     story.append(Paragraph("─" * 80, style_normal))
     story.append(Paragraph(
-        f"Plan de Partido generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M')} | Club Atlético Central",
-        ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=COLOR_GRIS, alignment=TA_CENTER)
+        f"Plan de Partido generado el {texto_fecha_hora(fecha, '%d/%m/%Y a las %H:%M')} | Club Atlético Central",
+        estilos['footer']
     ))
+    return story
+
+
+def generar_plan_partido_pdf(datos, nombre_archivo, deterministico=False):
+    """
+    Genera el PDF del Plan de Partido
+
+    Con deterministico=True, mismos datos -> mismos bytes (fecha del
+    formulario y modo invariante de ReportLab)
+    """
+    doc = crear_documento(nombre_archivo, deterministico, **MARGENES_PLAN)
+    story = construir_story_plan(datos, deterministico)
 
     # Construir PDF
-    doc.build(story)
-    print(f"✅ Plan de Partido generado: {nombre_archivo}")
+    construir_documento(doc, story, 'plan_partido')
+    logger.debug("Plan de Partido generado: %s", nombre_archivo)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+"""
+Configuración de gunicorn para producción
+Club Atlético Central
+
+    gunicorn --config gunicorn.conf.py
+
+La app se carga una sola vez en el proceso maestro (preload_app) con
+crear_app(), que precarga ReportLab, estilos, logo, plantilla del informe y
+opciones tácticas. Los workers nacen por fork y comparten esa memoria
+(copy-on-write), así que cada uno ocupa menos y su primera petición no paga
+la carga. Con el plan de 512 MB caben más workers.
+
+Variables de entorno:
+    PORT                Puerto (lo fija la plataforma; por defecto 8000)
+    WEB_CONCURRENCY     Número de workers (por defecto 2)
+    GUNICORN_THREADS    Hilos por worker (por defecto 8; ver admision.py)
+    GUNICORN_TIMEOUT    Segundos antes de reiniciar un worker bloqueado
+                        (por defecto 120: los nueve dibujos de la IA tardan)
+"""
+
+import gc
+import os
+
+import entorno
+
+# El .env antes de leer la configuración (y antes de cargar la app)
+entorno.cargar()
+
+
+wsgi_app = 'app:crear_app()'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+# El registro de la app ya escribe en stderr; gunicorn solo sus eventos
+accesslog = None
+errorlog = '-'
+
+
+def on_starting(server):
+    """Antes de cargar la app: descartar métricas de ejecuciones anteriores"""
+    import metricas
+    metricas.limpiar_instantaneas()
+
+
+def when_ready(server):
+    """
+    App precargada y a punto de crear los workers
+
+    gc.freeze() pasa los objetos de la precarga a la generación permanente:
+    el recolector de los workers ya no los recorre y no escribe en sus
+    cabeceras, que es lo que rompería el copy-on-write.
+    """
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Cada worker vuelca sus métricas periódicamente aunque no reciba peticiones"""
+    import metricas
+    metricas.iniciar_volcado()
@@ -10,29 +10,170 @@ Soporta:
 
 import os
 import json
-import sys
-from dotenv import load_dotenv
-
-# Cargar variables de entorno
-load_dotenv()
-
-# Importar Groq con manejo de errores
-try:
-    from groq import Groq
-    GROQ_DISPONIBLE = True
-    print(f"✓ Groq importado correctamente", file=sys.stderr)
-except ImportError as e:
-    GROQ_DISPONIBLE = False
-    print(f"⚠ Groq no disponible: {e}", file=sys.stderr)
-
-# Importar Google Gemini con manejo de errores
-try:
-    import google.generativeai as genai
-    GEMINI_DISPONIBLE = True
-    print(f"✓ Google Gemini importado correctamente", file=sys.stderr)
-except ImportError as e:
-    GEMINI_DISPONIBLE = False
-    print(f"⚠ Google Gemini no disponible: {e}", file=sys.stderr)
+import asyncio
+import logging
+import weakref
+import importlib.util
+from functools import lru_cache
+
+# El .env antes que limitador y pool_claves (ya cargado si viene de app.py)
+import entorno
+entorno.cargar()
+
+from metricas import cronometrar_llm, DIBUJOS_POR_DEFECTO
+import coalescencia
+import limitador
+import pool_claves
+import trazas
+
+logger = logging.getLogger(__name__)
+
+# El SDK de Groq y httpx se cargan en el primer uso, no al arrancar cada
+# worker: un worker que solo genera PDFs no los necesita nunca.
+# Aquí solo se comprueba que están instalados, sin importarlos.
+def _instalado(modulo):
+    try:
+        return importlib.util.find_spec(modulo) is not None
+    except ImportError:
+        # No está ni el paquete padre
+        return False
+
+
+GROQ_DISPONIBLE = _instalado('groq')
+
+
+@lru_cache(maxsize=None)
+def _modulo_groq():
+    """Importa el SDK de Groq en el primer uso"""
+    if not GROQ_DISPONIBLE:
+        raise ImportError("Groq no disponible: instala el paquete 'groq'")
+    import groq
+    logger.debug("Groq importado correctamente")
+    return groq
+
+
+@lru_cache(maxsize=None)
+def _modulo_httpx():
+    """Importa httpx (cliente de Gemini y de la API asíncrona) en el primer uso"""
+    import httpx
+    return httpx
+
+
+# =============================================================================
+# MODELOS Y PROMPTS DE SISTEMA (comunes a la API síncrona y la asíncrona)
+# =============================================================================
+MODELO_GROQ = "llama-3.3-70b-versatile"
+MODELO_GEMINI = "gemini-1.5-flash"
+MODELO_CLAUDE = "claude-3-haiku-20240307"  # Modelo barato
+
+SISTEMA_ANALISIS = "Eres un analista táctico de fútbol profesional. Respondes SIEMPRE en formato JSON válido."
+
+SISTEMA_DIBUJO = """Eres un analista táctico de fútbol que genera dibujos PRECISOS.
+
+REGLAS CRÍTICAS:
+1. SOLO dibuja elementos MENCIONADOS en el texto del usuario
+2. NO inventes jugadores, flechas o zonas que no estén en el texto
+3. Respeta SIEMPRE las coordenadas X indicadas para cada fase
+4. Devuelve ÚNICAMENTE JSON válido, sin explicaciones
+5. Si el texto menciona números de jugadores específicos (ej: "el 10"), usa ESE número
+6. Si menciona una estructura (ej: "4+1"), dibuja EXACTAMENTE esos jugadores"""
+
+PREAMBULO_DIBUJO_GEMINI = """Eres un analista táctico de fútbol profesional especializado en visualización.
+
+INSTRUCCIONES CRÍTICAS:
+1. SOLO dibuja elementos EXPLÍCITAMENTE mencionados en el texto
+2. NO inventes ni añadas elementos que no estén descritos
+3. Respeta EXACTAMENTE las coordenadas X indicadas para cada zona del campo
+4. Si menciona números de jugadores (ej: "el 10", "el 9"), usa ESOS números
+5. Si menciona una estructura (ej: "4+1", "4-4-2"), dibuja EXACTAMENTE esos jugadores
+6. Las flechas SOLO para movimientos/pases que se describan
+7. Devuelve ÚNICAMENTE el JSON, sin explicaciones ni comentarios
+
+"""
+
+
+def _parsear_json(contenido):
+    """Quita el bloque de markdown (```json ... ```) si lo hay y parsea el JSON"""
+    contenido = contenido.strip()
+    if contenido.startswith('```json'):
+        contenido = contenido[7:]
+    if contenido.startswith('```'):
+        contenido = contenido[3:]
+    if contenido.endswith('```'):
+        contenido = contenido[:-3]
+    return json.loads(contenido.strip())
+
+
+# =============================================================================
+# CLIENTES HTTP COMPARTIDOS
+# =============================================================================
+URL_GROQ = 'https://api.groq.com'
+URL_GEMINI = 'https://generativelanguage.googleapis.com/v1beta'
+URL_CLAUDE = 'https://api.anthropic.com/v1/messages'
+URL_OLLAMA = 'http://localhost:11434/api/generate'
+
+# Conexiones simultáneas del pool (todas las peticiones al LLM del proceso)
+MAX_CONEXIONES_LLM = int(os.environ.get('LLM_MAX_CONEXIONES', 100))
+
+# Un cliente (con su pool de conexiones) por bucle de eventos: las conexiones
+# de httpx no se pueden usar desde un bucle distinto del que las abrió
+_clientes_async = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def cliente_sync():
+    """
+    Cliente httpx.Client compartido por los hilos del proceso
+
+    Gemini se llama siempre por su API REST, también desde la API síncrona:
+    cada llamada lleva su clave del pool (el SDK usa una clave global del
+    proceso y no dejaría repartir ni enfriar claves).
+    """
+    httpx = _modulo_httpx()
+    return httpx.Client(
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_connections=MAX_CONEXIONES_LLM, max_keepalive_connections=20),
+    )
+
+
+def _peticion_gemini(prompt, clave):
+    """Argumentos de la petición generateContent de un dibujo (para post)"""
+    return {
+        'url': f'{URL_GEMINI}/models/{MODELO_GEMINI}:generateContent',
+        'headers': {'x-goog-api-key': clave},
+        'json': {
+            # Gemini no tiene mensaje de sistema: el preámbulo va en el prompt
+            'contents': [{'parts': [{'text': PREAMBULO_DIBUJO_GEMINI + prompt}]}],
+            'generationConfig': {'temperature': 0.1, 'maxOutputTokens': 2000},
+        },
+    }
+
+
+def _dibujo_de_gemini(respuesta):
+    """JSON del dibujo en una respuesta de generateContent"""
+    partes = respuesta.json()['candidates'][0]['content']['parts']
+    return _parsear_json(''.join(parte.get('text', '') for parte in partes))
+
+
+def cliente_async():
+    """Cliente httpx.AsyncClient compartido del bucle de eventos actual"""
+    bucle = asyncio.get_running_loop()
+    cliente = _clientes_async.get(bucle)
+    if cliente is None or cliente.is_closed:
+        httpx = _modulo_httpx()
+        cliente = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=MAX_CONEXIONES_LLM, max_keepalive_connections=20),
+        )
+        _clientes_async[bucle] = cliente
+    return cliente
+
+
+async def cerrar_cliente_async():
+    """Cierra el cliente del bucle actual (al terminar un script o apagar el servidor)"""
+    cliente = _clientes_async.pop(asyncio.get_running_loop(), None)
+    if cliente is not None:
+        await cliente.aclose()
 
 
 class IAAnalyzer:
@@ -48,26 +189,19 @@ class IAAnalyzer:
             provider: 'groq', 'claude', 'ollama', 'gemini'
         """
         self.provider = provider
-        self.groq_key = os.getenv('GROQ_API_KEY')
+        # Groq y Google pueden tener varias claves (pool_claves.py); cada
+        # llamada elige la suya
+        self.groq_claves = pool_claves.pool('groq')
+        self.google_claves = pool_claves.pool('gemini')
+        self.groq_key = self.groq_claves.claves[0].valor if self.groq_claves else None
         self.claude_key = os.getenv('ANTHROPIC_API_KEY')
-        self.google_key = os.getenv('GOOGLE_API_KEY')
+        self.google_key = self.google_claves.claves[0].valor if self.google_claves else None
 
-        # Configurar Gemini si está disponible
-        if GEMINI_DISPONIBLE and self.google_key:
-            genai.configure(api_key=self.google_key)
-            self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-            print(f"[IA] ✓ Gemini configurado correctamente", file=sys.stderr)
-        else:
-            self.gemini_model = None
-
-        # Log para debugging
-        print(f"[IA] Provider principal: {provider}", file=sys.stderr)
-        if self.groq_key:
-            print(f"[IA] ✓ GROQ_API_KEY encontrada", file=sys.stderr)
-        if self.google_key:
-            print(f"[IA] ✓ GOOGLE_API_KEY encontrada", file=sys.stderr)
-        else:
-            print(f"[IA] ⚠ GOOGLE_API_KEY no encontrada (Gemini no disponible)", file=sys.stderr)
+        # Gemini va por su API REST (cliente_sync / cliente_async), sin SDK
+        self.gemini_disponible = bool(self.google_key)
+
+        logger.debug("Provider principal: %s (claves groq=%d, google=%d)",
+                     provider, len(self.groq_claves), len(self.google_claves))
 
     def analizar_notas_rival(self, notas_texto):
         """
@@ -82,14 +216,7 @@ class IAAnalyzer:
         prompt = self._construir_prompt_rival(notas_texto)
 
         try:
-            if self.provider == 'groq':
-                resultado = self._analizar_groq(prompt)
-            elif self.provider == 'claude':
-                resultado = self._analizar_claude(prompt)
-            elif self.provider == 'ollama':
-                resultado = self._analizar_ollama(prompt)
-            else:
-                raise ValueError(f"Provider '{self.provider}' no soportado")
+            resultado = self._analizar_con_proveedor(prompt, 'notas')
 
             return {
                 'success': True,
@@ -115,14 +242,7 @@ class IAAnalyzer:
         prompt = self._construir_prompt_plan(datos_rival, notas_entrenador)
 
         try:
-            if self.provider == 'groq':
-                resultado = self._analizar_groq(prompt)
-            elif self.provider == 'claude':
-                resultado = self._analizar_claude(prompt)
-            elif self.provider == 'ollama':
-                resultado = self._analizar_ollama(prompt)
-            else:
-                raise ValueError(f"Provider '{self.provider}' no soportado")
+            resultado = self._analizar_con_proveedor(prompt, 'plan')
 
             return {
                 'success': True,
@@ -134,6 +254,27 @@ class IAAnalyzer:
                 'error': str(e)
             }
 
+    def _analizar_con_proveedor(self, prompt, fase):
+        """Envía el prompt al proveedor configurado midiendo la llamada"""
+        if self.provider not in ('groq', 'claude', 'ollama'):
+            raise ValueError(f"Provider '{self.provider}' no soportado")
+
+        # Si la misma llamada ya está en vuelo (doble clic, dos ayudantes con
+        # las mismas notas) se espera a su resultado en lugar de repetirla
+        clave = coalescencia.clave_llamada(self.provider, fase, prompt)
+        return coalescencia.COALESCEDOR.ejecutar(clave, lambda: self._llamar_proveedor(prompt, fase))
+
+    def _llamar_proveedor(self, prompt, fase):
+        # El entrenador está esperando: pasa por delante de los dibujos
+        with limitador.turno(self.provider, SISTEMA_ANALISIS + prompt, 2000, limitador.INTERACTIVA), \
+                cronometrar_llm(self.provider, fase):
+            if self.provider == 'groq':
+                return self._analizar_groq(prompt)
+            elif self.provider == 'claude':
+                return self._analizar_claude(prompt)
+            else:
+                return self._analizar_ollama(prompt)
+
     def _construir_prompt_rival(self, notas):
         """Construye el prompt para analizar al rival por fases del juego"""
         return f"""Eres un analista táctico de fútbol profesional. Analiza estas notas de observación de un rival.
@@ -262,62 +403,51 @@ Devuelve ÚNICAMENTE un JSON válido con sugerencias tácticas:
     def _analizar_groq(self, prompt):
         """Analiza usando Groq API"""
         if not self.groq_key:
-            print("[IA] Error: API Key no configurada", file=sys.stderr)
+            logger.error("API Key de Groq no configurada")
             raise ValueError("API Key de Groq no configurada en variables de entorno")
 
         try:
-            print("[IA] Inicializando cliente Groq...", file=sys.stderr)
+            logger.debug("Inicializando cliente Groq")
+
+            def llamar(clave):
+                # Inicializar cliente - compatible con versiones antiguas y nuevas
+                try:
+                    # Versión nueva (>0.10.0)
+                    client = _modulo_groq().Groq(api_key=clave, max_retries=0)
+                except TypeError as te:
+                    logger.warning("Error con versión nueva de Groq, intentando versión antigua: %s", te)
+                    # Versión antigua (0.4.x)
+                    client = _modulo_groq().Client(api_key=clave)
+
+                logger.debug("Cliente Groq inicializado, haciendo petición")
+
+                return client.chat.completions.create(
+                    model=MODELO_GROQ,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": SISTEMA_ANALISIS
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=2000
+                )
 
-            # Inicializar cliente - compatible con versiones antiguas y nuevas
-            try:
-                # Versión nueva (>0.10.0)
-                client = Groq(api_key=self.groq_key)
-            except TypeError as te:
-                print(f"[IA] Error con versión nueva, intentando versión antigua: {te}", file=sys.stderr)
-                # Versión antigua (0.4.x)
-                import groq as groq_module
-                client = groq_module.Client(api_key=self.groq_key)
-
-            print("[IA] Cliente Groq inicializado, haciendo petición...", file=sys.stderr)
-
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Eres un analista táctico de fútbol profesional. Respondes SIEMPRE en formato JSON válido."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
+            completion = self.groq_claves.llamar(llamar)
 
-            print("[IA] Respuesta recibida, procesando...", file=sys.stderr)
+            logger.debug("Respuesta de Groq recibida")
             contenido = completion.choices[0].message.content
 
-            # Limpiar markdown si existe
-            contenido = contenido.strip()
-            if contenido.startswith('```json'):
-                contenido = contenido[7:]
-            if contenido.startswith('```'):
-                contenido = contenido[3:]
-            if contenido.endswith('```'):
-                contenido = contenido[:-3]
-            contenido = contenido.strip()
-
-            # Parsear JSON
-            resultado = json.loads(contenido)
-            print("[IA] ✓ Análisis completado exitosamente", file=sys.stderr)
+            resultado = _parsear_json(contenido)
+            logger.debug("Análisis completado")
             return resultado
 
         except Exception as e:
-            print(f"[IA] ✗ Error en _analizar_groq: {type(e).__name__}: {str(e)}", file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("Error en _analizar_groq: %s", type(e).__name__)
             raise ValueError(f"Error al conectar con Groq: {type(e).__name__} - {str(e)}")
 
     def _analizar_claude(self, prompt):
@@ -333,7 +463,7 @@ Devuelve ÚNICAMENTE un JSON válido con sugerencias tácticas:
         client = anthropic.Anthropic(api_key=self.claude_key)
 
         message = client.messages.create(
-            model="claude-3-haiku-20240307",  # Modelo barato
+            model=MODELO_CLAUDE,
             max_tokens=2000,
             temperature=0.3,
             messages=[
@@ -344,19 +474,7 @@ Devuelve ÚNICAMENTE un JSON válido con sugerencias tácticas:
             ]
         )
 
-        contenido = message.content[0].text
-
-        # Limpiar y parsear
-        contenido = contenido.strip()
-        if contenido.startswith('```json'):
-            contenido = contenido[7:]
-        if contenido.startswith('```'):
-            contenido = contenido[3:]
-        if contenido.endswith('```'):
-            contenido = contenido[:-3]
-        contenido = contenido.strip()
-
-        return json.loads(contenido)
+        return _parsear_json(message.content[0].text)
 
     def _analizar_ollama(self, prompt):
         """Analiza usando Ollama (local)"""
@@ -391,32 +509,46 @@ Devuelve ÚNICAMENTE un JSON válido con sugerencias tácticas:
         Returns:
             dict con instrucciones de dibujo (jugadores, flechas, zonas)
         """
+        # Un span por dibujo: con las llamadas en paralelo se ve su solapamiento
+        with trazas.span('dibujo_tactico', fase=fase, tipo=tipo) as span:
+            resultado = self._generar_dibujo(fase, tipo, texto_tactico)
+            if span:
+                span.fijar(proveedor=resultado.get('provider', 'por_defecto'))
+            return resultado
+
+    def _generar_dibujo(self, fase, tipo, texto_tactico):
+        """Prueba los proveedores en orden y cae al dibujo por defecto"""
         prompt = self._construir_prompt_dibujo(fase, tipo, texto_tactico)
 
         # Intentar con Gemini primero (mejor para dibujos)
-        if self.gemini_model:
+        if self.gemini_disponible:
             try:
-                print(f"[IA] Usando Gemini para dibujo {fase}/{tipo}", file=sys.stderr)
-                resultado = self._analizar_gemini_dibujo(prompt)
+                logger.debug("Usando Gemini para dibujo %s/%s", fase, tipo)
+                with limitador.turno('gemini', PREAMBULO_DIBUJO_GEMINI + prompt, 2000), \
+                        cronometrar_llm('gemini', fase):
+                    resultado = self._analizar_gemini_dibujo(prompt)
                 return {
                     'success': True,
                     'data': resultado,
                     'provider': 'gemini'
                 }
             except Exception as e:
-                print(f"[IA] Error Gemini, intentando Groq: {e}", file=sys.stderr)
+                logger.warning("Error Gemini en dibujo %s/%s, intentando Groq: %s", fase, tipo, e)
 
         # Fallback a Groq
         try:
-            print(f"[IA] Usando Groq para dibujo {fase}/{tipo}", file=sys.stderr)
-            resultado = self._analizar_groq_dibujo(prompt)
+            logger.debug("Usando Groq para dibujo %s/%s", fase, tipo)
+            with limitador.turno('groq', SISTEMA_DIBUJO + prompt, 1500), cronometrar_llm('groq', fase):
+                resultado = self._analizar_groq_dibujo(prompt)
             return {
                 'success': True,
                 'data': resultado,
                 'provider': 'groq'
             }
         except Exception as e:
-            print(f"[IA] Error generando dibujo: {e}", file=sys.stderr)
+            logger.warning("Error generando dibujo %s/%s, se usa el dibujo por defecto: %s",
+                           fase, tipo, e)
+            DIBUJOS_POR_DEFECTO.inc(fase=fase, tipo=tipo)
             return {
                 'success': False,
                 'data': self._dibujo_por_defecto(fase, tipo),
@@ -945,46 +1077,31 @@ DEVUELVE SOLO JSON:
             raise ValueError("API Key de Groq no configurada")
 
         try:
-            client = Groq(api_key=self.groq_key)
-
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """Eres un analista táctico de fútbol que genera dibujos PRECISOS.
-
-REGLAS CRÍTICAS:
-1. SOLO dibuja elementos MENCIONADOS en el texto del usuario
-2. NO inventes jugadores, flechas o zonas que no estén en el texto
-3. Respeta SIEMPRE las coordenadas X indicadas para cada fase
-4. Devuelve ÚNICAMENTE JSON válido, sin explicaciones
-5. Si el texto menciona números de jugadores específicos (ej: "el 10"), usa ESE número
-6. Si menciona una estructura (ej: "4+1"), dibuja EXACTAMENTE esos jugadores"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.2,  # Más bajo = más preciso, menos inventivo
-                max_tokens=1500
-            )
-
-            contenido = completion.choices[0].message.content.strip()
+            def llamar(clave):
+                client = _modulo_groq().Groq(api_key=clave, max_retries=0)
+
+                return client.chat.completions.create(
+                    model=MODELO_GROQ,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": SISTEMA_DIBUJO
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.2,  # Más bajo = más preciso, menos inventivo
+                    max_tokens=1500
+                )
 
-            if contenido.startswith('```json'):
-                contenido = contenido[7:]
-            if contenido.startswith('```'):
-                contenido = contenido[3:]
-            if contenido.endswith('```'):
-                contenido = contenido[:-3]
-            contenido = contenido.strip()
+            completion = self.groq_claves.llamar(llamar)
 
-            return json.loads(contenido)
+            return _parsear_json(completion.choices[0].message.content)
 
         except Exception as e:
-            print(f"[IA] Error en dibujo Groq: {e}", file=sys.stderr)
+            logger.debug("Error en dibujo Groq: %s", e)
             raise
 
     def _analizar_gemini_dibujo(self, prompt):
@@ -992,54 +1109,24 @@ REGLAS CRÍTICAS:
         Analiza usando Google Gemini para generar dibujos tácticos
 
         Gemini tiene mejor razonamiento espacial que LLaMA, ideal para
-        posicionar jugadores y flechas en coordenadas precisas.
+        posicionar jugadores y flechas en coordenadas precisas. Cada llamada
+        usa una clave del pool (reparto y enfriamiento, ver pool_claves.py).
         """
-        if not self.gemini_model:
+        if not self.gemini_disponible:
             raise ValueError("Gemini no configurado")
 
-        try:
-            # Prompt de sistema integrado para Gemini
-            full_prompt = f"""Eres un analista táctico de fútbol profesional especializado en visualización.
-
-INSTRUCCIONES CRÍTICAS:
-1. SOLO dibuja elementos EXPLÍCITAMENTE mencionados en el texto
-2. NO inventes ni añadas elementos que no estén descritos
-3. Respeta EXACTAMENTE las coordenadas X indicadas para cada zona del campo
-4. Si menciona números de jugadores (ej: "el 10", "el 9"), usa ESOS números
-5. Si menciona una estructura (ej: "4+1", "4-4-2"), dibuja EXACTAMENTE esos jugadores
-6. Las flechas SOLO para movimientos/pases que se describan
-7. Devuelve ÚNICAMENTE el JSON, sin explicaciones ni comentarios
-
-{prompt}"""
-
-            # Configuración para respuestas precisas
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.1,  # Muy bajo para máxima precisión
-                max_output_tokens=2000,
-            )
-
-            response = self.gemini_model.generate_content(
-                full_prompt,
-                generation_config=generation_config
-            )
+        def llamar(clave):
+            respuesta = cliente_sync().post(**_peticion_gemini(prompt, clave))
+            respuesta.raise_for_status()
+            return respuesta
 
-            contenido = response.text.strip()
-
-            # Limpiar markdown si existe
-            if contenido.startswith('```json'):
-                contenido = contenido[7:]
-            if contenido.startswith('```'):
-                contenido = contenido[3:]
-            if contenido.endswith('```'):
-                contenido = contenido[:-3]
-            contenido = contenido.strip()
-
-            resultado = json.loads(contenido)
-            print(f"[IA] Gemini generó dibujo con {len(resultado.get('jugadores', []))} jugadores", file=sys.stderr)
+        try:
+            resultado = _dibujo_de_gemini(self.google_claves.llamar(llamar))
+            logger.debug("Gemini generó dibujo con %d jugadores", len(resultado.get('jugadores', [])))
             return resultado
 
         except Exception as e:
-            print(f"[IA] Error en dibujo Gemini: {e}", file=sys.stderr)
+            logger.debug("Error en dibujo Gemini: %s", e)
             raise
 
     def _dibujo_por_defecto(self, fase, tipo):
@@ -1236,54 +1323,224 @@ INSTRUCCIONES CRÍTICAS:
             'linea_tactica': {'activa': False}
         })
 
-    def generar_todos_los_dibujos(self, datos_completos):
-        """Genera todas las instrucciones de dibujo para un informe completo"""
-        dibujos = {
-            'ataque': {},
-            'defensa': {},
-            'transiciones': {},
-            'abp': {}
-        }
+    def _tareas_dibujo(self, datos_completos):
+        """
+        Dibujos de un informe completo
 
-        # Ataque
+        Returns:
+            Lista de (sección, fase, tipo, datos) con datos None si el usuario
+            no escribió nada para ese dibujo
+        """
         ataque = datos_completos.get('ataque', {})
-        for tipo in ['vs_bloque_alto', 'vs_bloque_medio', 'vs_bloque_bajo']:
-            fase_data = ataque.get(tipo, {})
-            if fase_data:
-                resultado = self.generar_dibujo_tactico('ataque', tipo, fase_data)
-                dibujos['ataque'][tipo] = resultado['data']
-            else:
-                dibujos['ataque'][tipo] = self._dibujo_por_defecto('ataque', tipo)
-
-        # Defensa
         defensa = datos_completos.get('defensa', {})
+        transiciones = datos_completos.get('transiciones', {})
+        abp = datos_completos.get('abp', {})
+
+        tareas = []
+        for tipo in ['vs_bloque_alto', 'vs_bloque_medio', 'vs_bloque_bajo']:
+            tareas.append(('ataque', 'ataque', tipo, ataque.get(tipo) or None))
         for tipo in ['pressing_alto', 'bloque_medio', 'bloque_bajo']:
-            fase_data = defensa.get(tipo, {})
+            tareas.append(('defensa', 'defensa', tipo, defensa.get(tipo) or None))
+        for tipo in ['def_atq', 'atq_def']:
+            tareas.append(('transiciones', 'transicion', tipo, transiciones.get(tipo) or None))
+        tareas.append(('abp', 'abp', 'corners', abp or None))
+        return tareas
+
+    def generar_todos_los_dibujos(self, datos_completos, por_defecto=None):
+        """
+        Genera todas las instrucciones de dibujo para un informe completo
+
+        Args:
+            datos_completos: datos del informe
+            por_defecto: lista opcional donde se añade 'seccion/tipo' de cada
+                dibujo que falló con todos los proveedores y lleva el dibujo
+                por defecto (las fases sin texto no cuentan)
+        """
+        dibujos = {'ataque': {}, 'defensa': {}, 'transiciones': {}, 'abp': {}}
+
+        for seccion, fase, tipo, fase_data in self._tareas_dibujo(datos_completos):
             if fase_data:
-                resultado = self.generar_dibujo_tactico('defensa', tipo, fase_data)
-                dibujos['defensa'][tipo] = resultado['data']
+                resultado = self.generar_dibujo_tactico(fase, tipo, fase_data)
+                dibujos[seccion][tipo] = resultado['data']
+                if not resultado['success'] and por_defecto is not None:
+                    por_defecto.append(f'{seccion}/{tipo}')
             else:
-                dibujos['defensa'][tipo] = self._dibujo_por_defecto('defensa', tipo)
+                dibujos[seccion][tipo] = self._dibujo_por_defecto(fase, tipo)
 
-        # Transiciones
-        transiciones = datos_completos.get('transiciones', {})
-        for tipo in ['def_atq', 'atq_def']:
-            fase_data = transiciones.get(tipo, {})
+        return dibujos
+
+    # =========================================================================
+    # API ASÍNCRONA
+    # =========================================================================
+    # Mismos resultados que los métodos síncronos, pero las llamadas al LLM
+    # van por el cliente httpx asíncrono compartido (cliente_async): un
+    # proceso puede tener decenas en vuelo sin ocupar un hilo por cada una.
+    # Desde un script: asyncio.run(analizador.generar_todos_los_dibujos_async(datos))
+
+    async def analizar_notas_rival_async(self, notas_texto):
+        """Versión asíncrona de analizar_notas_rival"""
+        prompt = self._construir_prompt_rival(notas_texto)
+
+        try:
+            resultado = await self._analizar_con_proveedor_async(prompt, 'notas')
+            return {'success': True, 'data': resultado}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def generar_plan_tactico_async(self, datos_rival, notas_entrenador=''):
+        """Versión asíncrona de generar_plan_tactico"""
+        prompt = self._construir_prompt_plan(datos_rival, notas_entrenador)
+
+        try:
+            resultado = await self._analizar_con_proveedor_async(prompt, 'plan')
+            return {'success': True, 'data': resultado}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def generar_dibujo_tactico_async(self, fase, tipo, texto_tactico):
+        """Versión asíncrona de generar_dibujo_tactico"""
+        with trazas.span('dibujo_tactico', fase=fase, tipo=tipo) as span:
+            resultado = await self._generar_dibujo_async(fase, tipo, texto_tactico)
+            if span:
+                span.fijar(proveedor=resultado.get('provider', 'por_defecto'))
+            return resultado
+
+    async def generar_todos_los_dibujos_async(self, datos_completos, por_defecto=None):
+        """
+        Versión asíncrona de generar_todos_los_dibujos
+
+        Los dibujos se piden todos a la vez: la petición tarda lo que el más
+        lento, no la suma de los nueve.
+        """
+        tareas = self._tareas_dibujo(datos_completos)
+        resultados = await asyncio.gather(*(
+            self.generar_dibujo_tactico_async(fase, tipo, fase_data)
+            for _, fase, tipo, fase_data in tareas if fase_data
+        ))
+
+        dibujos = {'ataque': {}, 'defensa': {}, 'transiciones': {}, 'abp': {}}
+        resultados = iter(resultados)
+        for seccion, fase, tipo, fase_data in tareas:
             if fase_data:
-                resultado = self.generar_dibujo_tactico('transicion', tipo, fase_data)
-                dibujos['transiciones'][tipo] = resultado['data']
+                resultado = next(resultados)
+                dibujos[seccion][tipo] = resultado['data']
+                if not resultado['success'] and por_defecto is not None:
+                    por_defecto.append(f'{seccion}/{tipo}')
             else:
-                dibujos['transiciones'][tipo] = self._dibujo_por_defecto('transicion', tipo)
+                dibujos[seccion][tipo] = self._dibujo_por_defecto(fase, tipo)
+        return dibujos
 
-        # ABP
-        abp = datos_completos.get('abp', {})
-        if abp:
-            resultado = self.generar_dibujo_tactico('abp', 'corners', abp)
-            dibujos['abp']['corners'] = resultado['data']
-        else:
-            dibujos['abp']['corners'] = self._dibujo_por_defecto('abp', 'corners')
+    async def _analizar_con_proveedor_async(self, prompt, fase):
+        """Envía el prompt al proveedor configurado midiendo la llamada"""
+        if self.provider not in ('groq', 'claude', 'ollama'):
+            raise ValueError(f"Provider '{self.provider}' no soportado")
+
+        clave = coalescencia.clave_llamada(self.provider, fase, prompt)
+        return await coalescencia.COALESCEDOR.ejecutar_async(
+            clave, lambda: self._llamar_proveedor_async(prompt, fase))
+
+    async def _llamar_proveedor_async(self, prompt, fase):
+        async with limitador.turno_async(self.provider, SISTEMA_ANALISIS + prompt, 2000, limitador.INTERACTIVA):
+            with cronometrar_llm(self.provider, fase):
+                if self.provider == 'groq':
+                    try:
+                        return await self._groq_async(SISTEMA_ANALISIS, prompt, temperatura=0.3, max_tokens=2000)
+                    except Exception as e:
+                        raise ValueError(f"Error al conectar con Groq: {type(e).__name__} - {str(e)}")
+                elif self.provider == 'claude':
+                    return await self._claude_async(prompt)
+                else:
+                    return await self._ollama_async(prompt)
+
+    async def _generar_dibujo_async(self, fase, tipo, texto_tactico):
+        """Prueba los proveedores en orden y cae al dibujo por defecto"""
+        prompt = self._construir_prompt_dibujo(fase, tipo, texto_tactico)
 
-        return dibujos
+        if self.gemini_disponible:
+            try:
+                async with limitador.turno_async('gemini', PREAMBULO_DIBUJO_GEMINI + prompt, 2000):
+                    with cronometrar_llm('gemini', fase):
+                        resultado = await self._gemini_dibujo_async(prompt)
+                return {'success': True, 'data': resultado, 'provider': 'gemini'}
+            except Exception as e:
+                logger.warning("Error Gemini en dibujo %s/%s, intentando Groq: %s", fase, tipo, e)
+
+        try:
+            async with limitador.turno_async('groq', SISTEMA_DIBUJO + prompt, 1500):
+                with cronometrar_llm('groq', fase):
+                    resultado = await self._groq_async(SISTEMA_DIBUJO, prompt, temperatura=0.2, max_tokens=1500)
+            return {'success': True, 'data': resultado, 'provider': 'groq'}
+        except Exception as e:
+            logger.warning("Error generando dibujo %s/%s, se usa el dibujo por defecto: %s",
+                           fase, tipo, e)
+            DIBUJOS_POR_DEFECTO.inc(fase=fase, tipo=tipo)
+            return {
+                'success': False,
+                'data': self._dibujo_por_defecto(fase, tipo),
+                'error': str(e)
+            }
+
+    async def _groq_async(self, sistema, prompt, temperatura, max_tokens):
+        """Chat de Groq (API compatible con OpenAI)"""
+        if not self.groq_key:
+            raise ValueError("API Key de Groq no configurada")
+
+        base = (os.environ.get('GROQ_BASE_URL') or URL_GROQ).rstrip('/')
+        async def llamar(clave):
+            respuesta = await cliente_async().post(
+                f'{base}/openai/v1/chat/completions',
+                headers={'Authorization': f'Bearer {clave}'},
+                json={
+                    'model': MODELO_GROQ,
+                    'messages': [
+                        {'role': 'system', 'content': sistema},
+                        {'role': 'user', 'content': prompt},
+                    ],
+                    'temperature': temperatura,
+                    'max_tokens': max_tokens,
+                },
+            )
+            respuesta.raise_for_status()
+            return respuesta
+
+        respuesta = await self.groq_claves.llamar_async(llamar)
+        return _parsear_json(respuesta.json()['choices'][0]['message']['content'])
+
+    async def _gemini_dibujo_async(self, prompt):
+        """Dibujo con Gemini por la API REST de generateContent"""
+        async def llamar(clave):
+            respuesta = await cliente_async().post(**_peticion_gemini(prompt, clave))
+            respuesta.raise_for_status()
+            return respuesta
+
+        return _dibujo_de_gemini(await self.google_claves.llamar_async(llamar))
+
+    async def _claude_async(self, prompt):
+        """Mensaje a Claude por la API REST"""
+        if not self.claude_key:
+            raise ValueError("ANTHROPIC_API_KEY no configurada en .env")
+
+        respuesta = await cliente_async().post(
+            URL_CLAUDE,
+            headers={'x-api-key': self.claude_key, 'anthropic-version': '2023-06-01'},
+            json={
+                'model': MODELO_CLAUDE,
+                'max_tokens': 2000,
+                'temperature': 0.3,
+                'messages': [{'role': 'user', 'content': prompt}],
+            },
+        )
+        respuesta.raise_for_status()
+        return _parsear_json(respuesta.json()['content'][0]['text'])
+
+    async def _ollama_async(self, prompt):
+        """Ollama (local)"""
+        respuesta = await cliente_async().post(
+            URL_OLLAMA,
+            json={'model': 'llama3', 'prompt': prompt, 'stream': False, 'format': 'json'},
+        )
+        respuesta.raise_for_status()
+        return json.loads(respuesta.json()['response'])
 
 
 # ============================================
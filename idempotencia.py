@@ -0,0 +1,270 @@
+"""
+Cabecera Idempotency-Key en las rutas de generación
+Club Atlético Central
+
+Con la wifi del campo el navegador reintenta y cada reintento volvía a
+renderizar el PDF o a pedir los nueve dibujos al LLM. Si la petición trae
+Idempotency-Key (un identificador único por acción del usuario):
+
+- Si ya se completó otra con la misma clave en la misma ruta, se devuelve la
+  respuesta guardada (con "Idempotent-Replayed: true").
+- Si está en curso, se espera a que termine (como mucho IDEMPOTENCIA_ESPERA)
+  y se devuelve su respuesta; si no termina a tiempo, 409 con Retry-After.
+  Mientras espera, la petición suelta su turno de admisión (admision.py):
+  un reintento no ocupa una plaza de 'render' o 'ia' sin hacer nada. Si al
+  final tiene que ejecutar la vista, vuelve a esperar turno (o 429).
+- Si la clave ya se usó con otros datos, 422.
+
+Las respuestas se guardan en disco (IDEMPOTENCIA_DIR) y el "en curso" es un
+bloqueo fcntl (bloqueos.py), así que vale para todos los workers de la
+máquina; si el proceso que atiende la original muere, el sistema suelta el
+bloqueo y el reintento la repite. No se guardan los errores 5xx (el
+reintento vuelve a intentarlo) ni los 304.
+
+    IDEMPOTENCIA_DIR=/tmp/...        Carpeta de respuestas guardadas
+    IDEMPOTENCIA_VIGENCIA=86400      Segundos que se guarda cada respuesta
+    IDEMPOTENCIA_ESPERA=30           Segundos como máximo esperando a la original
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+
+from flask import current_app, jsonify, request, session
+
+from cache_lru import hash_contenido
+import admision
+import bloqueos
+import metricas
+
+
+logger = logging.getLogger(__name__)
+
+CABECERA = 'Idempotency-Key'
+LONGITUD_MAXIMA = 255
+
+IDEMPOTENCIA_DIR = os.environ.get('IDEMPOTENCIA_DIR') or os.path.join(tempfile.gettempdir(),
+                                                                      'informes_cac_idempotencia')
+VIGENCIA = float(os.environ.get('IDEMPOTENCIA_VIGENCIA', 24 * 3600))
+ESPERA = float(os.environ.get('IDEMPOTENCIA_ESPERA', 30))
+
+# Cabeceras de la respuesta que no se repiten (las pone cada petición)
+NO_GUARDAR = {'set-cookie', 'date', 'x-request-id', 'server-timing', 'vary'}
+
+
+class Almacen:
+    """Respuestas guardadas por clave, con un bloqueo por clave mientras se generan"""
+
+    def __init__(self, directorio=IDEMPOTENCIA_DIR, vigencia=VIGENCIA, espera=ESPERA):
+        self.directorio = directorio
+        self.vigencia = vigencia
+        self.espera = espera
+
+    def _ruta(self, identificador, extension):
+        return os.path.join(self.directorio, f'{identificador}.{extension}')
+
+    def adquirir(self, identificador, esperar=True):
+        """
+        Espera (como mucho self.espera) a tener la clave para este proceso
+
+        Args:
+            esperar: False para solo probar, sin esperar a otra petición
+
+        Returns:
+            (bloqueo o None si otra petición con la clave sigue en curso,
+             True si había otra petición en curso con la clave)
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        return bloqueos.adquirir(self._ruta(identificador, 'lock'), self.espera if esperar else 0)
+
+    async def adquirir_async(self, identificador, esperar=True):
+        """Versión asíncrona de adquirir (espera sin ocupar un hilo)"""
+        os.makedirs(self.directorio, exist_ok=True)
+        return await bloqueos.adquirir_async(self._ruta(identificador, 'lock'),
+                                             self.espera if esperar else 0)
+
+    def liberar(self, fichero):
+        bloqueos.liberar(fichero)
+
+    def leer(self, identificador):
+        """(huella, estado, cabeceras, cuerpo) de la respuesta guardada, o None"""
+        try:
+            with open(self._ruta(identificador, 'json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['instante'] < time.time() - self.vigencia:
+                return None
+            with open(self._ruta(identificador, 'cuerpo'), 'rb') as f:
+                cuerpo = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta['huella'], meta['estado'], meta['cabeceras'], cuerpo
+
+    def guardar(self, identificador, huella, respuesta):
+        """Guarda la respuesta (el cuerpo primero: el .json indica que está completa)"""
+        respuesta.direct_passthrough = False
+        cabeceras = [(nombre, valor) for nombre, valor in respuesta.headers.items()
+                     if nombre.lower() not in NO_GUARDAR]
+        meta = {'huella': huella, 'estado': respuesta.status_code,
+                'cabeceras': cabeceras, 'instante': time.time()}
+        try:
+            for extension, modo, contenido in (('cuerpo', 'wb', respuesta.get_data()),
+                                               ('json', 'w', json.dumps(meta))):
+                ruta = self._ruta(identificador, extension)
+                with open(f'{ruta}.tmp', modo) as f:
+                    f.write(contenido)
+                os.replace(f'{ruta}.tmp', ruta)
+        except OSError:
+            logger.warning("No se pudo guardar la respuesta idempotente %s", identificador, exc_info=True)
+        self._limpiar()
+
+    def _limpiar(self):
+        """
+        Borra las respuestas caducadas y los .lock antiguos que no estén en uso
+
+        Los .lock solo los borra bloqueos.limpiar, con el bloqueo tomado: si
+        no, otro proceso que lo tuviera abierto bloquearía a la vez que el
+        siguiente, que crearía otro fichero.
+        """
+        limite = time.time() - self.vigencia
+        try:
+            for nombre in os.listdir(self.directorio):
+                ruta = os.path.join(self.directorio, nombre)
+                if not nombre.endswith('.lock') and os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+        except OSError:
+            pass
+        bloqueos.limpiar(self.directorio, self.vigencia)
+
+
+ALMACEN = Almacen()
+
+
+def _peticion():
+    """(identificador, huella) de la petición, o None si no trae clave"""
+    clave = request.headers.get(CABECERA)
+    # Sin fcntl (Windows) la cabecera se ignora
+    if not clave or bloqueos.fcntl is None:
+        return None
+    # Sin sesión la vista responde 401: no se repite nada guardado
+    if not session.get('authenticated'):
+        return None
+    identificador = hash_contenido(request.path, clave)
+    huella = hashlib.sha256(request.get_data()).hexdigest()
+    return identificador, huella
+
+
+def _clave_invalida():
+    clave = request.headers.get(CABECERA)
+    return clave is not None and len(clave) > LONGITUD_MAXIMA
+
+
+def _repetir(guardada, huella, esperada):
+    """Respuesta guardada, o 422 si la clave se usó con otros datos"""
+    huella_guardada, estado, cabeceras, cuerpo = guardada
+    if huella_guardada != huella:
+        metricas.IDEMPOTENCIA_REPETICIONES.inc(ruta=request.path, resultado='conflicto')
+        return jsonify({'success': False,
+                        'error': f'{CABECERA} ya usada con otros datos'}), 422
+    metricas.IDEMPOTENCIA_REPETICIONES.inc(ruta=request.path, resultado='esperada' if esperada else 'repetida')
+    respuesta = current_app.response_class(cuerpo, status=estado, headers=cabeceras)
+    respuesta.headers['Idempotent-Replayed'] = 'true'
+    return respuesta
+
+
+def _en_curso():
+    """409: la original sigue en curso pasado el tiempo de espera"""
+    metricas.IDEMPOTENCIA_REPETICIONES.inc(ruta=request.path, resultado='en_curso')
+    respuesta = jsonify({'success': False,
+                         'error': f'Otra petición con la misma {CABECERA} sigue en curso'})
+    respuesta.status_code = 409
+    respuesta.headers['Retry-After'] = str(max(1, math.ceil(ALMACEN.espera / 10)))
+    return respuesta
+
+
+def _ocupado(limite):
+    """429: la original ha terminado sin respuesta guardada y no hay turno para repetirla"""
+    respuesta = jsonify({'success': False,
+                         'error': 'Servidor ocupado, inténtalo de nuevo en unos segundos'})
+    respuesta.status_code = 429
+    respuesta.headers['Retry-After'] = str(limite.reintentar_en())
+    return respuesta
+
+
+def _guardar_si_procede(identificador, huella, rv):
+    respuesta = current_app.make_response(rv)
+    if respuesta.status_code < 500 and respuesta.status_code != 304:
+        ALMACEN.guardar(identificador, huella, respuesta)
+    return respuesta
+
+
+def idempotente(vista):
+    """
+    Decorador para rutas de generación (síncronas o async) que respeta
+    Idempotency-Key
+
+        @app.route('/generar', methods=['POST'])
+        @idempotencia.idempotente
+        def generar(): ...
+    """
+    if asyncio.iscoroutinefunction(vista):
+        @functools.wraps(vista)
+        async def envoltorio_async(*args, **kwargs):
+            if _clave_invalida():
+                return jsonify({'success': False, 'error': f'{CABECERA} demasiado larga'}), 400
+            peticion = _peticion()
+            if peticion is None:
+                return await vista(*args, **kwargs)
+
+            identificador, huella = peticion
+            limite = None
+            bloqueo, esperada = await ALMACEN.adquirir_async(identificador, esperar=False)
+            if bloqueo is None:
+                # Otra con la clave en curso: se espera sin ocupar turno
+                limite = admision.soltar_turno(request.environ)
+                bloqueo, esperada = await ALMACEN.adquirir_async(identificador)
+                if bloqueo is None:
+                    return _en_curso()
+            try:
+                guardada = ALMACEN.leer(identificador)
+                if guardada is not None:
+                    return _repetir(guardada, huella, esperada)
+                if not await admision.recuperar_turno_async(request.environ, limite):
+                    return _ocupado(limite)
+                return _guardar_si_procede(identificador, huella, await vista(*args, **kwargs))
+            finally:
+                ALMACEN.liberar(bloqueo)
+        return envoltorio_async
+
+    @functools.wraps(vista)
+    def envoltorio(*args, **kwargs):
+        if _clave_invalida():
+            return jsonify({'success': False, 'error': f'{CABECERA} demasiado larga'}), 400
+        peticion = _peticion()
+        if peticion is None:
+            return vista(*args, **kwargs)
+
+        identificador, huella = peticion
+        limite = None
+        bloqueo, esperada = ALMACEN.adquirir(identificador, esperar=False)
+        if bloqueo is None:
+            # Otra con la clave en curso: se espera sin ocupar turno
+            limite = admision.soltar_turno(request.environ)
+            bloqueo, esperada = ALMACEN.adquirir(identificador)
+            if bloqueo is None:
+                return _en_curso()
+        try:
+            guardada = ALMACEN.leer(identificador)
+            if guardada is not None:
+                return _repetir(guardada, huella, esperada)
+            if not admision.recuperar_turno(request.environ, limite):
+                return _ocupado(limite)
+            return _guardar_si_procede(identificador, huella, vista(*args, **kwargs))
+        finally:
+            ALMACEN.liberar(bloqueo)
+    return envoltorio
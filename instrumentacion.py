@@ -0,0 +1,103 @@
+"""
+Desglose del tiempo de cada petición por etapas
+Club Atlético Central
+
+Las etapas (parseo del JSON, llamadas al LLM, construcción del story,
+doc.build, E/S, codificación...) se acumulan en una variable de contexto
+durante la petición y se devuelven en la cabecera Server-Timing, que las
+herramientas de desarrollo del navegador muestran en la pestaña de red.
+
+Fuera de una petición (scripts, benchmarks) las etapas no hacen nada.
+
+Cada petición tiene además un ID (el X-Request-ID del cliente si es válido o
+uno nuevo) que se devuelve en la respuesta y sirve para localizar su perfil
+y sus trazas.
+"""
+
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import trazas
+
+
+# Etapa -> [segundos acumulados, veces, descripción] de la petición en curso
+_tiempos = ContextVar('tiempos_peticion', default=None)
+_id_peticion = ContextVar('id_peticion', default=None)
+
+# IDs aceptados del cliente (también se usan como nombre de fichero)
+PATRON_ID_PETICION = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+
+def nuevo_id_peticion(propuesto=None):
+    """Fija el ID de la petición actual: el propuesto si es válido o uno nuevo"""
+    if not propuesto or not PATRON_ID_PETICION.match(propuesto):
+        propuesto = uuid.uuid4().hex
+    _id_peticion.set(propuesto)
+    return propuesto
+
+
+def id_peticion():
+    """ID de la petición en curso (None fuera de una petición)"""
+    return _id_peticion.get()
+
+
+def iniciar():
+    """Empieza a acumular etapas para la petición actual"""
+    _tiempos.set({})
+
+
+def finalizar():
+    """Termina la medición y devuelve las etapas acumuladas"""
+    tiempos = _tiempos.get()
+    _tiempos.set(None)
+    return tiempos or {}
+
+
+def anotar(nombre, segundos, descripcion=None):
+    """Suma la duración de una etapa (si hay una petición en curso)"""
+    tiempos = _tiempos.get()
+    if tiempos is None:
+        return
+    entrada = tiempos.setdefault(nombre, [0.0, 0, None])
+    entrada[0] += segundos
+    entrada[1] += 1
+    if descripcion:
+        entrada[2] = descripcion
+
+
+@contextmanager
+def etapa(nombre, descripcion=None):
+    """Mide el bloque como la etapa `nombre` (y como span si se está trazando)"""
+    inicio = time.perf_counter()
+    try:
+        with trazas.span(nombre):
+            yield
+    finally:
+        anotar(nombre, time.perf_counter() - inicio, descripcion)
+
+
+def cabecera_server_timing(tiempos, total=None):
+    """
+    Formatea las etapas como valor de la cabecera Server-Timing
+
+    Args:
+        tiempos: Resultado de finalizar()
+        total: Duración total de la petición en segundos (opcional)
+
+    Returns:
+        Texto del tipo 'parse;dur=0.4, llm-groq;dur=812.3;desc="9 llamadas", total;dur=950.1'
+    """
+    partes = []
+    for nombre, (segundos, veces, descripcion) in tiempos.items():
+        if not descripcion and veces > 1:
+            descripcion = f'{veces} llamadas'
+        parte = f'{nombre};dur={segundos * 1000:.1f}'
+        if descripcion:
+            parte += f';desc="{descripcion}"'
+        partes.append(parte)
+    if total is not None:
+        partes.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(partes)
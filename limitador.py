@@ -0,0 +1,302 @@
+"""
+Límite de ritmo de las llamadas a cada proveedor de IA
+Club Atlético Central
+
+Los planes gratuitos de Groq y Gemini limitan las peticiones por minuto (RPM)
+y los tokens por minuto (TPM). Si se pasa, el proveedor devuelve 429 y una
+ráfaga de dibujos acaba en dibujos por defecto. Aquí cada proveedor tiene dos
+cubetas de fichas (peticiones y tokens) que se rellenan de forma continua;
+una llamada sale cuando hay fichas para ella y, si no, espera lo justo para
+que se repongan. Así las llamadas que sobran se van soltando al ritmo del
+plan en lugar de fallar.
+
+Los tokens de una llamada se estiman antes de enviarla: el texto del prompt
+(unos 3,5 caracteres por token) más los max_tokens de la respuesta, que es lo
+que el proveedor descuenta al recibirla.
+
+Hay dos carriles: INTERACTIVA (analizar notas, plan táctico: el entrenador
+está esperando) y LOTE (los nueve dibujos de un informe). Mientras haya
+llamadas interactivas esperando, las de lote no salen.
+
+Configuración por clave de API (0 = sin límite; con varias claves del mismo
+proveedor en pool_claves.py se multiplica por su capacidad conjunta, ver
+PoolClaves.capacidad). Los límites son
+por proceso, así que con varios workers hay que repartir la cuota del plan
+entre ellos:
+
+    LIMITE_GROQ_RPM=30      LIMITE_GROQ_TPM=12000
+    LIMITE_GEMINI_RPM=15    LIMITE_GEMINI_TPM=1000000
+    LIMITE_CLAUDE_RPM=0     LIMITE_CLAUDE_TPM=0
+    LIMITE_LLM_ESPERA=60    Espera máxima en segundos antes de desistir
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+import metricas
+
+
+INTERACTIVA = 'interactiva'
+LOTE = 'lote'
+PRIORIDADES = (INTERACTIVA, LOTE)
+
+CARACTERES_POR_TOKEN = 3.5
+
+# Proveedor -> (RPM, TPM) de su plan gratuito
+POR_DEFECTO = {
+    'groq': (30, 12000),
+    'gemini': (15, 1_000_000),
+    'claude': (0, 0),
+    'ollama': (0, 0),
+}
+
+ESPERA_MAXIMA = float(os.environ.get('LIMITE_LLM_ESPERA', 60))
+
+
+class EsperaAgotada(RuntimeError):
+    """La llamada no ha conseguido turno dentro de la espera máxima"""
+
+
+def estimar_tokens(texto, max_tokens=0):
+    """Tokens que el proveedor descontará por una llamada (prompt + respuesta máxima)"""
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN) + max_tokens
+
+
+class _EsperaHilo:
+    """Llamada síncrona esperando turno en un hilo"""
+
+    def __init__(self, tokens, prioridad):
+        self.tokens = tokens
+        self.prioridad = prioridad
+        self._evento = threading.Event()
+
+    def avisar(self):
+        self._evento.set()
+
+    def dormir(self, segundos):
+        self._evento.wait(segundos)
+        self._evento.clear()
+
+
+class _EsperaAsync:
+    """Llamada asíncrona esperando turno en un bucle de eventos"""
+
+    def __init__(self, tokens, prioridad):
+        self.tokens = tokens
+        self.prioridad = prioridad
+        self._bucle = asyncio.get_running_loop()
+        self._evento = asyncio.Event()
+
+    def avisar(self):
+        try:
+            self._bucle.call_soon_threadsafe(self._evento.set)
+        except RuntimeError:
+            # Bucle cerrado: esa llamada ya no espera a nadie
+            pass
+
+    async def dormir(self, segundos):
+        try:
+            await asyncio.wait_for(self._evento.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
+        self._evento.clear()
+
+
+class Limitador:
+    """
+    Cubetas de peticiones y tokens de un proveedor, con carriles de prioridad
+
+    Solo la primera llamada del carril más prioritario comprueba las cubetas
+    y duerme hasta que se repongan; las demás duermen hasta que les toque ser
+    la primera. Cuando una sale, avisa a la siguiente.
+    """
+
+    def __init__(self, proveedor, rpm, tpm):
+        self.proveedor = proveedor
+        self.rpm_clave = rpm
+        self.tpm_clave = tpm
+        self.rpm = rpm
+        self.tpm = tpm
+        # Capacidad de un minuto: se admite la misma ráfaga que el proveedor
+        self.peticiones = float(rpm)
+        self.tokens = float(tpm)
+        self._ultima = time.monotonic()
+        self._colas = {prioridad: deque() for prioridad in PRIORIDADES}
+        self._lock = threading.Lock()
+
+    @property
+    def activo(self):
+        return self.rpm > 0 or self.tpm > 0
+
+    def escalar(self, factor):
+        """
+        Ajusta el ritmo a las claves del proveedor (cada una tiene su cuota)
+
+        Args:
+            factor: Cuotas de una clave que suman todas juntas (el número de
+                claves si tienen el mismo peso)
+        """
+        with self._lock:
+            self._reponer()
+            self.peticiones += self.rpm_clave * factor - self.rpm
+            self.tokens += self.tpm_clave * factor - self.tpm
+            self.rpm = self.rpm_clave * factor
+            self.tpm = self.tpm_clave * factor
+
+    def en_cola(self):
+        return sum(len(cola) for cola in self._colas.values())
+
+    def _reponer(self):
+        ahora = time.monotonic()
+        transcurrido = ahora - self._ultima
+        self._ultima = ahora
+        self.peticiones = min(self.rpm, self.peticiones + transcurrido * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + transcurrido * self.tpm / 60)
+
+    def _primera(self):
+        for prioridad in PRIORIDADES:
+            if self._colas[prioridad]:
+                return self._colas[prioridad][0]
+        return None
+
+    def _turno(self, espera):
+        """
+        Intenta sacar la llamada (con el lock tomado)
+
+        Returns:
+            0 si sale ya, segundos hasta que haya fichas si es la primera,
+            o None si hay otras delante
+        """
+        if self._primera() is not espera:
+            return None
+        self._reponer()
+        # Una llamada mayor que la cubeta entera saldría con la cubeta llena
+        tokens = min(espera.tokens, self.tpm)
+        falta = 0.0
+        if self.rpm > 0 and self.peticiones < 1:
+            falta = (1 - self.peticiones) * 60 / self.rpm
+        if self.tpm > 0 and self.tokens < tokens:
+            falta = max(falta, (tokens - self.tokens) * 60 / self.tpm)
+        if falta > 0:
+            return falta
+
+        if self.rpm > 0:
+            self.peticiones -= 1
+        if self.tpm > 0:
+            self.tokens -= tokens
+        self._colas[espera.prioridad].popleft()
+        siguiente = self._primera()
+        if siguiente is not None:
+            siguiente.avisar()
+        return 0
+
+    def _encolar(self, espera):
+        with self._lock:
+            self._colas[espera.prioridad].append(espera)
+            return self._turno(espera)
+
+    def _abandonar(self, espera):
+        with self._lock:
+            self._colas[espera.prioridad].remove(espera)
+            siguiente = self._primera()
+            if siguiente is not None:
+                siguiente.avisar()
+
+    def _intentar(self, espera):
+        with self._lock:
+            return self._turno(espera)
+
+    def esperar_turno(self, tokens, prioridad=LOTE):
+        """
+        Bloquea el hilo hasta que la llamada quepa en el ritmo del proveedor
+
+        Returns:
+            Segundos esperados
+
+        Raises:
+            EsperaAgotada si pasa ESPERA_MAXIMA sin turno
+        """
+        inicio = time.monotonic()
+        espera = _EsperaHilo(tokens, prioridad)
+        falta = self._encolar(espera)
+        while falta != 0:
+            restante = ESPERA_MAXIMA - (time.monotonic() - inicio)
+            if restante <= 0:
+                self._abandonar(espera)
+                raise EsperaAgotada(f"Límite de {self.proveedor}: sin turno tras {ESPERA_MAXIMA:g} s")
+            espera.dormir(min(restante, falta) if falta else restante)
+            falta = self._intentar(espera)
+        return self._registrar(prioridad, time.monotonic() - inicio)
+
+    async def esperar_turno_async(self, tokens, prioridad=LOTE):
+        """Versión asíncrona de esperar_turno: espera sin bloquear el bucle"""
+        inicio = time.monotonic()
+        espera = _EsperaAsync(tokens, prioridad)
+        falta = self._encolar(espera)
+        try:
+            while falta != 0:
+                restante = ESPERA_MAXIMA - (time.monotonic() - inicio)
+                if restante <= 0:
+                    raise EsperaAgotada(f"Límite de {self.proveedor}: sin turno tras {ESPERA_MAXIMA:g} s")
+                await espera.dormir(min(restante, falta) if falta else restante)
+                falta = self._intentar(espera)
+        except BaseException:
+            # Agotada o cancelada (el cliente se ha ido): deja sitio al resto
+            if falta != 0:
+                self._abandonar(espera)
+            raise
+        return self._registrar(prioridad, time.monotonic() - inicio)
+
+    def _registrar(self, prioridad, segundos):
+        metricas.LLM_LIMITE_ESPERA.observar(segundos, proveedor=self.proveedor, prioridad=prioridad)
+        return segundos
+
+
+def _configuracion(proveedor):
+    rpm, tpm = POR_DEFECTO[proveedor]
+    prefijo = f'LIMITE_{proveedor.upper()}_'
+    return (int(os.environ.get(prefijo + 'RPM', rpm)),
+            int(os.environ.get(prefijo + 'TPM', tpm)))
+
+
+LIMITADORES = {proveedor: Limitador(proveedor, *_configuracion(proveedor)) for proveedor in POR_DEFECTO}
+
+
+def _limitador(proveedor):
+    limitador = LIMITADORES.get(proveedor)
+    return limitador if limitador is not None and limitador.activo else None
+
+
+@contextmanager
+def turno(proveedor, texto, max_tokens=0, prioridad=LOTE):
+    """
+    Espera turno para una llamada al proveedor (en un hilo)
+
+        with limitador.turno('groq', prompt, 2000, limitador.INTERACTIVA):
+            ...llamada...
+    """
+    limitador = _limitador(proveedor)
+    if limitador is not None:
+        limitador.esperar_turno(estimar_tokens(texto, max_tokens), prioridad)
+    yield
+
+
+@asynccontextmanager
+async def turno_async(proveedor, texto, max_tokens=0, prioridad=LOTE):
+    """Versión asíncrona de turno"""
+    limitador = _limitador(proveedor)
+    if limitador is not None:
+        await limitador.esperar_turno_async(estimar_tokens(texto, max_tokens), prioridad)
+    yield
+
+
+@metricas.registrar_colector
+def _colector_limitador():
+    for proveedor, limitador in LIMITADORES.items():
+        if limitador.activo:
+            metricas.LLM_LIMITE_EN_COLA.fijar(limitador.en_cola(), proveedor=proveedor)
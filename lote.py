@@ -0,0 +1,198 @@
+"""
+Generación de informes v2 en lote (todos los rivales de la liga)
+Club Atlético Central
+
+Recibe una lista de rivales (los mismos datos que /generar_v2), genera si se
+pide los dibujos de IA de cada uno y renderiza los PDFs en un pool de hilos.
+El ZIP se va enviando según termina cada PDF, sin esperar al último; un
+rival que falla no para el lote: su error va en resumen.json, al final del
+ZIP, junto con el estado de cada uno y los dibujos que llevan el dibujo por
+defecto porque falló la IA.
+
+Los hilos solapan sobre todo las esperas al LLM (el render de ReportLab usa
+la CPU y no se paraleliza con hilos); las llamadas siguen pasando por el
+límite de ritmo del proveedor.
+
+    POST /generar_lote  {"informes": [...], "dibujos": true, "provider": "groq"}
+
+    python lote.py rivales.json -o informes.zip --dibujos
+    python lote.py carpeta_con_json/ -o informes.zip
+
+Variables de entorno:
+    LOTE_HILOS      Rivales en paralelo (por defecto 4)
+    LOTE_MAXIMO     Rivales por petición (por defecto 40)
+"""
+
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from generar_informe_v2 import generar_informe_v2_pdf
+from ia_analyzer import IAAnalyzer
+import metricas
+import trazas
+
+
+logger = logging.getLogger(__name__)
+
+HILOS = int(os.environ.get('LOTE_HILOS', 4))
+MAXIMO = int(os.environ.get('LOTE_MAXIMO', 40))
+
+
+def nombre_item(datos, indice):
+    """Nombre del PDF en el ZIP: <nn>_<Rival>.pdf (el índice evita repetidos)"""
+    rival = str(datos.get('nombre_rival') or 'Rival').strip().replace(' ', '_').replace('/', '_')
+    return f"{indice + 1:02d}_{rival}.pdf"
+
+
+def generar_item(datos, dibujos=False, provider='groq'):
+    """
+    PDF v2 de un rival
+
+    Args:
+        datos: datos del informe (como en /generar_v2)
+        dibujos: generar los dibujos de IA si los datos no los traen
+
+    Returns:
+        (bytes del PDF, lista de dibujos con el dibujo por defecto)
+    """
+    por_defecto = []
+    dibujos_ia = datos.get('dibujos_ia')
+    if dibujos and not dibujos_ia:
+        dibujos_ia = IAAnalyzer(provider=provider).generar_todos_los_dibujos(datos, por_defecto)
+
+    buffer = io.BytesIO()
+    with metricas.PDF_RENDER.cronometrar(generador='informe_v2'), \
+            trazas.span('render', generador='informe_v2'):
+        generar_informe_v2_pdf(datos, buffer, dibujos_ia=dibujos_ia, deterministico=True)
+    return buffer.getvalue(), por_defecto
+
+
+def generar_lote(informes, dibujos=False, provider='groq', hilos=HILOS):
+    """
+    Genera los PDFs de varios rivales en paralelo
+
+    Yields:
+        (nombre, pdf, error, por_defecto) según termina cada uno, con pdf None
+        si falló
+    """
+    generar = trazas.propagar(generar_item)
+    ejecutor = ThreadPoolExecutor(max_workers=max(1, hilos), thread_name_prefix='lote')
+    try:
+        futuros = {
+            ejecutor.submit(generar, datos, dibujos, provider): nombre_item(datos, i)
+            for i, datos in enumerate(informes)
+        }
+        for futuro in as_completed(futuros):
+            nombre = futuros[futuro]
+            try:
+                pdf, por_defecto = futuro.result()
+            except Exception as e:
+                logger.exception("Error generando %s del lote", nombre)
+                yield nombre, None, str(e), []
+            else:
+                yield nombre, pdf, None, por_defecto
+    finally:
+        # Si el cliente se va a mitad, los rivales pendientes no se generan
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Salida:
+    """Fichero de solo escritura que acumula lo escrito para ir enviándolo"""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+def zip_en_streaming(resultados):
+    """
+    ZIP de los resultados de generar_lote, por partes según llegan
+
+    Yields:
+        bytes del ZIP (un PDF completo en cada parte, más el cierre)
+    """
+    salida = _Salida()
+    resumen = []
+    inicio = time.perf_counter()
+    # Sin seek: zipfile escribe los tamaños detrás de cada fichero
+    with zipfile.ZipFile(salida, 'w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        for nombre, pdf, error, por_defecto in resultados:
+            if pdf is not None:
+                archivo.writestr(nombre, pdf)
+                resumen.append({'archivo': nombre, 'success': True, 'bytes': len(pdf),
+                                'dibujos_por_defecto': por_defecto})
+            else:
+                resumen.append({'archivo': nombre, 'success': False, 'error': error})
+            yield salida.vaciar()
+
+        archivo.writestr('resumen.json', json.dumps({
+            'total': len(resumen),
+            'correctos': sum(1 for r in resumen if r['success']),
+            'con_dibujos_por_defecto': sum(1 for r in resumen if r.get('dibujos_por_defecto')),
+            'segundos': round(time.perf_counter() - inicio, 2),
+            'informes': sorted(resumen, key=lambda r: r['archivo']),
+        }, ensure_ascii=False, indent=2))
+    yield salida.vaciar()
+
+
+def cargar_informes(ruta):
+    """Lista de datos de rivales de un JSON con una lista o de una carpeta de JSON"""
+    if os.path.isdir(ruta):
+        informes = []
+        for nombre in sorted(os.listdir(ruta)):
+            if nombre.endswith('.json'):
+                with open(os.path.join(ruta, nombre), encoding='utf-8') as f:
+                    informes.append(json.load(f))
+        return informes
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+    return datos.get('informes', []) if isinstance(datos, dict) else datos
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Genera en un ZIP los informes v2 de varios rivales')
+    parser.add_argument('entrada', help='JSON con una lista de rivales o carpeta con un JSON por rival')
+    parser.add_argument('-o', '--salida', default='informes_lote.zip', help='ZIP de salida')
+    parser.add_argument('--dibujos', action='store_true', help='Generar los dibujos de IA que falten')
+    parser.add_argument('--provider', default='groq', help='Proveedor de IA para los dibujos')
+    parser.add_argument('--hilos', type=int, default=HILOS, help='Rivales en paralelo')
+    args = parser.parse_args()
+
+    informes = cargar_informes(args.entrada)
+    if not informes:
+        parser.error(f'{args.entrada} no tiene rivales')
+
+    inicio = time.perf_counter()
+    resultados = []
+
+    def con_progreso():
+        for nombre, pdf, error, por_defecto in generar_lote(informes, args.dibujos, args.provider, args.hilos):
+            resultados.append(error is None)
+            print(f"{'✅' if error is None else '❌'} {nombre}" + (f": {error}" if error else '')
+                  + (f" (dibujos por defecto: {', '.join(por_defecto)})" if por_defecto else ''))
+            yield nombre, pdf, error, por_defecto
+
+    with open(args.salida, 'wb') as f:
+        for parte in zip_en_streaming(con_progreso()):
+            f.write(parte)
+
+    print(f"\n{sum(resultados)}/{len(resultados)} informes en {args.salida} "
+          f"({time.perf_counter() - inicio:.1f} s)")
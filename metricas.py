@@ -0,0 +1,419 @@
+"""
+Métricas de la webapp en formato de texto de Prometheus
+Club Atlético Central
+
+Registro mínimo de contadores, gauges e histogramas con etiquetas, sin
+dependencias externas.
+
+Con varios workers de gunicorn cada proceso tiene sus propios valores: cada
+uno vuelca una instantánea en METRICAS_DIR (<pid>.json) y /metrics suma las
+de todos los procesos, de modo que da igual qué worker atienda el scrape.
+Las instantáneas se vuelcan tras cada petición, cada INTERVALO_VOLCADO en un
+hilo de fondo (para los gauges de un worker sin tráfico) y al salir del
+proceso. De los procesos que ya no existen solo cuentan los contadores e
+histogramas: sus gauges (peticiones en curso, en cola...) ya no valen.
+
+Métricas expuestas:
+- Peticiones y latencia por ruta de Flask
+- Tiempo de render y tamaño de PDF por generador
+- Latencia de las llamadas al LLM por proveedor y fase
+- Dibujos por defecto usados cuando la IA falla
+- Aciertos/fallos de las cachés (cache_lru.CACHES)
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentacion import anotar
+import trazas
+
+
+METRICAS_DIR = os.environ.get('METRICAS_DIR') or os.path.join(tempfile.gettempdir(), 'informes_cac_metricas')
+
+# Instantáneas más antiguas que esto (workers muertos hace tiempo) se descartan
+RETENCION_SEGUNDOS = 24 * 3600
+
+# Mínimo entre dos volcados de la instantánea de un mismo proceso
+INTERVALO_VOLCADO = 2.0
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BUCKETS_LLM = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+BUCKETS_BYTES = (2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+
+# Nombre -> métrica de este proceso
+REGISTRO = {}
+
+_lock = threading.Lock()
+_lock_volcado = threading.Lock()
+_ultimo_volcado = 0.0
+_pid_hilo_volcado = None
+_colectores = []
+
+
+class _Metrica:
+    """Base común: valores indexados por la tupla de etiquetas"""
+
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores = {}
+        REGISTRO[nombre] = self
+
+    def _clave(self, etiquetas):
+        return tuple(str(etiquetas.get(e, '')) for e in self.etiquetas)
+
+    def serializar(self):
+        with _lock:
+            valores = [[list(k), list(v) if isinstance(v, list) else v]
+                       for k, v in self._valores.items()]
+        return {'tipo': self.tipo, 'ayuda': self.ayuda, 'etiquetas': list(self.etiquetas),
+                'valores': valores}
+
+
+class Contador(_Metrica):
+    tipo = 'counter'
+
+    def inc(self, cantidad=1, **etiquetas):
+        clave = self._clave(etiquetas)
+        with _lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def fijar(self, valor, **etiquetas):
+        """Fija el total acumulado (para contadores que lleva otro módulo)"""
+        with _lock:
+            self._valores[self._clave(etiquetas)] = valor
+
+
+class Gauge(_Metrica):
+    tipo = 'gauge'
+
+    def fijar(self, valor, **etiquetas):
+        with _lock:
+            self._valores[self._clave(etiquetas)] = valor
+
+
+class Histograma(_Metrica):
+    tipo = 'histogram'
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(buckets)
+
+    def observar(self, valor, **etiquetas):
+        clave = self._clave(etiquetas)
+        with _lock:
+            # [cuenta por bucket..., +Inf, suma]
+            datos = self._valores.get(clave)
+            if datos is None:
+                datos = self._valores[clave] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    datos[i] += 1
+                    break
+            else:
+                datos[len(self.buckets)] += 1
+            datos[-1] += valor
+
+    @contextmanager
+    def cronometrar(self, **etiquetas):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **etiquetas)
+
+    def serializar(self):
+        datos = super().serializar()
+        datos['buckets'] = list(self.buckets)
+        return datos
+
+
+# =============================================================================
+# MÉTRICAS DE LA APP
+# =============================================================================
+HTTP_PETICIONES = Contador('informes_http_peticiones_total', 'Peticiones HTTP atendidas',
+                           ('ruta', 'metodo', 'estado'))
+HTTP_DURACION = Histograma('informes_http_duracion_segundos', 'Latencia de las peticiones HTTP',
+                           ('ruta', 'metodo'))
+PDF_RENDER = Histograma('informes_pdf_render_segundos', 'Tiempo de generación de un PDF',
+                        ('generador',))
+PDF_TAMANO = Histograma('informes_pdf_tamano_bytes', 'Tamaño de los PDF generados',
+                        ('generador',), buckets=BUCKETS_BYTES)
+LLM_DURACION = Histograma('informes_llm_duracion_segundos', 'Latencia de las llamadas al LLM',
+                          ('proveedor', 'fase'), buckets=BUCKETS_LLM)
+LLM_LLAMADAS = Contador('informes_llm_llamadas_total', 'Llamadas al LLM por resultado',
+                        ('proveedor', 'fase', 'resultado'))
+DIBUJOS_POR_DEFECTO = Contador('informes_dibujos_por_defecto_total',
+                               'Dibujos por defecto usados porque la IA falló', ('fase', 'tipo'))
+CACHE_ACIERTOS = Contador('informes_cache_aciertos_total', 'Aciertos de caché', ('cache',))
+CACHE_FALLOS = Contador('informes_cache_fallos_total', 'Fallos de caché', ('cache',))
+CACHE_ENTRADAS = Gauge('informes_cache_entradas', 'Entradas en caché (suma de procesos)', ('cache',))
+ADMISION_EN_CURSO = Gauge('informes_admision_en_curso',
+                          'Peticiones en curso por clase de ruta (suma de procesos)', ('clase',))
+ADMISION_EN_COLA = Gauge('informes_admision_en_cola',
+                         'Peticiones esperando turno por clase de ruta (suma de procesos)', ('clase',))
+ADMISION_LIMITE = Gauge('informes_admision_limite',
+                        'Peticiones simultáneas permitidas por clase de ruta (suma de procesos)', ('clase',))
+ADMISION_RECHAZOS = Contador('informes_admision_rechazos_total',
+                             'Peticiones rechazadas con 429 por clase de ruta', ('clase',))
+ADMISION_ESPERA = Histograma('informes_admision_espera_segundos',
+                             'Espera en cola antes de atender la petición', ('clase',))
+LLM_LIMITE_ESPERA = Histograma('informes_llm_limite_espera_segundos',
+                               'Espera por el límite de ritmo del proveedor antes de llamar al LLM',
+                               ('proveedor', 'prioridad'), BUCKETS_LLM)
+LLM_LIMITE_EN_COLA = Gauge('informes_llm_limite_en_cola',
+                           'Llamadas al LLM esperando turno por proveedor (suma de procesos)', ('proveedor',))
+LLM_CLAVE_LLAMADAS = Contador('informes_llm_clave_llamadas_total',
+                              'Llamadas al LLM por clave de API y resultado', ('proveedor', 'clave', 'resultado'))
+LLM_CLAVES = Gauge('informes_llm_claves', 'Claves de API configuradas por proveedor (suma de procesos)',
+                   ('proveedor',))
+LLM_CLAVES_ENFRIADAS = Gauge('informes_llm_claves_enfriadas',
+                             'Claves de API apartadas por límite o error (suma de procesos)', ('proveedor',))
+COALESCENCIA_COMPARTIDAS = Contador('informes_coalescencia_compartidas_total',
+                                    'Llamadas al LLM ahorradas porque otra idéntica estaba en vuelo',
+                                    ('origen',))
+IDEMPOTENCIA_REPETICIONES = Contador('informes_idempotencia_repeticiones_total',
+                                     'Peticiones con Idempotency-Key resueltas sin repetir el trabajo',
+                                     ('ruta', 'resultado'))
+
+
+@contextmanager
+def cronometrar_llm(proveedor, fase):
+    """
+    Mide una llamada al LLM y cuenta si terminó bien o con error
+
+    La duración también se suma a la etapa llm-<proveedor> de Server-Timing
+    y la llamada queda como span (intento con ese proveedor) en la traza.
+    """
+    inicio = time.perf_counter()
+    resultado = 'error'
+    try:
+        with trazas.span(f'llm {proveedor}', trazas.KIND_CLIENT, proveedor=proveedor, fase=fase):
+            yield
+        resultado = 'ok'
+    finally:
+        duracion = time.perf_counter() - inicio
+        LLM_DURACION.observar(duracion, proveedor=proveedor, fase=fase)
+        anotar(f'llm-{proveedor}', duracion)
+        LLM_LLAMADAS.inc(proveedor=proveedor, fase=fase, resultado=resultado)
+
+
+def registrar_colector(funcion):
+    """Registra una función que actualiza métricas justo antes de exportarlas"""
+    _colectores.append(funcion)
+    return funcion
+
+
+@registrar_colector
+def _colector_caches():
+    from cache_lru import CACHES
+    for nombre, cache in list(CACHES.items()):
+        CACHE_ACIERTOS.fijar(cache.aciertos, cache=nombre)
+        CACHE_FALLOS.fijar(cache.fallos, cache=nombre)
+        CACHE_ENTRADAS.fijar(len(cache), cache=nombre)
+
+
+# =============================================================================
+# INSTANTÁNEAS ENTRE PROCESOS
+# =============================================================================
+def instantanea():
+    """Valores actuales de este proceso, serializables a JSON"""
+    for colector in _colectores:
+        try:
+            colector()
+        except Exception:
+            pass
+    return {nombre: metrica.serializar() for nombre, metrica in list(REGISTRO.items())}
+
+
+def iniciar_volcado():
+    """
+    Hilo que vuelca la instantánea de este proceso cada INTERVALO_VOLCADO, y
+    volcado final al salir. Una vez por proceso (tras el fork, en cada worker).
+    """
+    global _pid_hilo_volcado
+    with _lock_volcado:
+        if _pid_hilo_volcado == os.getpid():
+            return
+        _pid_hilo_volcado = os.getpid()
+
+    def bucle():
+        while True:
+            time.sleep(INTERVALO_VOLCADO)
+            volcar(forzar=True)
+
+    threading.Thread(target=bucle, name='metricas-volcado', daemon=True).start()
+    atexit.register(volcar, forzar=True)
+
+
+def volcar(forzar=False):
+    """Escribe la instantánea de este proceso (como mucho cada INTERVALO_VOLCADO)"""
+    global _ultimo_volcado
+    if _pid_hilo_volcado != os.getpid():
+        iniciar_volcado()
+    with _lock_volcado:
+        ahora = time.monotonic()
+        if not forzar and ahora - _ultimo_volcado < INTERVALO_VOLCADO:
+            return
+        _ultimo_volcado = ahora
+
+        try:
+            os.makedirs(METRICAS_DIR, exist_ok=True)
+            destino = os.path.join(METRICAS_DIR, f'{os.getpid()}.json')
+            temporal = f'{destino}.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(instantanea(), f)
+            os.replace(temporal, destino)
+        except OSError:
+            pass
+
+
+def _proceso_vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _leer_instantaneas():
+    """
+    Instantáneas de todos los procesos (la propia, siempre actualizada)
+
+    Las de procesos que ya no existen, sin sus gauges.
+    """
+    propias = instantanea()
+    resultado = [propias]
+    propio = f'{os.getpid()}.json'
+    limite = time.time() - RETENCION_SEGUNDOS
+
+    try:
+        ficheros = os.listdir(METRICAS_DIR)
+    except OSError:
+        return resultado
+
+    for fichero in ficheros:
+        if not fichero.endswith('.json') or fichero == propio:
+            continue
+        ruta = os.path.join(METRICAS_DIR, fichero)
+        try:
+            if os.path.getmtime(ruta) < limite:
+                os.remove(ruta)
+                continue
+            with open(ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+            if not _proceso_vivo(int(fichero[:-len('.json')])):
+                datos = {nombre: m for nombre, m in datos.items() if m['tipo'] != 'gauge'}
+            resultado.append(datos)
+        except (OSError, ValueError):
+            continue
+    return resultado
+
+
+def reiniciar():
+    """Pone a cero las métricas de este proceso (tras la precarga en el maestro)"""
+    with _lock:
+        for metrica in REGISTRO.values():
+            metrica._valores.clear()
+
+
+def limpiar_instantaneas():
+    """Borra las instantáneas de ejecuciones anteriores (al arrancar el servidor)"""
+    try:
+        for fichero in os.listdir(METRICAS_DIR):
+            os.remove(os.path.join(METRICAS_DIR, fichero))
+    except OSError:
+        pass
+
+
+def _combinar(instantaneas):
+    """Suma los valores de todas las instantáneas por métrica y etiquetas"""
+    combinadas = {}
+    for datos in instantaneas:
+        for nombre, metrica in datos.items():
+            destino = combinadas.setdefault(nombre, dict(metrica, valores={}))
+            for etiquetas, valor in metrica['valores']:
+                clave = tuple(etiquetas)
+                previo = destino['valores'].get(clave)
+                if previo is None:
+                    destino['valores'][clave] = list(valor) if isinstance(valor, list) else valor
+                elif isinstance(valor, list):
+                    destino['valores'][clave] = [a + b for a, b in zip(previo, valor)]
+                else:
+                    destino['valores'][clave] = previo + valor
+    return combinadas
+
+
+# =============================================================================
+# FORMATO DE TEXTO
+# =============================================================================
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas_texto(nombres, valores, extra=None):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _numero(valor):
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor) if isinstance(valor, float) else str(valor)
+
+
+_LE_INF = 'le="+Inf"'
+
+
+def exportar():
+    """Texto de /metrics con los valores sumados de todos los procesos"""
+    volcar(forzar=True)
+    combinadas = _combinar(_leer_instantaneas())
+    lineas = []
+
+    for nombre in sorted(combinadas):
+        metrica = combinadas[nombre]
+        etiquetas = metrica['etiquetas']
+        lineas.append(f"# HELP {nombre} {metrica['ayuda']}")
+        lineas.append(f"# TYPE {nombre} {metrica['tipo']}")
+
+        for clave in sorted(metrica['valores']):
+            valor = metrica['valores'][clave]
+            if metrica['tipo'] != 'histogram':
+                lineas.append(f"{nombre}{_etiquetas_texto(etiquetas, clave)} {_numero(valor)}")
+                continue
+
+            acumulado = 0
+            for limite, cuenta in zip(metrica['buckets'], valor):
+                acumulado += cuenta
+                le = f'le="{_numero(float(limite))}"'
+                lineas.append(f"{nombre}_bucket{_etiquetas_texto(etiquetas, clave, le)} {acumulado}")
+            total = acumulado + valor[len(metrica['buckets'])]
+            lineas.append(f"{nombre}_bucket{_etiquetas_texto(etiquetas, clave, _LE_INF)} {total}")
+            lineas.append(f"{nombre}_sum{_etiquetas_texto(etiquetas, clave)} {_numero(valor[-1])}")
+            lineas.append(f"{nombre}_count{_etiquetas_texto(etiquetas, clave)} {total}")
+
+    # Tasa de aciertos calculada sobre los totales de todos los procesos
+    aciertos = combinadas.get(CACHE_ACIERTOS.nombre, {}).get('valores', {})
+    fallos = combinadas.get(CACHE_FALLOS.nombre, {}).get('valores', {})
+    if aciertos:
+        lineas.append('# HELP informes_cache_tasa_aciertos Aciertos / (aciertos + fallos)')
+        lineas.append('# TYPE informes_cache_tasa_aciertos gauge')
+        for clave in sorted(aciertos):
+            total = aciertos[clave] + fallos.get(clave, 0)
+            tasa = aciertos[clave] / total if total else 0.0
+            lineas.append(f"informes_cache_tasa_aciertos{_etiquetas_texto(('cache',), clave)} {tasa:.4f}")
+
+    return '\n'.join(lineas) + '\n'
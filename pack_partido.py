@@ -0,0 +1,221 @@
+"""
+Pack de partido: informe del rival y plan de partido en una sola petición
+Club Atlético Central
+
+Para cada partido se preparan el informe v2 del rival y el plan de partido,
+que comparten buena parte de los datos. Por separado son dos envíos, dos
+renders y a menudo dos pasadas de IA (/generar_dibujos_ia y
+/generar_sugerencias_plan). El pack lo hace todo de una vez:
+
+- El plan toma del informe los datos comunes que no trae (rival, jornada,
+  fecha y sistema del rival).
+- Los dibujos del informe y las sugerencias del plan se piden a la IA a la
+  vez. Las sugerencias solo rellenan las opciones que el entrenador no ha
+  elegido.
+- Los dos documentos salen en un solo PDF, cada uno con su maquetación, o en
+  un ZIP con los dos PDFs (que son los mismos de /generar_v2 y /generar_plan
+  y comparten su caché).
+
+    POST /generar_pack_partido
+    {
+        "informe": {...},              Datos de /generar_v2 (con o sin dibujos_ia)
+        "plan": {...},                 Campos plan_* de /generar_plan
+        "dibujos": true,               Generar los dibujos si el informe no los trae
+        "sugerencias": true,           Completar el plan con las sugerencias de la IA
+        "datos_rival": {...},          Análisis de /analizar_notas (por defecto, el del informe)
+        "notas_adicionales": "",
+        "provider": "groq",
+        "formato": "pdf"               o "zip"
+    }
+"""
+
+import io
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from generar_informe_v2 import construir_story_v2, MARGENES_V2
+from generar_plan_partido import construir_story_plan, MARGENES_PLAN
+from documento_pdf import construir_documento_compuesto
+from ia_analyzer import IAAnalyzer
+from tactical_options import DEFENSIVA_OPCIONES, OFENSIVA_SALIDA
+import trazas
+
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = ('pdf', 'zip')
+
+# Campo del plan -> campo del informe con el mismo dato
+CAMPOS_COMUNES = {
+    'nombre_rival': 'nombre_rival',
+    'jornada': 'jornada',
+    'fecha': 'fecha',
+    'sistema_rival': 'sistema',
+}
+
+# Campo del plan -> (campo de las sugerencias de la IA, valores válidos)
+SUGERENCIAS = {
+    'plan_defensiva': ('bloque_defensivo_sugerido', DEFENSIVA_OPCIONES),
+    'plan_ofensiva': ('salida_ofensiva_sugerida', OFENSIVA_SALIDA),
+    'plan_transicion_def_atq': ('transicion_def_atq_sugerida',
+                                ('directo', 'elaborado', 'contra_pressing')),
+    'plan_transicion_atq_def': ('transicion_atq_def_sugerida',
+                                ('pressing_inmediato', 'repliegue_intensivo', 'repliegue_selectivo')),
+}
+
+# Bloques de cada fase del informe v2 (clave, nombre en el prompt)
+ATAQUE = (('vs_bloque_alto', 'Contra bloque alto'), ('vs_bloque_medio', 'Contra bloque medio'),
+          ('vs_bloque_bajo', 'Contra bloque bajo'))
+DEFENSA = (('pressing_alto', 'Pressing alto'), ('bloque_medio', 'Bloque medio'),
+           ('bloque_bajo', 'Bloque bajo'))
+
+# Campos de un bloque que pasan al prompt, en este orden
+CAMPOS_FASE = {
+    'estructura': 'Estructura',
+    'triangulos': 'Triángulos',
+    'jugadores_clave': 'Jugadores clave',
+    'zonas_activas': 'Zonas activas',
+    'como_finalizan': 'Cómo finalizan',
+    'jugadores_area': 'Jugadores en el área',
+    'gatillos': 'Gatillos de presión',
+    'compactacion': 'Compactación',
+    'coberturas': 'Coberturas',
+    'organizacion': 'Organización',
+    'marcajes': 'Marcajes',
+    'patrones': 'Patrones',
+    'debilidad': 'Debilidad',
+    'fortaleza': 'Fortaleza',
+}
+
+
+def completar_plan(informe, plan):
+    """Plan con los datos comunes del informe que no trae"""
+    completo = {campo: informe[origen] for campo, origen in CAMPOS_COMUNES.items() if informe.get(origen)}
+    completo.update({campo: valor for campo, valor in plan.items() if valor not in (None, '')})
+    return completo
+
+
+def aplicar_sugerencias(plan, sugerencias):
+    """Rellena las opciones del plan sin elegir con las sugeridas por la IA (si son válidas)"""
+    for campo, (sugerida, validos) in SUGERENCIAS.items():
+        valor = sugerencias.get(sugerida)
+        if not plan.get(campo) and isinstance(valor, str) and valor in validos:
+            plan[campo] = valor
+    return plan
+
+
+def _texto(valor):
+    """Texto de un campo del formulario (las listas, separadas por ';')"""
+    if isinstance(valor, str):
+        return valor.strip()
+    if isinstance(valor, list):
+        return '; '.join(v.strip() for v in valor if isinstance(v, str) and v.strip())
+    return ''
+
+
+def resumen_fase(fase, bloques):
+    """
+    Texto de una fase del informe para el prompt, campo a campo
+
+    Args:
+        fase: informe['ataque'] o informe['defensa']
+        bloques: ATAQUE o DEFENSA (clave y nombre de cada bloque)
+
+    Returns:
+        Una línea por bloque con datos ('' si no hay ninguno)
+    """
+    if not isinstance(fase, dict):
+        return ''
+    lineas = []
+    for clave, nombre in bloques:
+        datos = fase.get(clave)
+        if not isinstance(datos, dict):
+            continue
+        partes = []
+        for campo, etiqueta in CAMPOS_FASE.items():
+            texto = _texto(datos.get(campo))
+            if texto:
+                partes.append(f"{etiqueta}: {texto}")
+        if partes:
+            lineas.append(f"- {nombre}: " + '. '.join(partes))
+    return '\n' + '\n'.join(lineas) if lineas else ''
+
+
+def datos_rival_de_informe(informe):
+    """Datos del rival para las sugerencias, como los devuelve /analizar_notas"""
+    return {
+        'sistema_tactico': informe.get('sistema') or 'No especificado',
+        'ataque_organizado': resumen_fase(informe.get('ataque'), ATAQUE),
+        'defensa_organizada': resumen_fase(informe.get('defensa'), DEFENSA),
+    }
+
+
+def preparar(informe, plan, dibujos=True, sugerencias=True, datos_rival=None,
+             notas_adicionales='', provider='groq'):
+    """
+    Datos de los dos documentos, con los pasos de IA hechos a la vez
+
+    Returns:
+        dict con 'informe', 'plan' (ya completado) y 'dibujos_ia'
+    """
+    plan = completar_plan(informe, plan)
+    dibujos_ia = informe.get('dibujos_ia')
+    analyzer = IAAnalyzer(provider=provider)
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='pack') as ejecutor:
+        futuro_dibujos = futuro_plan = None
+        if dibujos and not dibujos_ia:
+            futuro_dibujos = ejecutor.submit(trazas.propagar(analyzer.generar_todos_los_dibujos), informe)
+        if sugerencias and any(not plan.get(campo) for campo in SUGERENCIAS):
+            futuro_plan = ejecutor.submit(trazas.propagar(analyzer.generar_plan_tactico),
+                                          datos_rival or datos_rival_de_informe(informe),
+                                          notas_adicionales)
+
+        if futuro_plan is not None:
+            resultado = futuro_plan.result()
+            if resultado['success'] and isinstance(resultado.get('data'), dict):
+                aplicar_sugerencias(plan, resultado['data'])
+            else:
+                # El plan se genera igual, con las opciones que haya elegido el entrenador
+                logger.warning("Pack sin sugerencias de IA: %s", resultado.get('error'))
+        if futuro_dibujos is not None:
+            dibujos_ia = futuro_dibujos.result()
+
+    return {'informe': informe, 'plan': plan, 'dibujos_ia': dibujos_ia}
+
+
+def generar_pack_pdf(pack, destino, deterministico=False):
+    """
+    Informe v2 y plan de partido en un PDF
+
+    Args:
+        pack: Resultado de preparar
+        destino: Ruta o buffer donde escribir el PDF
+        deterministico: Mismos datos -> mismos bytes
+    """
+    partes = [
+        ('informe_v2', construir_story_v2(pack['informe'], pack.get('dibujos_ia'),
+                                          deterministico=deterministico), MARGENES_V2),
+        ('plan_partido', construir_story_plan(pack['plan'], deterministico), MARGENES_PLAN),
+    ]
+    construir_documento_compuesto(destino, partes, 'pack_partido', deterministico)
+    logger.debug("Pack de partido generado: %s", destino)
+
+
+def empaquetar_zip(archivos):
+    """
+    ZIP con los PDFs del pack
+
+    Args:
+        archivos: Lista de (nombre, bytes)
+
+    Returns:
+        bytes del ZIP (los mismos para los mismos PDFs: fecha fija en las entradas)
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        for nombre, contenido in archivos:
+            archivo.writestr(zipfile.ZipInfo(nombre, date_time=(1980, 1, 1, 0, 0, 0)), contenido,
+                             compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
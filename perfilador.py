@@ -0,0 +1,190 @@
+"""
+Perfilado bajo demanda de una petición
+Club Atlético Central
+
+Un usuario autenticado puede pedir que una petición concreta se ejecute con
+el perfilador añadiendo la cabecera 'X-Perfilar' o el parámetro '?perfilar=':
+
+- 'cprofile' (o '1'): perfilador determinista; se guarda un .prof de pstats
+  (snakeviz, gprof2dot, `python -m pstats`)
+- 'muestreo': muestreo de la pila cada PERIODO_MUESTREO; se guarda en
+  formato "collapsed" (flamegraph.pl, speedscope, inferno)
+
+El perfil se guarda en PERFILES_DIR con el ID de la petición (cabecera
+X-Request-ID de la respuesta) y se puede descargar en /perfiles/<id>. Solo se
+conservan los MAX_PERFILES más recientes. Con PERFILADOR=0 se desactiva.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+
+PERFILES_DIR = os.environ.get('PERFILES_DIR') or os.path.join(tempfile.gettempdir(), 'informes_cac_perfiles')
+MAX_PERFILES = int(os.environ.get('MAX_PERFILES', 50))
+HABILITADO = os.environ.get('PERFILADOR', '1') != '0'
+PERIODO_MUESTREO = 0.005
+
+MODOS = {'1': 'cprofile', 'cprofile': 'cprofile', 'muestreo': 'muestreo'}
+EXTENSIONES = {'cprofile': '.prof', 'muestreo': '.collapsed'}
+
+# Solo un perfil a la vez por proceso: cProfile no admite dos activos
+_lock_activo = threading.Lock()
+
+
+def modo_solicitado(cabeceras, parametros):
+    """Devuelve el modo pedido ('cprofile', 'muestreo') o None"""
+    if not HABILITADO:
+        return None
+    valor = (cabeceras.get('X-Perfilar') or parametros.get('perfilar') or '').strip().lower()
+    return MODOS.get(valor)
+
+
+class _Muestreador(threading.Thread):
+    """Hilo que muestrea la pila de otro hilo y cuenta las pilas iguales"""
+
+    def __init__(self, id_hilo, periodo=PERIODO_MUESTREO):
+        super().__init__(daemon=True)
+        self.id_hilo = id_hilo
+        self.periodo = periodo
+        self.pilas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.periodo):
+            frame = sys._current_frames().get(self.id_hilo)
+            if frame is None:
+                continue
+            pila = []
+            while frame is not None:
+                codigo = frame.f_code
+                modulo = os.path.splitext(os.path.basename(codigo.co_filename))[0]
+                pila.append(f'{modulo}.{codigo.co_name}')
+                frame = frame.f_back
+            self.pilas[';'.join(reversed(pila))] += 1
+
+    def detener(self):
+        self._parar.set()
+        self.join()
+
+
+class Perfil:
+    """Perfil en curso de una petición"""
+
+    def __init__(self, modo, id_peticion, ruta):
+        self.modo = modo
+        self.id_peticion = id_peticion
+        self.ruta = ruta
+        self.inicio = time.perf_counter()
+        self._perfilador = None
+        self._muestreador = None
+
+    def iniciar(self):
+        if self.modo == 'cprofile':
+            self._perfilador = cProfile.Profile()
+            self._perfilador.enable()
+        else:
+            self._muestreador = _Muestreador(threading.get_ident())
+            self._muestreador.start()
+
+    def detener(self, estado=None):
+        """Para el perfilador, guarda el perfil y devuelve su ruta"""
+        duracion = time.perf_counter() - self.inicio
+        try:
+            if self._perfilador:
+                self._perfilador.disable()
+            if self._muestreador:
+                self._muestreador.detener()
+            return self._guardar(duracion, estado)
+        finally:
+            _lock_activo.release()
+
+    def _guardar(self, duracion, estado):
+        os.makedirs(PERFILES_DIR, exist_ok=True)
+        base = os.path.join(PERFILES_DIR, self.id_peticion)
+        destino = base + EXTENSIONES[self.modo]
+
+        if self._perfilador:
+            self._perfilador.dump_stats(destino)
+        else:
+            with open(destino, 'w', encoding='utf-8') as f:
+                for pila, veces in self._muestreador.pilas.most_common():
+                    f.write(f'{pila} {veces}\n')
+
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'id': self.id_peticion,
+                'modo': self.modo,
+                'ruta': self.ruta,
+                'estado': estado,
+                'duracion_ms': round(duracion * 1000, 1),
+                'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'fichero': os.path.basename(destino),
+            }, f, ensure_ascii=False)
+
+        _aplicar_retencion()
+        return destino
+
+
+def iniciar(modo, id_peticion, ruta):
+    """
+    Empieza a perfilar la petición actual
+
+    Returns:
+        El Perfil en curso, o None si ya hay otro perfil activo en el proceso
+    """
+    if not _lock_activo.acquire(blocking=False):
+        return None
+    perfil = Perfil(modo, id_peticion, ruta)
+    try:
+        perfil.iniciar()
+    except Exception:
+        _lock_activo.release()
+        raise
+    return perfil
+
+
+def _aplicar_retencion():
+    """Borra los perfiles más antiguos por encima de MAX_PERFILES"""
+    try:
+        metadatos = [f for f in os.listdir(PERFILES_DIR) if f.endswith('.json')]
+    except OSError:
+        return
+    metadatos.sort(key=lambda f: os.path.getmtime(os.path.join(PERFILES_DIR, f)), reverse=True)
+    for fichero in metadatos[MAX_PERFILES:]:
+        base = os.path.join(PERFILES_DIR, fichero[:-len('.json')])
+        for extension in ('.json', *EXTENSIONES.values()):
+            try:
+                os.remove(base + extension)
+            except OSError:
+                pass
+
+
+def listar_perfiles():
+    """Metadatos de los perfiles guardados, del más reciente al más antiguo"""
+    perfiles = []
+    try:
+        ficheros = [f for f in os.listdir(PERFILES_DIR) if f.endswith('.json')]
+    except OSError:
+        return perfiles
+    for fichero in ficheros:
+        try:
+            with open(os.path.join(PERFILES_DIR, fichero), encoding='utf-8') as f:
+                perfiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(perfiles, key=lambda p: p.get('fecha', ''), reverse=True)
+
+
+def ruta_perfil(id_peticion):
+    """Ruta del fichero de perfil de una petición, o None si no existe"""
+    for extension in EXTENSIONES.values():
+        ruta = os.path.join(PERFILES_DIR, os.path.basename(id_peticion) + extension)
+        if os.path.exists(ruta):
+            return ruta
+    return None
@@ -0,0 +1,247 @@
+"""
+Varias claves de API por proveedor de IA
+Club Atlético Central
+
+Cada clave de Groq o Google es una cuenta con su propio plan gratuito, así
+que con varias el techo de llamadas por minuto crece con el número de
+claves. Se configuran separadas por comas, con un peso opcional:
+
+    GROQ_API_KEYS=gsk_aaa,gsk_bbb:2       gsk_bbb recibe el doble de llamadas
+    GOOGLE_API_KEYS=AIza_aaa,AIza_bbb
+
+Sin ellas se usa la clave única de siempre (GROQ_API_KEY, GOOGLE_API_KEY).
+
+Cada llamada usa la clave con menos uso en proporción a su peso (a igualdad,
+la que lleva más tiempo sin usarse). Si el proveedor responde 429, la clave
+se enfría durante el Retry-After que indique (o POOL_ENFRIAMIENTO segundos,
+60 por defecto) y la llamada se repite con otra; si responde 401 o 403 la
+clave se aparta una hora. Las llamadas por clave y resultado salen
+en /metrics (identificadas por sus últimos cuatro caracteres).
+
+Los pesos tienen que ser números mayores que cero; una entrada con un peso
+no válido se ignora (con un aviso en el registro).
+
+El límite de ritmo de limitador.py es por clave y se multiplica por la
+capacidad del pool: con N claves del mismo peso, N. Con pesos distintos la
+primera que se agota es la de más peso, así que la capacidad es la suma de
+los pesos entre el mayor (gsk_aaa,gsk_bbb:2 -> 1,5 cuotas, no 2).
+
+Los clientes del SDK de Groq se crean sin reintentos propios
+(max_retries=0): los 429 los gestiona el pool, cambiando de clave.
+
+Gemini se llama por su API REST, con la clave de cada llamada en la
+cabecera, así que el reparto y el enfriamiento valen tanto para los dibujos
+síncronos como para los de la API asíncrona.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+
+import limitador
+import metricas
+
+
+logger = logging.getLogger(__name__)
+
+# Proveedor -> (variable con la lista, variable con la clave única)
+VARIABLES = {
+    'groq': ('GROQ_API_KEYS', 'GROQ_API_KEY'),
+    'gemini': ('GOOGLE_API_KEYS', 'GOOGLE_API_KEY'),
+}
+
+ENFRIAMIENTO = float(os.environ.get('POOL_ENFRIAMIENTO', 60))
+ENFRIAMIENTO_INVALIDA = 3600.0
+
+
+class SinClaves(RuntimeError):
+    """Todas las claves del proveedor están enfriándose"""
+
+
+class Clave:
+    """Una clave de API con su peso y su uso"""
+
+    def __init__(self, valor, peso=1.0):
+        self.valor = valor
+        self.peso = peso
+        self.alias = f'…{valor[-4:]}'
+        self.usos = 0
+        self.ultimo_uso = 0.0
+        self.enfriada_hasta = 0.0
+
+
+def cargar_claves(proveedor, entorno=os.environ):
+    """
+    Claves configuradas del proveedor
+
+    Returns:
+        Lista de Clave (vacía si no hay ninguna)
+    """
+    lista, unica = VARIABLES[proveedor]
+    claves = []
+    for entrada in entorno.get(lista, '').split(','):
+        valor, _, peso = entrada.strip().partition(':')
+        if not valor:
+            continue
+        try:
+            peso = float(peso) if peso else 1.0
+        except ValueError:
+            peso = None
+        if peso is None or not math.isfinite(peso) or peso <= 0:
+            logger.warning("Clave …%s de %s ignorada: el peso debe ser un número mayor que 0",
+                           valor[-4:], lista)
+            continue
+        claves.append(Clave(valor, peso))
+    if not claves and entorno.get(unica):
+        claves.append(Clave(entorno[unica].strip()))
+    return claves
+
+
+def _estado_http(error):
+    """Código HTTP de un error del SDK o de httpx, si lo tiene"""
+    estado = getattr(error, 'status_code', None)
+    if estado is None:
+        estado = getattr(getattr(error, 'response', None), 'status_code', None)
+    if estado is None and isinstance(getattr(error, 'code', None), int):
+        estado = error.code
+    return estado
+
+
+def _reintentar_en(error):
+    """Segundos del Retry-After de la respuesta, si viene"""
+    cabeceras = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(cabeceras.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class PoolClaves:
+    """Claves de un proveedor con reparto por peso y enfriamiento"""
+
+    def __init__(self, proveedor, claves):
+        self.proveedor = proveedor
+        self.claves = claves
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.claves)
+
+    def __len__(self):
+        return len(self.claves)
+
+    def capacidad(self):
+        """
+        Cuotas de una clave que suma el pool con el reparto por pesos
+
+        Cada clave recibe peso/total de las llamadas, así que la de más peso
+        llega a su cuota cuando el total es total/peso_maximo cuotas.
+        """
+        if not self.claves:
+            return 0
+        return sum(c.peso for c in self.claves) / max(c.peso for c in self.claves)
+
+    def elegir(self):
+        """
+        Clave para la próxima llamada
+
+        Raises:
+            SinClaves si todas están enfriándose
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            disponibles = [c for c in self.claves if c.enfriada_hasta <= ahora]
+            if not disponibles:
+                espera = min(c.enfriada_hasta for c in self.claves) - ahora
+                raise SinClaves(f"Todas las claves de {self.proveedor} están limitadas "
+                                f"(la primera vuelve en {espera:.0f} s)")
+            clave = min(disponibles, key=lambda c: (c.usos / c.peso, c.ultimo_uso))
+            clave.usos += 1
+            clave.ultimo_uso = ahora
+            return clave
+
+    def registrar(self, clave, error=None):
+        """Anota el resultado de una llamada y enfría la clave si el proveedor la ha limitado"""
+        estado = _estado_http(error) if error is not None else None
+        if error is None:
+            resultado = 'ok'
+        elif estado == 429:
+            resultado = 'limitada'
+            self._enfriar(clave, _reintentar_en(error) or ENFRIAMIENTO)
+        elif estado in (401, 403):
+            resultado = 'invalida'
+            self._enfriar(clave, ENFRIAMIENTO_INVALIDA)
+        else:
+            resultado = 'error'
+        metricas.LLM_CLAVE_LLAMADAS.inc(proveedor=self.proveedor, clave=clave.alias, resultado=resultado)
+
+    def _enfriar(self, clave, segundos):
+        logger.warning("Clave %s de %s apartada %.0f s", clave.alias, self.proveedor, segundos)
+        with self._lock:
+            clave.enfriada_hasta = max(clave.enfriada_hasta, time.monotonic() + segundos)
+
+    def enfriadas(self):
+        ahora = time.monotonic()
+        return sum(1 for c in self.claves if c.enfriada_hasta > ahora)
+
+    def _reintentar(self, clave, error, intento):
+        """Registra el fallo y dice si merece la pena probar con otra clave"""
+        self.registrar(clave, error)
+        return _estado_http(error) in (401, 403, 429) and intento < len(self.claves) - 1
+
+    def llamar(self, funcion):
+        """
+        Llama a funcion(clave) con la clave elegida; si el proveedor la
+        limita, la enfría y prueba con la siguiente
+
+        Returns:
+            Lo que devuelva funcion
+        """
+        for intento in range(len(self.claves)):
+            clave = self.elegir()
+            try:
+                resultado = funcion(clave.valor)
+            except Exception as e:
+                if self._reintentar(clave, e, intento):
+                    continue
+                raise
+            self.registrar(clave)
+            return resultado
+
+    async def llamar_async(self, corrutina):
+        """Versión asíncrona de llamar: await corrutina(clave)"""
+        for intento in range(len(self.claves)):
+            clave = self.elegir()
+            try:
+                resultado = await corrutina(clave.valor)
+            except Exception as e:
+                if self._reintentar(clave, e, intento):
+                    continue
+                raise
+            self.registrar(clave)
+            return resultado
+
+
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+def pool(proveedor):
+    """Pool de claves del proveedor (se crea la primera vez, con el .env ya cargado)"""
+    with _lock_pools:
+        resultado = _pools.get(proveedor)
+        if resultado is None:
+            resultado = _pools[proveedor] = PoolClaves(proveedor, cargar_claves(proveedor))
+            if len(resultado) > 1:
+                logger.info("%d claves para %s", len(resultado), proveedor)
+                limitador.LIMITADORES[proveedor].escalar(resultado.capacidad())
+        return resultado
+
+
+@metricas.registrar_colector
+def _colector_claves():
+    for proveedor, pool_proveedor in list(_pools.items()):
+        metricas.LLM_CLAVES.fijar(len(pool_proveedor), proveedor=proveedor)
+        metricas.LLM_CLAVES_ENFRIADAS.fijar(pool_proveedor.enfriadas(), proveedor=proveedor)
@@ -0,0 +1,173 @@
+"""
+Registro (logging) estructurado de la webapp
+Club Atlético Central
+
+- Niveles configurables con LOG_NIVEL (DEBUG, INFO, WARNING...)
+- Salida JSON de una línea por evento (LOG_FORMATO=texto para leerlo a mano)
+- ID de la petición en cada evento, para correlacionar los de una misma
+  petición
+- Muestreo de los eventos DEBUG repetitivos: solo se emite 1 de cada
+  LOG_MUESTREO_DEBUG por mensaje (los nueve dibujos de un informe generan
+  nueve veces los mismos)
+- Escritura en un hilo aparte (QueueHandler + QueueListener): la petición
+  solo encola el evento, la E/S no bloquea el render ni las llamadas al LLM
+
+Los módulos solo hacen `logger = logging.getLogger(__name__)`; la app llama
+a configurar() al arrancar. Sin configurar, Python solo muestra WARNING o
+superior por stderr, como cualquier script.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from instrumentacion import id_peticion
+
+
+NIVEL = os.environ.get('LOG_NIVEL', 'INFO').upper()
+FORMATO = os.environ.get('LOG_FORMATO', 'json').lower()
+MUESTREO_DEBUG = max(1, int(os.environ.get('LOG_MUESTREO_DEBUG', 10)))
+
+# Atributos estándar de LogRecord: el resto son campos añadidos con extra=
+_ATRIBUTOS_RECORD = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'id_peticion'}
+
+_listener = None
+_handler_cola = None
+_lock = threading.Lock()
+
+
+class FiltroPeticion(logging.Filter):
+    """Añade el ID de la petición en curso a cada evento"""
+
+    def filter(self, record):
+        record.id_peticion = id_peticion()
+        return True
+
+
+class FiltroMuestreo(logging.Filter):
+    """Deja pasar 1 de cada `cada` eventos DEBUG con el mismo mensaje"""
+
+    def __init__(self, cada=MUESTREO_DEBUG):
+        super().__init__()
+        self.cada = cada
+        self._contadores = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.cada <= 1:
+            return True
+        with self._lock:
+            clave = (record.name, record.msg)
+            n = self._contadores[clave]
+            self._contadores[clave] = n + 1
+        if n % self.cada:
+            return False
+        record.muestreo = self.cada
+        return True
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por evento con los campos añadidos en extra="""
+
+    def format(self, record):
+        evento = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))
+                  + f'.{int(record.msecs):03d}Z',
+            'nivel': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'id_peticion', None):
+            evento['id_peticion'] = record.id_peticion
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_RECORD:
+                evento[clave] = valor
+        if record.exc_info:
+            evento['excepcion'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            evento['excepcion'] = record.exc_text
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+class _HandlerCola(logging.handlers.QueueHandler):
+    """QueueHandler que conserva exc_info ya formateado y no copia el record entero"""
+
+    def prepare(self, record):
+        # Formatear aquí el mensaje y la excepción: el hilo que escribe no
+        # puede acceder a los argumentos una vez que la petición ha seguido
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _FormatoTexto(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s [%(id_peticion)s] %(message)s')
+
+
+def configurar(nivel=None, formato=None, stream=None):
+    """
+    Configura el registro de la app (se puede llamar varias veces)
+
+    Args:
+        nivel: Nivel mínimo (por defecto LOG_NIVEL)
+        formato: 'json' o 'texto' (por defecto LOG_FORMATO)
+        stream: Destino (por defecto stderr)
+    """
+    global _listener, _handler_cola
+
+    with _lock:
+        detener()
+
+        salida = logging.StreamHandler(stream or sys.stderr)
+        salida.setFormatter(FormatoJSON() if (formato or FORMATO) == 'json' else _FormatoTexto())
+
+        _handler_cola = _HandlerCola(queue.SimpleQueue())
+        _handler_cola.addFilter(FiltroPeticion())
+        _handler_cola.addFilter(FiltroMuestreo())
+
+        raiz = logging.getLogger()
+        for handler in list(raiz.handlers):
+            if isinstance(handler, _HandlerCola):
+                raiz.removeHandler(handler)
+        raiz.addHandler(_handler_cola)
+        raiz.setLevel(nivel or NIVEL)
+
+        _listener = logging.handlers.QueueListener(_handler_cola.queue, salida,
+                                                   respect_handler_level=True)
+        _listener.start()
+
+
+def detener():
+    """Vacía la cola y para el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+        _listener = None
+
+
+def _reiniciar_tras_fork():
+    """El hilo de escritura no sobrevive a un fork (gunicorn con preload)"""
+    global _listener
+    if _listener is not None:
+        _listener = logging.handlers.QueueListener(_listener.queue, *_listener.handlers,
+                                                   respect_handler_level=True)
+        _listener.start()
+
+
+atexit.register(detener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_tras_fork)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Render masivo de informes desde la línea de comandos
+Club Atlético Central
+
+Regenera el archivo de informes, por ejemplo cuando el club cambia de logo o
+de colores. Lee los datos de una carpeta con un JSON por informe o de un
+JSONL con uno por línea, y escribe un PDF por entrada usando N procesos (el
+render es CPU pura: con procesos sí se reparte entre núcleos).
+
+    python renderizar.py archivo/ -o pdfs/ -j 4
+    python renderizar.py informes.jsonl -o pdfs/ --tipo v2
+    python renderizar.py archivo/ -o pdfs/ --forzar
+
+Cada entrada es lo que se envía a /generar (v1), /generar_v2 (v2, con
+dibujos_ia si los tiene) o /generar_plan (plan). El tipo se toma de --tipo
+o, con --tipo auto, del campo "tipo" de la entrada; si no lo trae se deduce
+de sus campos. En un JSONL, el campo "archivo" da el nombre del PDF (por
+defecto, <línea>_<Rival>.pdf).
+
+En la carpeta de salida se guarda manifiesto.json con la huella de cada PDF:
+datos, tipo, fecha del informe, logo, tema y código de los generadores. Una
+entrada cuya huella no ha cambiado y cuyo PDF sigue ahí no se vuelve a
+generar. Los PDFs se escriben de forma atómica y el manifiesto se guarda
+mientras avanza, así que si se interrumpe, la siguiente ejecución sigue
+donde se quedó.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from cache_lru import hash_contenido
+from documento_pdf import fecha_informe, huella_codigo
+
+
+MANIFIESTO = 'manifiesto.json'
+
+# Tipo -> (módulo, función) del generador; se importa en cada proceso
+GENERADORES = {
+    'v1': ('generar_informe', 'generar_informe_pdf'),
+    'v2': ('generar_informe_v2', 'generar_informe_v2_pdf'),
+    'plan': ('generar_plan_partido', 'generar_plan_partido_pdf'),
+}
+
+# Segundos entre guardados del manifiesto (y líneas de progreso)
+INTERVALO_GUARDADO = 2.0
+
+
+# =============================================================================
+# ENTRADAS
+# =============================================================================
+def _nombre_pdf(datos, prefijo):
+    rival = str(datos.get('nombre_rival') or 'Rival').strip().replace(' ', '_').replace('/', '_')
+    return f"{prefijo}_{rival}.pdf"
+
+
+def leer_entradas(ruta):
+    """
+    Entradas de una carpeta de JSON o de un JSONL
+
+    Yields:
+        (nombre del PDF, datos, error) con datos None si no se pudo leer
+    """
+    if os.path.isdir(ruta):
+        for nombre in sorted(os.listdir(ruta)):
+            if not nombre.endswith('.json'):
+                continue
+            pdf = f"{nombre[:-len('.json')]}.pdf"
+            try:
+                with open(os.path.join(ruta, nombre), encoding='utf-8') as f:
+                    yield pdf, json.load(f), None
+            except (OSError, ValueError) as e:
+                yield pdf, None, str(e)
+        return
+
+    with open(ruta, encoding='utf-8') as f:
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                datos = json.loads(linea)
+            except ValueError as e:
+                yield f"{numero:05d}.pdf", None, str(e)
+                continue
+            yield datos.get('archivo') or _nombre_pdf(datos, f"{numero:05d}"), datos, None
+
+
+def tipo_de(datos, tipo='auto'):
+    """Generador de una entrada: el indicado, el de su campo "tipo" o el que encaje con sus campos"""
+    if tipo != 'auto':
+        return tipo
+    if datos.get('tipo') in GENERADORES:
+        return datos['tipo']
+    if any(campo.startswith('plan_') for campo in datos):
+        return 'plan'
+    if isinstance(datos.get('ataque'), dict) or isinstance(datos.get('defensa'), dict):
+        return 'v2'
+    return 'v1'
+
+
+# =============================================================================
+# HUELLAS Y MANIFIESTO
+# =============================================================================
+def _hash_fichero(ruta):
+    try:
+        with open(ruta, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def huella_entorno():
+    """Lo que cambia todos los PDFs a la vez: logo, tema y código de los generadores"""
+    from generar_informe_v2 import obtener_logo_path, _huella_tema
+
+    logo_path = obtener_logo_path()
+    return hash_contenido(
+        _hash_fichero(logo_path) if logo_path else None,
+        _huella_tema(),
+        huella_codigo(),
+    )
+
+
+def huella(tipo, datos, entorno):
+    """Huella de un PDF: mismos datos y entorno -> mismos bytes (render determinista)"""
+    return hash_contenido(tipo, datos, fecha_informe(datos, deterministico=True).isoformat(), entorno)
+
+
+class Manifiesto:
+    """Huella y tamaño de cada PDF de la carpeta de salida"""
+
+    def __init__(self, directorio):
+        self.ruta = os.path.join(directorio, MANIFIESTO)
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                self.pdfs = json.load(f).get('pdfs', {})
+        except (OSError, ValueError):
+            self.pdfs = {}
+
+    def al_dia(self, nombre, huella_pdf, ruta_pdf):
+        """El PDF existe y se generó con la misma huella"""
+        anotado = self.pdfs.get(nombre)
+        if not anotado or anotado.get('huella') != huella_pdf:
+            return False
+        try:
+            return os.path.getsize(ruta_pdf) == anotado.get('bytes')
+        except OSError:
+            return False
+
+    def anotar(self, nombre, huella_pdf, tamano):
+        self.pdfs[nombre] = {'huella': huella_pdf, 'bytes': tamano}
+
+    def guardar(self):
+        temporal = f'{self.ruta}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'pdfs': self.pdfs}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temporal, self.ruta)
+
+
+# =============================================================================
+# RENDER
+# =============================================================================
+def _renderizar(tipo, datos, ruta_pdf):
+    """
+    Genera un PDF en un proceso del pool
+
+    Returns:
+        (bytes escritos, segundos de render)
+    """
+    modulo, funcion = GENERADORES[tipo]
+    generador = getattr(importlib.import_module(modulo), funcion)
+    kwargs = {'dibujos_ia': datos.get('dibujos_ia')} if tipo == 'v2' else {}
+
+    inicio = time.perf_counter()
+    buffer = io.BytesIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generador(datos, buffer, deterministico=True, **kwargs)
+    segundos = time.perf_counter() - inicio
+
+    # Atómico: un PDF a medias nunca queda con el nombre final
+    temporal = f'{ruta_pdf}.{os.getpid()}.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(buffer.getbuffer())
+    os.replace(temporal, ruta_pdf)
+    return buffer.getbuffer().nbytes, segundos
+
+
+def _percentil(valores, p):
+    if len(valores) < 2:
+        return valores[0] if valores else 0.0
+    return statistics.quantiles(valores, n=100)[p - 1]
+
+
+def renderizar(entradas, salida, procesos=None, tipo='auto', forzar=False, progreso=print):
+    """
+    Genera los PDFs de las entradas que no estén al día
+
+    Args:
+        entradas: Iterable de (nombre, datos, error), como leer_entradas
+        salida: Carpeta de los PDFs y del manifiesto
+        procesos: Procesos del pool (por defecto, uno por núcleo)
+        tipo: 'auto', 'v1', 'v2' o 'plan'
+        forzar: Regenerar aunque el PDF esté al día
+        progreso: Función que recibe las líneas de progreso
+
+    Returns:
+        dict con las estadísticas de la ejecución
+    """
+    os.makedirs(salida, exist_ok=True)
+    manifiesto = Manifiesto(salida)
+    entorno = huella_entorno()
+    procesos = procesos or os.cpu_count() or 1
+
+    stats = {'total': 0, 'generados': 0, 'al_dia': 0, 'errores': [], 'bytes': 0, 'render_s': {}}
+    inicio = time.perf_counter()
+    ultimo_guardado = inicio
+    pendientes = {}
+
+    def anotar(futuro):
+        nombre, tipo_pdf, huella_pdf = pendientes.pop(futuro)
+        try:
+            tamano, segundos = futuro.result()
+        except Exception as e:
+            stats['errores'].append((nombre, f'{type(e).__name__}: {e}'))
+            return
+        manifiesto.anotar(nombre, huella_pdf, tamano)
+        stats['generados'] += 1
+        stats['bytes'] += tamano
+        stats['render_s'].setdefault(tipo_pdf, []).append(segundos)
+
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            for nombre, datos, error in entradas:
+                stats['total'] += 1
+                if error is not None:
+                    stats['errores'].append((nombre, error))
+                    continue
+
+                tipo_pdf = tipo_de(datos, tipo)
+                huella_pdf = huella(tipo_pdf, datos, entorno)
+                ruta_pdf = os.path.join(salida, nombre)
+                if not forzar and manifiesto.al_dia(nombre, huella_pdf, ruta_pdf):
+                    stats['al_dia'] += 1
+                    continue
+
+                # Como mucho dos tareas por proceso en cola: el JSONL no se carga entero
+                while len(pendientes) >= 2 * procesos:
+                    hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in hechos:
+                        anotar(futuro)
+                pendientes[ejecutor.submit(_renderizar, tipo_pdf, datos, ruta_pdf)] = (nombre, tipo_pdf, huella_pdf)
+
+                ahora = time.perf_counter()
+                if ahora - ultimo_guardado >= INTERVALO_GUARDADO:
+                    manifiesto.guardar()
+                    ultimo_guardado = ahora
+                    progreso(f"  {stats['total']} leídos, {stats['generados']} generados "
+                             f"({stats['generados'] / (ahora - inicio):.1f} PDF/s)")
+
+            while pendientes:
+                hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    anotar(futuro)
+    finally:
+        # También al interrumpir: lo ya generado no se repite en la siguiente
+        manifiesto.guardar()
+
+    segundos = time.perf_counter() - inicio
+    stats['segundos'] = segundos
+    stats['pdf_por_segundo'] = stats['generados'] / segundos if segundos else 0.0
+    stats['render_s'] = {
+        tipo_pdf: {'n': len(tiempos), 'media': statistics.fmean(tiempos), 'p95': _percentil(tiempos, 95)}
+        for tipo_pdf, tiempos in stats['render_s'].items()
+    }
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera en bloque los PDFs de una carpeta de JSON o de un JSONL')
+    parser.add_argument('entrada', help='Carpeta con un JSON por informe o fichero JSONL')
+    parser.add_argument('-o', '--salida', default='pdfs', help='Carpeta de salida (y del manifiesto)')
+    parser.add_argument('-j', '--procesos', type=int, default=None,
+                        help='Procesos en paralelo (por defecto, uno por núcleo)')
+    parser.add_argument('--tipo', choices=['auto', *GENERADORES], default='auto',
+                        help='Generador de todas las entradas (por defecto, según cada entrada)')
+    parser.add_argument('--forzar', action='store_true', help='Regenerar aunque estén al día')
+    args = parser.parse_args(argv)
+
+    print(f"🖨 Generando los PDFs de {args.entrada} en {args.salida}")
+    try:
+        stats = renderizar(leer_entradas(args.entrada), args.salida, args.procesos, args.tipo, args.forzar)
+    except KeyboardInterrupt:
+        print("\n⏸ Interrumpido: la próxima ejecución seguirá donde se ha quedado")
+        return 130
+
+    print(f"\n✅ {stats['generados']} generados, {stats['al_dia']} ya al día, "
+          f"{len(stats['errores'])} con error (de {stats['total']})")
+    print(f"   {stats['segundos']:.1f} s, {stats['pdf_por_segundo']:.1f} PDF/s, "
+          f"{stats['bytes'] / 1e6:.1f} MB escritos")
+    for tipo_pdf, tiempos in sorted(stats['render_s'].items()):
+        print(f"   {tipo_pdf:<5} {tiempos['n']:>6} PDFs  render medio {tiempos['media'] * 1000:.0f} ms, "
+              f"p95 {tiempos['p95'] * 1000:.0f} ms")
+    for nombre, error in stats['errores']:
+        print(f"❌ {nombre}: {error}", file=sys.stderr)
+    return 1 if stats['errores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Claves de firma de la cookie de sesión
+Club Atlético Central
+
+La sesión vive entera en la cookie firmada (no hay nada en el servidor), así
+que cualquier worker o instancia la acepta si todos firman con la misma
+clave. Las claves salen de la configuración:
+
+    SECRET_KEYS=clave_actual,clave_anterior   rotación: se firma con la
+                                              primera y se aceptan todas
+    SECRET_KEY=clave                          una sola clave
+
+Para rotar: añadir la nueva al principio de SECRET_KEYS, desplegar y, cuando
+hayan caducado las sesiones antiguas, quitar la anterior.
+
+Sin ninguna de las dos se genera una clave aleatoria en el proceso (con
+preload la comparten los workers de un mismo servidor, pero no sobrevive a
+un reinicio ni vale entre instancias). Eso solo vale en desarrollo: en
+producción (crear_app, que usan gunicorn y asgi.py) la app no arranca sin
+clave, salvo con SESION_CLAVE_ALEATORIA=1.
+"""
+
+import logging
+import os
+import secrets
+
+from flask.sessions import SecureCookieSessionInterface
+from itsdangerous import URLSafeTimedSerializer
+
+
+logger = logging.getLogger(__name__)
+
+LONGITUD_MINIMA = 32
+
+
+def cargar_claves(entorno=os.environ):
+    """
+    Claves de firma configuradas, la actual primero
+
+    Returns:
+        Lista de claves (vacía si no hay ninguna configurada)
+    """
+    claves = [c.strip() for c in entorno.get('SECRET_KEYS', '').split(',') if c.strip()]
+    if not claves and entorno.get('SECRET_KEY'):
+        claves = [entorno['SECRET_KEY'].strip()]
+    return claves
+
+
+class InterfazSesionRotativa(SecureCookieSessionInterface):
+    """Cookie de sesión firmada con la clave actual que acepta también las anteriores"""
+
+    def __init__(self):
+        self._serializadores = {}
+
+    def get_signing_serializer(self, app):
+        claves = tuple(app.config.get('SECRET_KEYS') or ([app.secret_key] if app.secret_key else []))
+        if not claves:
+            return None
+
+        serializador = self._serializadores.get(claves)
+        if serializador is None:
+            # itsdangerous firma con la última de la lista y verifica con todas
+            serializador = URLSafeTimedSerializer(
+                list(reversed(claves)),
+                salt=self.salt,
+                serializer=self.serializer,
+                signer_kwargs={'key_derivation': self.key_derivation,
+                               'digest_method': self.digest_method},
+            )
+            self._serializadores = {claves: serializador}
+        return serializador
+
+
+def configurar(app, entorno=os.environ):
+    """Fija las claves de firma de la app y la interfaz de sesión con rotación"""
+    claves = cargar_claves(entorno)
+    app.config['SECRET_KEY_ALEATORIA'] = not claves
+    if not claves:
+        logger.warning("Sin SECRET_KEY ni SECRET_KEYS: se usa una clave aleatoria de este proceso; "
+                       "las sesiones no valen en otras instancias ni tras reiniciar")
+        claves = [secrets.token_hex(32)]
+    elif any(len(clave) < LONGITUD_MINIMA for clave in claves):
+        logger.warning("Alguna clave de sesión tiene menos de %d caracteres", LONGITUD_MINIMA)
+
+    app.secret_key = claves[0]
+    app.config['SECRET_KEYS'] = claves
+    app.session_interface = InterfazSesionRotativa()
+
+
+def exigir_clave(app, entorno=os.environ):
+    """
+    Comprobación de arranque en producción: falla si no hay clave configurada
+
+    Raises:
+        RuntimeError: Si la app firma con una clave aleatoria y no se ha
+            permitido con SESION_CLAVE_ALEATORIA=1
+    """
+    if not app.config.get('SECRET_KEY_ALEATORIA'):
+        return
+    if entorno.get('SESION_CLAVE_ALEATORIA') == '1':
+        logger.warning("Producción con clave de sesión aleatoria (SESION_CLAVE_ALEATORIA=1)")
+        return
+    logger.critical("Sin SECRET_KEY ni SECRET_KEYS en producción")
+    raise RuntimeError("Falta SECRET_KEY o SECRET_KEYS (o SESION_CLAVE_ALEATORIA=1 para permitir "
+                       "una clave aleatoria por proceso)")
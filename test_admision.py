@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Pruebas del control de admisión por clase de ruta (admision.py)
+
+Límites propios de una plaza: orden de llegada en la cola, 429 con
+Retry-After cuando la clase está saturada y peticiones asíncronas
+canceladas mientras esperan turno. También los límites propios de asgi.py.
+
+    python -m pytest test_admision.py
+"""
+
+import asyncio
+import threading
+import time
+
+import admision
+
+
+def _esperar_en_cola(limite, n):
+    while limite.estado()[1] < n:
+        time.sleep(0.005)
+
+
+def test_cola_fifo():
+    """Al salir, el turno pasa al primero que llegó a la cola"""
+    limite = admision.Limite('prueba', limite=1, cola=2, espera=5)
+    assert limite.entrar()[0]
+    orden = []
+
+    def peticion(nombre):
+        admitida, _ = limite.entrar()
+        orden.append((nombre, admitida))
+        limite.salir()
+
+    hilos = []
+    for i, nombre in enumerate(('primera', 'segunda')):
+        hilo = threading.Thread(target=peticion, args=(nombre,))
+        hilo.start()
+        hilos.append(hilo)
+        _esperar_en_cola(limite, i + 1)
+
+    limite.salir()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert orden == [('primera', True), ('segunda', True)]
+    assert limite.estado() == (0, 0)
+
+
+def test_cola_llena_se_rechaza_al_momento():
+    limite = admision.Limite('prueba', limite=1, cola=0, espera=5)
+    assert limite.entrar()[0]
+
+    admitida, espera = limite.entrar()
+    assert not admitida
+    assert espera < 0.1
+    assert limite.reintentar_en() >= 1
+
+
+def test_espera_agotada_sale_de_la_cola():
+    limite = admision.Limite('prueba', limite=1, cola=1, espera=0.1)
+    assert limite.entrar()[0]
+
+    assert not limite.entrar()[0]
+    assert limite.estado() == (1, 0)
+
+
+def test_ruta_saturada_responde_429(monkeypatch):
+    """La app rechaza con 429 y Retry-After la petición que no cabe"""
+    import app as aplicacion
+
+    limite = admision.Limite('render', limite=1, cola=0, espera=1)
+    monkeypatch.setitem(admision.LIMITES, 'render', limite)
+    cliente = aplicacion.app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['authenticated'] = True
+
+    assert limite.entrar()[0]
+    respuesta = cliente.post('/exportar_campo', json={'instrucciones': {}})
+    limite.salir()
+
+    assert respuesta.status_code == 429
+    assert int(respuesta.headers['Retry-After']) >= 1
+    assert cliente.post('/exportar_campo', json={'instrucciones': {}}).status_code == 200
+    assert limite.estado() == (0, 0)
+
+
+def test_cancelada_en_cola_no_ocupa_plaza():
+    """Una petición asíncrona cancelada mientras espera sale de la cola"""
+    async def escenario():
+        limite = admision.Limite('prueba', limite=1, cola=1, espera=5)
+        assert limite.entrar()[0]
+        tarea = asyncio.ensure_future(limite.entrar_async())
+        while limite.estado()[1] < 1:
+            await asyncio.sleep(0.005)
+
+        tarea.cancel()
+        try:
+            await tarea
+        except asyncio.CancelledError:
+            pass
+        assert limite.estado() == (1, 0)
+        limite.salir()
+        assert limite.estado() == (0, 0)
+
+    asyncio.run(escenario())
+
+
+def test_cancelada_con_el_turno_ya_dado_lo_devuelve():
+    """Si le había llegado el turno justo antes de cancelarse, la plaza no se pierde"""
+    async def escenario():
+        limite = admision.Limite('prueba', limite=1, cola=1, espera=5)
+        assert limite.entrar()[0]
+        tarea = asyncio.ensure_future(limite.entrar_async())
+        while limite.estado()[1] < 1:
+            await asyncio.sleep(0.005)
+
+        limite.salir()  # el turno pasa a la tarea, que aún no se ha enterado
+        tarea.cancel()
+        try:
+            await tarea
+        except asyncio.CancelledError:
+            pass
+        assert limite.estado() == (0, 0)
+
+    asyncio.run(escenario())
+
+
+def test_limites_de_asgi(monkeypatch):
+    """asgi.py admite muchas más rutas de IA y lee sus propias variables"""
+    monkeypatch.setenv('ADMISION_ASGI_RENDER_LIMITE', '3')
+    monkeypatch.setenv('ADMISION_IA_LIMITE', '1')
+    try:
+        admision.configurar(asgi=True)
+        assert admision.LIMITES['ia'].limite == admision.POR_DEFECTO_ASGI['ia'][0]
+        assert admision.LIMITES['render'].limite == 3
+    finally:
+        monkeypatch.undo()
+        admision.configurar()
+    assert admision.LIMITES['ia'].limite == admision.POR_DEFECTO['ia'][0]
+
+
+def test_ruta_de_ia_en_un_hilo_cuenta_como_render():
+    assert admision.limite_de_ruta('/generar_pack_partido').clase == 'ia'
+    assert admision.limite_de_ruta('/generar_pack_partido', en_hilo=True).clase == 'render'
+    assert admision.limite_de_ruta('/login', en_hilo=True) is None
+
+
+def test_lote_con_dibujos_cuenta_como_ia():
+    assert admision.limite_de_ruta('/generar_lote', cuerpo={'informes': []}).clase == 'render'
+    assert admision.limite_de_ruta('/generar_lote', cuerpo={'dibujos': True}).clase == 'ia'
+    assert admision.limite_de_ruta('/generar_lote', en_hilo=True, cuerpo={'dibujos': True}).clase == 'render'
+    assert admision.limite_de_ruta('/generar_lote', cuerpo=['dibujos']).clase == 'render'
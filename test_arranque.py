@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark del tiempo de importación de la app (arranque en frío de un worker)
+
+Cada medición es un proceso nuevo con `python -X importtime -c "import app"`,
+así que no influye lo que ya esté cargado en este proceso. Comprueba también
+que los módulos pesados que se cargan en el primer uso (SDK de los
+proveedores de IA, generador v1) no se importan al arrancar.
+
+Uso:
+    python test_arranque.py            # mediana, desglose y comprobaciones
+    python -m pytest test_arranque.py  # solo las comprobaciones
+
+PRESUPUESTO_ARRANQUE_MS ajusta el máximo permitido (por defecto 800 ms,
+con margen para máquinas de CI lentas).
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+PRESUPUESTO_MS = float(os.environ.get('PRESUPUESTO_ARRANQUE_MS', 800))
+REPETICIONES = 5
+
+# Módulos que solo se importan cuando hacen falta
+DIFERIDOS = ('groq', 'httpx', 'generar_informe')
+_CODIGO_DIFERIDOS = f'import sys, app; print(",".join(m for m in {DIFERIDOS!r} if m in sys.modules))'
+
+
+def _importar_app(codigo='import app'):
+    """Importa la app en un proceso nuevo y devuelve (stderr de importtime, stdout)"""
+    entorno = dict(os.environ, LOG_NIVEL='ERROR', PYTHONDONTWRITEBYTECODE='1')
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                             cwd=DIRECTORIO, env=entorno, capture_output=True, text=True, check=True)
+    return proceso.stderr, proceso.stdout
+
+
+def _tiempos(salida):
+    """Módulo -> (propio, acumulado) en ms a partir de la salida de -X importtime"""
+    tiempos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, modulo = linea[len('import time:'):].split('|')
+        tiempos[modulo.strip()] = (int(propio) / 1000, int(acumulado) / 1000)
+    return tiempos
+
+
+def medir(repeticiones=REPETICIONES):
+    """
+    Mide la importación de la app varias veces
+
+    Returns:
+        (mediana en ms, desglose de la última medición)
+    """
+    _importar_app()  # calentamiento: .pyc y caché de disco
+    totales = []
+    for _ in range(repeticiones):
+        tiempos = _tiempos(_importar_app()[0])
+        totales.append(tiempos['app'][1])
+    return statistics.median(totales), tiempos
+
+
+def test_modulos_diferidos():
+    """Ni los SDK de IA ni el generador v1 se importan al arrancar"""
+    cargados = _importar_app(_CODIGO_DIFERIDOS)[1].strip()
+    assert not cargados, f'Importados al arrancar: {cargados}'
+
+
+def test_tiempo_importacion():
+    """La importación de la app cabe en el presupuesto"""
+    mediana, _ = medir(repeticiones=3)
+    assert mediana <= PRESUPUESTO_MS, f'import app: {mediana:.0f} ms (presupuesto {PRESUPUESTO_MS:.0f} ms)'
+
+
+if __name__ == '__main__':
+    mediana, tiempos = medir()
+    print(f"⏱️  import app: {mediana:.0f} ms (mediana de {REPETICIONES}, presupuesto {PRESUPUESTO_MS:.0f} ms)\n")
+
+    print("Módulos más lentos (acumulado):")
+    for modulo, (propio, acumulado) in sorted(tiempos.items(), key=lambda t: -t[1][1])[1:11]:
+        print(f"  {modulo:<40} {acumulado:8.1f} ms  (propio {propio:.1f} ms)")
+
+    cargados = _importar_app(_CODIGO_DIFERIDOS)[1].strip()
+    print(f"\n{'❌' if cargados else '✓'} Módulos diferidos importados al arrancar: {cargados or 'ninguno'}")
+    sys.exit(1 if cargados or mediana > PRESUPUESTO_MS else 0)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la coalescencia de llamadas al LLM (coalescencia.py)
+
+Llamadas idénticas en vuelo a la vez, desde hilos y desde asyncio: se hace
+una y todas reciben su resultado (o su error). También entre dos
+coalescedores con el backend de ficheros, como dos workers.
+
+    python -m pytest test_coalescencia.py
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import coalescencia
+
+
+def _lanzar(coalescedor, clave, funcion, n):
+    """n hilos con la misma llamada; devuelve (hilos, resultados)"""
+    resultados = []
+
+    def llamar():
+        try:
+            resultados.append(coalescedor.ejecutar(clave, funcion))
+        except Exception as e:
+            resultados.append(e)
+
+    hilos = [threading.Thread(target=llamar) for _ in range(n)]
+    for hilo in hilos:
+        hilo.start()
+    return hilos, resultados
+
+
+def test_clave_ignora_espacios():
+    assert (coalescencia.clave_llamada('groq', 'analisis', 'Notas  del\n rival')
+            == coalescencia.clave_llamada('groq', 'analisis', ' Notas del rival '))
+    assert (coalescencia.clave_llamada('groq', 'analisis', 'Notas')
+            != coalescencia.clave_llamada('gemini', 'analisis', 'Notas'))
+
+
+def test_llamadas_identicas_se_hacen_una_vez():
+    coalescedor = coalescencia.Coalescedor()
+    llamadas = []
+    continuar = threading.Event()
+
+    def funcion():
+        llamadas.append(1)
+        continuar.wait(5)
+        return {'sistema': '4-4-2'}
+
+    hilos, resultados = _lanzar(coalescedor, 'clave', funcion, 4)
+    while not llamadas:
+        time.sleep(0.005)
+    time.sleep(0.05)
+    continuar.set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert len(llamadas) == 1
+    assert resultados == [{'sistema': '4-4-2'}] * 4
+
+
+def test_el_error_se_comparte():
+    coalescedor = coalescencia.Coalescedor()
+    continuar = threading.Event()
+
+    def funcion():
+        continuar.wait(5)
+        raise ValueError('respuesta no válida')
+
+    hilos, resultados = _lanzar(coalescedor, 'clave', funcion, 3)
+    time.sleep(0.05)
+    continuar.set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert len(resultados) == 3
+    assert all(isinstance(r, ValueError) for r in resultados)
+
+
+def test_no_es_una_cache():
+    """Terminada la llamada, la siguiente con la misma clave vuelve a llamar"""
+    coalescedor = coalescencia.Coalescedor()
+    llamadas = []
+
+    def funcion():
+        llamadas.append(1)
+        return len(llamadas)
+
+    assert coalescedor.ejecutar('clave', funcion) == 1
+    assert coalescedor.ejecutar('clave', funcion) == 2
+
+
+def test_asincrono():
+    """Con asyncio, las idénticas comparten la llamada y las distintas no"""
+    coalescedor = coalescencia.Coalescedor()
+    llamadas = []
+
+    def corrutina(valor):
+        async def llamar():
+            llamadas.append(valor)
+            await asyncio.sleep(0.05)
+            return valor
+        return llamar
+
+    async def escenario():
+        return await asyncio.gather(
+            coalescedor.ejecutar_async('a', corrutina('a')),
+            coalescedor.ejecutar_async('a', corrutina('a')),
+            coalescedor.ejecutar_async('a', corrutina('a')),
+            coalescedor.ejecutar_async('b', corrutina('b')),
+        )
+
+    assert asyncio.run(escenario()) == ['a', 'a', 'a', 'b']
+    assert sorted(llamadas) == ['a', 'b']
+
+
+def test_cancelar_la_primera_pasa_el_relevo():
+    """Si se cancela la que hace la llamada, otra la hace y las demás esperan a esa"""
+    coalescedor = coalescencia.Coalescedor()
+    llamadas = []
+
+    async def llamar():
+        llamadas.append(1)
+        await asyncio.sleep(0.05)
+        return 'plan'
+
+    async def escenario():
+        primera = asyncio.ensure_future(coalescedor.ejecutar_async('clave', llamar))
+        await asyncio.sleep(0.01)
+        otras = [asyncio.ensure_future(coalescedor.ejecutar_async('clave', llamar))
+                 for _ in range(3)]
+        await asyncio.sleep(0.01)
+        primera.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await primera
+        return await asyncio.gather(*otras)
+
+    assert asyncio.run(escenario()) == ['plan'] * 3
+    assert len(llamadas) == 2
+
+
+@pytest.mark.skipif(coalescencia.bloqueos.fcntl is None, reason='necesita fcntl')
+def test_backend_ficheros_entre_coalescedores(tmp_path):
+    """Dos coalescedores con la misma carpeta (dos workers) hacen una sola llamada"""
+    primero = coalescencia.Coalescedor(coalescencia.BackendFicheros(str(tmp_path)))
+    segundo = coalescencia.Coalescedor(coalescencia.BackendFicheros(str(tmp_path)))
+    llamadas = []
+    continuar = threading.Event()
+
+    def funcion():
+        llamadas.append(1)
+        continuar.wait(5)
+        return {'dibujo': 'ok'}
+
+    hilos, resultados = _lanzar(primero, 'clave', funcion, 1)
+    while not llamadas:
+        time.sleep(0.005)
+    otros, resultados_segundo = _lanzar(segundo, 'clave', funcion, 1)
+    time.sleep(0.1)
+    continuar.set()
+    for hilo in hilos + otros:
+        hilo.join(5)
+
+    assert len(llamadas) == 1
+    assert resultados == resultados_segundo == [{'dibujo': 'ok'}]
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la cabecera Idempotency-Key (idempotencia.py)
+
+Una app Flask mínima con una ruta decorada y el almacén en una carpeta
+temporal: repetición de la respuesta, 422 si la clave se reutiliza con
+otros datos, espera a la original en curso (sin ocupar turno de admisión) y
+409 si no termina a tiempo.
+
+    python -m pytest test_idempotencia.py
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify, request, session
+
+import admision
+import idempotencia
+
+pytestmark = pytest.mark.skipif(idempotencia.bloqueos.fcntl is None, reason='necesita fcntl')
+
+
+@pytest.fixture
+def entorno(tmp_path, monkeypatch):
+    """(cliente, llamadas a la vista, evento que la deja terminar)"""
+    monkeypatch.setattr(idempotencia, 'ALMACEN', idempotencia.Almacen(str(tmp_path), espera=5))
+    llamadas = []
+    continuar = threading.Event()
+    continuar.set()
+
+    app = Flask(__name__)
+    app.secret_key = 'pruebas'
+
+    @app.route('/generar', methods=['POST'])
+    @idempotencia.idempotente
+    def generar():
+        llamadas.append(request.json)
+        continuar.wait(10)
+        return jsonify({'n': len(llamadas)})
+
+    # Admisión como la de app.py, si la prueba pone un límite en ADMISION
+    @app.before_request
+    def admitir():
+        limite = app.config.get('ADMISION')
+        if limite is not None and request.path == '/generar':
+            assert limite.entrar()[0]
+            admision.tomar_turno(request.environ, limite)
+
+    @app.teardown_request
+    def soltar(error=None):
+        admision.soltar_turno(request.environ)
+
+    @app.route('/entrar', methods=['POST'])
+    def entrar():
+        session['authenticated'] = True
+        return ''
+
+    cliente = app.test_client()
+    cliente.post('/entrar')
+    return cliente, llamadas, continuar
+
+
+def _generar(cliente, datos, clave='accion-1'):
+    return cliente.post('/generar', json=datos, headers={idempotencia.CABECERA: clave})
+
+
+def test_repite_respuesta_guardada(entorno):
+    """Un reintento con la misma clave y datos recibe la respuesta guardada sin repetir el trabajo"""
+    cliente, llamadas, _ = entorno
+    primera = _generar(cliente, {'rival': 'A'})
+    segunda = _generar(cliente, {'rival': 'A'})
+
+    assert len(llamadas) == 1
+    assert segunda.status_code == 200
+    assert segunda.get_json() == primera.get_json()
+    assert segunda.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in primera.headers
+
+
+def test_otra_clave_vuelve_a_ejecutar(entorno):
+    cliente, llamadas, _ = entorno
+    _generar(cliente, {'rival': 'A'}, 'accion-1')
+    _generar(cliente, {'rival': 'A'}, 'accion-2')
+    assert len(llamadas) == 2
+
+
+def test_conflicto_con_otros_datos(entorno):
+    """La misma clave con otro cuerpo es un error del cliente: 422 y no se ejecuta"""
+    cliente, llamadas, _ = entorno
+    _generar(cliente, {'rival': 'A'})
+    respuesta = _generar(cliente, {'rival': 'B'})
+
+    assert respuesta.status_code == 422
+    assert len(llamadas) == 1
+
+
+def test_espera_a_la_original_en_curso(entorno):
+    """Un reintento mientras la original está en curso espera y recibe su respuesta"""
+    cliente, llamadas, continuar = entorno
+    continuar.clear()
+    respuestas = {}
+    original = threading.Thread(target=lambda: respuestas.update(original=_generar(cliente, {'rival': 'A'})))
+    original.start()
+    while not llamadas:
+        time.sleep(0.01)
+
+    reintento = threading.Thread(target=lambda: respuestas.update(reintento=_generar(cliente, {'rival': 'A'})))
+    reintento.start()
+    time.sleep(0.2)
+    assert 'reintento' not in respuestas
+    continuar.set()
+    original.join(5)
+    reintento.join(5)
+
+    assert len(llamadas) == 1
+    assert respuestas['reintento'].status_code == 200
+    assert respuestas['reintento'].headers['Idempotent-Replayed'] == 'true'
+    assert respuestas['reintento'].get_json() == respuestas['original'].get_json()
+
+
+def test_la_espera_no_ocupa_turno_de_admision(entorno):
+    """El reintento suelta su turno mientras espera a la original"""
+    cliente, llamadas, continuar = entorno
+    limite = cliente.application.config['ADMISION'] = admision.Limite('render', limite=2, cola=0, espera=1)
+    continuar.clear()
+    respuestas = {}
+    original = threading.Thread(target=lambda: respuestas.update(original=_generar(cliente, {'rival': 'A'})))
+    original.start()
+    while not llamadas:
+        time.sleep(0.01)
+    reintento = threading.Thread(target=lambda: respuestas.update(reintento=_generar(cliente, {'rival': 'A'})))
+    reintento.start()
+    time.sleep(0.2)
+
+    assert limite.estado() == (1, 0)
+    continuar.set()
+    original.join(5)
+    reintento.join(5)
+
+    assert respuestas['reintento'].headers['Idempotent-Replayed'] == 'true'
+    assert limite.estado() == (0, 0)
+
+
+def test_espera_acotada_responde_409(entorno):
+    """Si la original no termina en el tiempo de espera, 409 con Retry-After"""
+    cliente, llamadas, continuar = entorno
+    idempotencia.ALMACEN.espera = 0.2
+    continuar.clear()
+    original = threading.Thread(target=_generar, args=(cliente, {'rival': 'A'}))
+    original.start()
+    while not llamadas:
+        time.sleep(0.01)
+
+    inicio = time.monotonic()
+    respuesta = _generar(cliente, {'rival': 'A'})
+    continuar.set()
+    original.join(5)
+
+    assert respuesta.status_code == 409
+    assert int(respuesta.headers['Retry-After']) >= 1
+    assert time.monotonic() - inicio < 2
+    assert len(llamadas) == 1
+
+
+def test_limpieza_respeta_bloqueos_en_uso(entorno, tmp_path):
+    """Se borran las respuestas caducadas y los .lock sin uso; el que está en uso se queda"""
+    cliente, _, _ = entorno
+    _generar(cliente, {'rival': 'A'}, 'accion-1')
+    _generar(cliente, {'rival': 'A'}, 'accion-2')
+    en_uso, _ = idempotencia.ALMACEN.adquirir(idempotencia.hash_contenido('/generar', 'accion-2'))
+
+    idempotencia.ALMACEN.vigencia = -1
+    idempotencia.ALMACEN._limpiar()
+    restantes = list(tmp_path.iterdir())
+    idempotencia.ALMACEN.liberar(en_uso)
+
+    assert [ruta.name for ruta in restantes] == [os.path.basename(en_uso.name)]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pruebas del límite de ritmo por proveedor (limitador.py)
+
+Limitadores propios con ritmos altos para que las esperas sean de décimas
+de segundo: reposición continua de las cubetas, prioridad del carril
+interactivo sobre el de lote y espera máxima.
+
+    python -m pytest test_limitador.py
+"""
+
+import threading
+import time
+
+import pytest
+
+import limitador
+
+
+def _vaciar(limite, llamadas):
+    """Gasta la ráfaga inicial de la cubeta de peticiones"""
+    for _ in range(llamadas):
+        assert limite.esperar_turno(0) < 0.05
+
+
+def test_rafaga_y_reposicion_de_peticiones():
+    """Sale una ráfaga de un minuto de golpe; la siguiente espera a que se reponga una ficha"""
+    limite = limitador.Limitador('prueba', rpm=600, tpm=0)  # una ficha cada 0,1 s
+    _vaciar(limite, 600)
+
+    esperado = limite.esperar_turno(0)
+    assert 0.05 < esperado < 0.5
+
+
+def test_reposicion_de_tokens():
+    """Una llamada que no cabe en los tokens que quedan espera lo que tardan en reponerse"""
+    limite = limitador.Limitador('prueba', rpm=0, tpm=6000)  # 100 tokens por segundo
+    assert limite.esperar_turno(6000) < 0.05
+
+    esperado = limite.esperar_turno(30)
+    assert 0.2 < esperado < 0.8
+
+
+def test_interactiva_adelanta_a_lote():
+    """Con la cubeta vacía, una llamada interactiva sale antes que una de lote que llegó antes"""
+    limite = limitador.Limitador('prueba', rpm=600, tpm=0)
+    _vaciar(limite, 600)
+    orden = []
+
+    def llamar(prioridad):
+        limite.esperar_turno(0, prioridad)
+        orden.append(prioridad)
+
+    lote = threading.Thread(target=llamar, args=(limitador.LOTE,))
+    lote.start()
+    while limite.en_cola() < 1:
+        time.sleep(0.005)
+    interactiva = threading.Thread(target=llamar, args=(limitador.INTERACTIVA,))
+    interactiva.start()
+    lote.join(5)
+    interactiva.join(5)
+
+    assert orden == [limitador.INTERACTIVA, limitador.LOTE]
+    assert limite.en_cola() == 0
+
+
+def test_espera_agotada_deja_la_cola_vacia(monkeypatch):
+    monkeypatch.setattr(limitador, 'ESPERA_MAXIMA', 0.1)
+    limite = limitador.Limitador('prueba', rpm=1, tpm=0)
+    _vaciar(limite, 1)
+
+    with pytest.raises(limitador.EsperaAgotada):
+        limite.esperar_turno(0)
+    assert limite.en_cola() == 0
+
+
+def test_escalar_multiplica_el_ritmo():
+    """Con dos claves de la misma cuota caben el doble de llamadas en la ráfaga"""
+    limite = limitador.Limitador('prueba', rpm=10, tpm=0)
+    limite.escalar(2)
+    _vaciar(limite, 20)
+    assert limite.rpm == 20
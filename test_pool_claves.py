@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Pruebas del pool de claves de API (pool_claves.py)
+
+Pools con claves inventadas y errores que imitan los del SDK: enfriamiento
+de la clave que recibe un 429 (con o sin Retry-After), claves inválidas,
+reintento con otra clave y pesos. Los dibujos síncronos con Gemini pasan por
+el pool con un transporte de httpx que responde en lugar de Google.
+
+    python -m pytest test_pool_claves.py
+"""
+
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import ia_analyzer
+import pool_claves
+
+
+class ErrorHTTP(Exception):
+    """Error con status_code y cabeceras, como los del SDK de Groq y httpx"""
+
+    def __init__(self, estado, reintentar_en=None):
+        super().__init__(f'HTTP {estado}')
+        self.status_code = estado
+        cabeceras = {} if reintentar_en is None else {'retry-after': str(reintentar_en)}
+        self.response = SimpleNamespace(headers=cabeceras)
+
+
+def _pool(*valores):
+    return pool_claves.PoolClaves('groq', [pool_claves.Clave(valor) for valor in valores])
+
+
+def test_reparto_entre_claves():
+    pool = _pool('gsk_aaaa', 'gsk_bbbb')
+    assert [pool.elegir().valor for _ in range(4)] == ['gsk_aaaa', 'gsk_bbbb'] * 2
+
+
+def test_clave_limitada_se_enfria_el_retry_after():
+    """Tras un 429 la clave no se elige hasta que pasa su Retry-After"""
+    pool = _pool('gsk_aaaa', 'gsk_bbbb')
+    limitada = pool.elegir()
+    pool.registrar(limitada, ErrorHTTP(429, reintentar_en=0.2))
+
+    assert pool.enfriadas() == 1
+    assert {pool.elegir().valor for _ in range(3)} == {'gsk_bbbb'}
+    time.sleep(0.25)
+    assert pool.enfriadas() == 0
+    assert limitada in [pool.elegir() for _ in range(2)]
+
+
+def test_sin_retry_after_usa_el_enfriamiento_por_defecto(monkeypatch):
+    monkeypatch.setattr(pool_claves, 'ENFRIAMIENTO', 30)
+    pool = _pool('gsk_aaaa')
+    clave = pool.elegir()
+    pool.registrar(clave, ErrorHTTP(429))
+
+    assert clave.enfriada_hasta - time.monotonic() == pytest.approx(30, abs=1)
+    with pytest.raises(pool_claves.SinClaves):
+        pool.elegir()
+
+
+def test_clave_invalida_se_aparta_una_hora():
+    pool = _pool('gsk_aaaa', 'gsk_bbbb')
+    clave = pool.elegir()
+    pool.registrar(clave, ErrorHTTP(401))
+
+    restante = clave.enfriada_hasta - time.monotonic()
+    assert restante == pytest.approx(pool_claves.ENFRIAMIENTO_INVALIDA, abs=1)
+
+
+def test_otros_errores_no_enfrian():
+    pool = _pool('gsk_aaaa')
+    pool.registrar(pool.elegir(), ErrorHTTP(500))
+    assert pool.enfriadas() == 0
+
+
+def test_llamar_reintenta_con_otra_clave():
+    """Si el proveedor limita una clave, la misma llamada se repite con la siguiente"""
+    pool = _pool('gsk_aaaa', 'gsk_bbbb')
+    usadas = []
+
+    def llamada(clave):
+        usadas.append(clave)
+        if clave == 'gsk_aaaa':
+            raise ErrorHTTP(429, reintentar_en=60)
+        return 'ok'
+
+    assert pool.llamar(llamada) == 'ok'
+    assert usadas == ['gsk_aaaa', 'gsk_bbbb']
+    assert pool.enfriadas() == 1
+
+
+def test_llamar_sin_claves_libres_propaga_el_error():
+    pool = _pool('gsk_aaaa')
+
+    def llamada(clave):
+        raise ErrorHTTP(429, reintentar_en=60)
+
+    with pytest.raises(ErrorHTTP):
+        pool.llamar(llamada)
+
+
+def test_pesos_y_capacidad():
+    """Los pesos no válidos se ignoran; la capacidad es la suma de pesos entre el mayor"""
+    claves = pool_claves.cargar_claves('groq', {'GROQ_API_KEYS': 'gsk_aaaa,gsk_bbbb:2,gsk_cccc:0,gsk_dddd:x'})
+    assert [(c.valor, c.peso) for c in claves] == [('gsk_aaaa', 1.0), ('gsk_bbbb', 2.0)]
+
+    pool = pool_claves.PoolClaves('groq', claves)
+    assert pool.capacidad() == pytest.approx(1.5)
+    elegidas = [pool.elegir().valor for _ in range(6)]
+    assert elegidas.count('gsk_bbbb') == 4
+
+
+def test_dibujo_gemini_sincrono_cambia_de_clave(monkeypatch):
+    """Un 429 de Gemini en la API síncrona enfría esa clave y el dibujo sale con otra"""
+    usadas = []
+
+    def google(peticion):
+        clave = peticion.headers['x-goog-api-key']
+        usadas.append(clave)
+        if clave == 'AIza_aaaa':
+            return httpx.Response(429, headers={'retry-after': '60'})
+        texto = '{"jugadores": [{"x": 50, "y": 50, "numero": "9"}]}'
+        return httpx.Response(200, json={'candidates': [{'content': {'parts': [{'text': texto}]}}]})
+
+    cliente = httpx.Client(transport=httpx.MockTransport(google))
+    monkeypatch.setattr(ia_analyzer, 'cliente_sync', lambda: cliente)
+    analyzer = ia_analyzer.IAAnalyzer()
+    pool = pool_claves.PoolClaves('gemini', [pool_claves.Clave('AIza_aaaa'), pool_claves.Clave('AIza_bbbb')])
+    monkeypatch.setattr(analyzer, 'google_claves', pool)
+    monkeypatch.setattr(analyzer, 'gemini_disponible', True)
+
+    dibujo = analyzer._analizar_gemini_dibujo('Presión del 9')
+
+    assert dibujo['jugadores'][0]['numero'] == '9'
+    assert usadas == ['AIza_aaaa', 'AIza_bbbb']
+    assert pool.enfriadas() == 1
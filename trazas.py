@@ -0,0 +1,293 @@
+"""
+Trazas de las peticiones (spans) exportables en JSON de OpenTelemetry
+Club Atlético Central
+
+Cada petición de Flask abre un span raíz; dentro se anidan los spans de cada
+dibujo de la IA (generar_dibujo_tactico), cada intento con un proveedor, la
+construcción del story, doc.build y el resto de etapas de instrumentacion.
+Los spans hijos heredan el padre por variable de contexto, así que si las
+llamadas al LLM se lanzan en paralelo (hilos con propagar() o asyncio) se ve
+su solapamiento y el camino crítico.
+
+Al cerrar el span raíz la traza completa se añade como una línea a
+TRAZAS_FICHERO con el formato JSON de OTLP (ExportTraceServiceRequest), el
+mismo que escribe el file exporter del OpenTelemetry Collector. Sin
+TRAZAS_FICHERO no se registra nada. TRAZAS_MUESTREO (0-1) permite trazar
+solo una fracción de las peticiones.
+
+Se respeta la cabecera W3C 'traceparent' para unirse a una traza externa.
+"""
+
+import contextvars
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+FICHERO = os.environ.get('TRAZAS_FICHERO')
+MUESTREO = float(os.environ.get('TRAZAS_MUESTREO', 1.0))
+SERVICIO = os.environ.get('TRAZAS_SERVICIO', 'informes-cac-webapp')
+
+# Tipos de span de OTLP
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+_PATRON_TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+_span_actual = contextvars.ContextVar('span_actual', default=None)
+_lock_fichero = threading.Lock()
+
+
+class _Traza:
+    """Spans terminados de una misma traza"""
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans = []
+        self.lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, traza, nombre, padre_id=None, kind=KIND_INTERNAL, atributos=None, inicio_ns=None):
+        self.traza = traza
+        self.nombre = nombre
+        self.span_id = f'{random.getrandbits(64):016x}'
+        self.padre_id = padre_id
+        self.kind = kind
+        self.atributos = dict(atributos or {})
+        self.inicio_ns = inicio_ns or time.time_ns()
+        self.fin_ns = None
+        self.error = None
+
+    def fijar(self, **atributos):
+        self.atributos.update(atributos)
+
+    def terminar(self, fin_ns=None):
+        self.fin_ns = fin_ns or time.time_ns()
+        with self.traza.lock:
+            self.traza.spans.append(self)
+
+    def a_otlp(self):
+        datos = {
+            'traceId': self.traza.trace_id,
+            'spanId': self.span_id,
+            'name': self.nombre,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.inicio_ns),
+            'endTimeUnixNano': str(self.fin_ns),
+            'attributes': [_atributo(k, v) for k, v in self.atributos.items() if v is not None],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.padre_id:
+            datos['parentSpanId'] = self.padre_id
+        return datos
+
+
+def _atributo(clave, valor):
+    if isinstance(valor, bool):
+        return {'key': clave, 'value': {'boolValue': valor}}
+    if isinstance(valor, int):
+        return {'key': clave, 'value': {'intValue': str(valor)}}
+    if isinstance(valor, float):
+        return {'key': clave, 'value': {'doubleValue': valor}}
+    return {'key': clave, 'value': {'stringValue': str(valor)}}
+
+
+def activo():
+    """True si hay una traza en curso en este contexto"""
+    return _span_actual.get() is not None
+
+
+# =============================================================================
+# SPAN RAÍZ (uno por petición)
+# =============================================================================
+def iniciar_raiz(nombre, traceparent=None, **atributos):
+    """
+    Abre el span raíz de una petición (None si no se traza)
+
+    Returns:
+        (span, token) para pasar a terminar_raiz()
+    """
+    if not FICHERO or random.random() >= MUESTREO:
+        return None, None
+
+    padre_id = None
+    coincidencia = _PATRON_TRACEPARENT.match(traceparent or '')
+    if coincidencia:
+        trace_id, padre_id = coincidencia.groups()
+    else:
+        trace_id = f'{random.getrandbits(128):032x}'
+
+    span = Span(_Traza(trace_id), nombre, padre_id, KIND_SERVER, atributos)
+    return span, _span_actual.set(span)
+
+
+def terminar_raiz(span, token, **atributos):
+    """Cierra el span raíz y exporta la traza completa"""
+    if span is None:
+        return
+    span.fijar(**atributos)
+    span.terminar()
+    try:
+        _span_actual.reset(token)
+    except ValueError:
+        # Cerrado desde otro contexto (teardown tras un error)
+        _span_actual.set(None)
+    exportar(span.traza)
+
+
+# =============================================================================
+# SPANS HIJOS
+# =============================================================================
+@contextmanager
+def span(nombre, kind=KIND_INTERNAL, **atributos):
+    """Span hijo del actual durante el bloque (no hace nada fuera de una traza)"""
+    padre = _span_actual.get()
+    if padre is None:
+        yield None
+        return
+
+    hijo = Span(padre.traza, nombre, padre.span_id, kind, atributos)
+    token = _span_actual.set(hijo)
+    try:
+        yield hijo
+    except BaseException as e:
+        hijo.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        _span_actual.reset(token)
+        hijo.terminar()
+
+
+def span_terminado(nombre, segundos, **atributos):
+    """Registra a posteriori un span que acaba ahora y ha durado `segundos`"""
+    padre = _span_actual.get()
+    if padre is None:
+        return
+    fin = time.time_ns()
+    Span(padre.traza, nombre, padre.span_id, KIND_INTERNAL, atributos,
+         inicio_ns=fin - int(segundos * 1e9)).terminar(fin)
+
+
+def propagar(funcion):
+    """
+    Envuelve `funcion` para ejecutarla con el contexto actual (span padre,
+    ID de petición...) en otro hilo, p. ej. en un ThreadPoolExecutor.
+    Cada llamada usa su propia copia, así que admite varias a la vez.
+    """
+    contexto = contextvars.copy_context()
+    return lambda *args, **kwargs: contexto.copy().run(funcion, *args, **kwargs)
+
+
+# =============================================================================
+# EXPORTACIÓN
+# =============================================================================
+def a_otlp(traza):
+    """Traza en formato JSON de OTLP (ExportTraceServiceRequest)"""
+    with traza.lock:
+        spans = sorted(traza.spans, key=lambda s: s.inicio_ns)
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [_atributo('service.name', SERVICIO),
+                                        _atributo('process.pid', os.getpid())]},
+            'scopeSpans': [{
+                'scope': {'name': 'trazas'},
+                'spans': [s.a_otlp() for s in spans],
+            }],
+        }],
+    }
+
+
+def exportar(traza):
+    """Añade la traza como una línea JSON a TRAZAS_FICHERO"""
+    if not FICHERO:
+        return
+    linea = json.dumps(a_otlp(traza), ensure_ascii=False, separators=(',', ':'))
+    try:
+        with _lock_fichero, open(FICHERO, 'a', encoding='utf-8') as f:
+            f.write(linea + '\n')
+    except OSError:
+        pass
+
+
+# =============================================================================
+# LECTURA: cascada y camino crítico
+# =============================================================================
+def camino_critico(spans):
+    """
+    Spans (dicts OTLP de una traza) que forman el camino crítico
+
+    Desde el final de cada span se retrocede por el hijo que termina más
+    tarde antes del cursor; los hijos que solapan con él no alargan la
+    petición.
+    """
+    hijos = {}
+    for s in spans:
+        hijos.setdefault(s.get('parentSpanId'), []).append(s)
+    ids = {s['spanId'] for s in spans}
+    raiz = next((s for s in spans if s.get('parentSpanId') not in ids), None)
+
+    def recorrer(span):
+        camino = [span]
+        cursor = int(span['endTimeUnixNano'])
+        pendientes = sorted(hijos.get(span['spanId'], []), key=lambda h: int(h['endTimeUnixNano']))
+        while pendientes:
+            hijo = pendientes.pop()
+            if int(hijo['endTimeUnixNano']) > cursor:
+                continue
+            camino.extend(recorrer(hijo))
+            cursor = int(hijo['startTimeUnixNano'])
+        return camino
+
+    return recorrer(raiz) if raiz else []
+
+
+def imprimir_cascada(traza_otlp, ancho=50):
+    """Cascada en texto de una traza; '*' marca el camino crítico"""
+    spans = [s for rs in traza_otlp['resourceSpans'] for ss in rs['scopeSpans'] for s in ss['spans']]
+    if not spans:
+        return
+    criticos = {s['spanId'] for s in camino_critico(spans)}
+    inicio = min(int(s['startTimeUnixNano']) for s in spans)
+    total = max(int(s['endTimeUnixNano']) for s in spans) - inicio or 1
+    profundidad = {}
+    por_id = {s['spanId']: s for s in spans}
+
+    def nivel(s):
+        padre = por_id.get(s.get('parentSpanId'))
+        if s['spanId'] not in profundidad:
+            profundidad[s['spanId']] = nivel(padre) + 1 if padre else 0
+        return profundidad[s['spanId']]
+
+    print(f"traza {spans[0]['traceId']}  {total / 1e6:.1f} ms")
+    for s in spans:
+        desde = int(s['startTimeUnixNano']) - inicio
+        dur = int(s['endTimeUnixNano']) - int(s['startTimeUnixNano'])
+        a = int(desde * ancho / total)
+        b = max(a + 1, int((desde + dur) * ancho / total))
+        barra = ' ' * a + '█' * (b - a) + ' ' * (ancho - b)
+        marca = '*' if s['spanId'] in criticos else ' '
+        nombre = '  ' * nivel(s) + s['name']
+        print(f"{marca} {nombre:<32.32} |{barra}| {dur / 1e6:8.1f} ms")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Cascada y camino crítico de las trazas exportadas')
+    parser.add_argument('fichero', nargs='?', default=FICHERO, help='Fichero JSONL de trazas')
+    parser.add_argument('--ultimas', type=int, default=5, help='Número de trazas a mostrar')
+    args = parser.parse_args()
+    if not args.fichero:
+        parser.error('indica el fichero o define TRAZAS_FICHERO')
+
+    with open(args.fichero, encoding='utf-8') as f:
+        lineas = f.readlines()[-args.ultimas:]
+    for linea in lineas:
+        imprimir_cascada(json.loads(linea))
+        print()